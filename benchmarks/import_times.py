@@ -0,0 +1,184 @@
+"""
+Import-time benchmark for the AI-Powered E-commerce Analytics Hub
+
+Every module is imported in a fresh interpreter, so each measurement is a
+cold import: the wall time of the import, the heavy third-party packages it
+pulled in and its slowest direct dependencies (from ``python -X importtime``).
+Modules that must stay light have a list of packages they may not load; a
+violation, or a module slower than ``--max-seconds``, fails the run.
+
+Usage:
+    python benchmarks/import_times.py
+    python benchmarks/import_times.py --compare benchmarks/results/imports-<earlier>.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+# Module -> heavy packages its import must not load
+IMPORT_BUDGETS: Dict[str, List[str]] = {
+    'utils': ['streamlit', 'plotly', 'sklearn', 'statsmodels'],
+    'utils.data_processing': ['streamlit', 'plotly', 'sklearn', 'statsmodels'],
+    'utils.rate_cube': ['streamlit', 'plotly', 'sklearn', 'statsmodels'],
+    'utils.incremental': ['streamlit', 'plotly', 'sklearn', 'statsmodels'],
+    'utils.batch_reports': ['streamlit', 'plotly', 'sklearn', 'statsmodels'],
+    'utils.segmentation': ['streamlit', 'plotly', 'sklearn', 'statsmodels'],
+    'utils.chart_helpers': ['streamlit', 'plotly.express', 'plotly.figure_factory', 'sklearn', 'statsmodels'],
+    'dashboard': ['plotly.figure_factory', 'sklearn', 'statsmodels'],
+}
+
+# Packages reported as loaded when a module pulls them in
+WATCHED_PACKAGES = ['numpy', 'pandas', 'pyarrow', 'plotly', 'plotly.express', 'plotly.figure_factory',
+                    'streamlit', 'sklearn', 'scipy', 'statsmodels', 'joblib']
+
+_MARKER = '--import-start--'
+
+_PROBE = """
+import json, sys, time
+sys.stderr.write({marker!r} + '\\n')
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'loaded': [p for p in {watched!r} if p in sys.modules]}}))
+"""
+
+
+def _git_commit() -> str:
+    """Short hash of the checked-out commit, or 'unknown'"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def _direct_imports(importtime_log: str, top: int) -> List[Dict[str, Any]]:
+    """Slowest direct imports of the probed module in ``-X importtime`` output"""
+    _, _, log = importtime_log.partition(_MARKER)
+    entries = []
+    for line in log.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Each nesting level indents the name by two spaces; level 1 are direct imports
+        if name.startswith('   ') and not name[3:].startswith(' '):
+            entries.append({'module': name.strip(), 'seconds': int(cumulative) / 1e6})
+    return sorted(entries, key=lambda entry: entry['seconds'], reverse=True)[:top]
+
+
+def measure_import(module: str, repeat: int = 3, top: int = 5) -> Dict[str, Any]:
+    """
+    Import a module in fresh interpreters and keep the fastest run
+
+    Args:
+        module: Dotted module name, importable from src/
+        repeat: Number of cold imports; the minimum filters out disk noise
+        top: Number of slowest direct dependencies to report
+
+    Returns:
+        Dict with the module, 'seconds', loaded watched packages and its
+        slowest direct imports
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT / 'src'),
+                                                                     os.environ.get('PYTHONPATH')])))
+    code = _PROBE.format(marker=_MARKER, module=module, watched=WATCHED_PACKAGES)
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT / 'src',
+                              env=env, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+        run = json.loads(proc.stdout.strip().splitlines()[-1])
+        if best is None or run['seconds'] < best['seconds']:
+            best = {'module': module, **run, 'slowest_imports': _direct_imports(proc.stderr, top)}
+    return best
+
+
+def check_budgets(results: List[Dict[str, Any]], max_seconds: Optional[float] = None) -> List[str]:
+    """
+    Budget violations of the measured modules
+
+    Args:
+        results: Records returned by measure_import
+        max_seconds: Optional limit on the import time of every module
+
+    Returns:
+        One message per violation
+    """
+    violations = []
+    for item in results:
+        forbidden = [pkg for pkg in IMPORT_BUDGETS.get(item['module'], []) if pkg in item['loaded']]
+        if forbidden:
+            violations.append(f"{item['module']} loads {', '.join(forbidden)}")
+        if max_seconds is not None and item['seconds'] > max_seconds:
+            violations.append(f"{item['module']} takes {item['seconds']:.3f}s (budget {max_seconds:.3f}s)")
+    return violations
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: Path) -> None:
+    """Print the import time ratio of every module against an earlier results file"""
+    with open(baseline_path, encoding='utf-8') as handle:
+        baseline = json.load(handle)
+    earlier = {item['module']: item for item in baseline['results']}
+
+    print(f"\n⚖️ Compared with {baseline_path} ({baseline['meta']['commit']})")
+    for item in results:
+        before = earlier.get(item['module'])
+        if before is None or not before['seconds']:
+            continue
+        ratio = item['seconds'] / before['seconds']
+        flag = '  ⚠️ slower' if ratio > 1.2 else ''
+        print(f"   {item['module']:<28} {ratio:>6.2f}x{flag}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Measure the import time of every module and write the results"""
+    parser = argparse.ArgumentParser(description="Measure cold import times of the dashboard modules")
+    parser.add_argument('--modules', nargs='+', default=list(IMPORT_BUDGETS),
+                        help="Modules to import, relative to src/")
+    parser.add_argument('--repeat', type=int, default=3, help="Cold imports per module")
+    parser.add_argument('--max-seconds', type=float, help="Fail if any module takes longer to import")
+    parser.add_argument('--output', help="Results file; defaults to benchmarks/results/imports-<time>-<commit>.json")
+    parser.add_argument('--compare', help="Earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    commit = _git_commit()
+    print(f"⏱️ Measuring import times at commit {commit}")
+    results = []
+    for module in args.modules:
+        item = measure_import(module, args.repeat)
+        results.append(item)
+        slowest = ', '.join(f"{entry['module']} {entry['seconds']:.3f}s" for entry in item['slowest_imports'][:3])
+        print(f"   {module:<28} {item['seconds']:>7.3f}s   {slowest}")
+
+    output = (Path(args.output) if args.output
+              else RESULTS_DIR / f"imports-{time.strftime('%Y%m%d-%H%M%S')}-{commit}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    meta = {'commit': commit, 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': sys.version.split()[0]}
+    with open(output, 'w', encoding='utf-8') as handle:
+        json.dump({'meta': meta, 'results': results}, handle, indent=2)
+    print(f"\n📄 Results written to {output}")
+
+    if args.compare:
+        compare(results, Path(args.compare))
+
+    violations = check_budgets(results, args.max_seconds)
+    if violations:
+        print("\n❌ Import budget exceeded:")
+        for message in violations:
+            print(f"   {message}")
+        sys.exit(1)
+    print("\n✅ All modules within their import budgets")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Stage benchmarks for the AI-Powered E-commerce Analytics Hub
+
+For each dataset size a synthetic Dataset.csv is generated and every stage of
+a dashboard run is timed and memory-profiled: loading, preprocessing, filter
+application, segmentation fitting, each section's data preparation and the
+serialization of its figures. Results are written as JSON, one file per run,
+so runs on different commits can be compared with ``--compare``.
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 1e3 1e4 1e5
+    python benchmarks/run_benchmarks.py --sizes 1e5 --compare benchmarks/results/<earlier>.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import plotly.graph_objects as go  # noqa: E402
+
+from synthetic_data import write_dataset  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+DEFAULT_SIZES = ['1e3', '1e4', '1e5']
+
+
+def _git_commit() -> str:
+    """Short hash of the checked-out commit, or 'unknown'"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, where the platform reports it"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure(fn: Callable[[], Any], trace_memory: bool = True) -> Tuple[Any, Dict[str, float]]:
+    """
+    Time a stage, then run it again under tracemalloc for its peak allocation
+
+    Timing and memory tracing are separate runs because tracing slows
+    allocation-heavy code down considerably.
+
+    Args:
+        fn: Stage to run; must be repeatable
+        trace_memory: Also measure the peak traced allocation
+
+    Returns:
+        Tuple of (result of the timed run, dict with 'seconds' and 'peak_mb')
+    """
+    start = time.perf_counter()
+    result = fn()
+    stats = {'seconds': time.perf_counter() - start}
+
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        stats['peak_mb'] = peak / (1024 * 1024)
+    return result, stats
+
+
+def benchmark_size(n_rows: int, work_dir: Path, trace_memory: bool = True) -> List[Dict[str, Any]]:
+    """
+    Run every dashboard stage on a synthetic dataset of one size
+
+    Args:
+        n_rows: Number of synthetic responses
+        work_dir: Scratch directory for the dataset, stores and models
+        trace_memory: Also measure peak allocations
+
+    Returns:
+        One result record per stage
+    """
+    import streamlit.logger
+
+    # The dashboard runs in bare mode here; silence the missing-runtime warnings
+    streamlit.logger.set_log_level('ERROR')
+
+    import dashboard
+    from utils.approximate import draw_sample, sampling_info, use_approximation
+    from utils.filter_index import build_filter_index
+    from utils.incremental import LiveDataset
+    from utils.segmentation import load_segmentation_model
+
+    csv_path = write_dataset(work_dir / f'dataset-{n_rows}.csv', n_rows)
+    records = []
+    runs = iter(range(1_000_000))
+
+    def record(stage: str, fn: Callable[[], Any], **extra: Any) -> Any:
+        result, stats = measure(fn, trace_memory)
+        records.append({'rows': n_rows, 'stage': stage, **stats, **extra})
+        print(f"   {n_rows:>10,}  {stage:<36} {stats['seconds']:>9.4f}s"
+              + (f"  {stats['peak_mb']:>9.1f} MB" if 'peak_mb' in stats else ''))
+        return result
+
+    def load() -> Dict[str, Any]:
+        # A fresh store per run, so every run ingests from the CSV and maps the rows
+        run = next(runs)
+        live = LiveDataset(csv_path, store_dir=work_dir / f'store-{n_rows}-{run}',
+                           shared_dir=work_dir / f'shared-{n_rows}-{run}')
+        live.refresh()
+        return live.snapshot()
+
+    dataset = record('load_data', load)
+    df = record('preprocess_data',
+                lambda: dashboard.preprocess_data.__wrapped__(dataset['version'], dataset['df']))
+
+    # A typical selection: one country left out, everything else selected
+    filter_index = dataset['filter_index']
+    selection = {col: filter_index.values(col) for col in filter_index.columns}
+    selection['Country'] = selection['Country'][1:]
+    filtered_df, filtered_cube = record('filter', lambda: (filter_index.apply(df, selection),
+                                                           dataset['cube'].filter(selection)))
+
+    sampling = None
+    if use_approximation(filtered_cube.total):
+        def sample_rows():
+            sample = draw_sample(df)
+            return build_filter_index(sample).apply(sample, selection)
+
+        filtered_df = record('approximate_sample', sample_rows)
+        sampling = sampling_info(filtered_cube.total, len(filtered_df))
+
+    model_dir = work_dir / f'models-{n_rows}'
+    model = record('segmentation_fit',
+                   lambda: load_segmentation_model(df, f'bench-{n_rows}-{next(runs)}', model_dir))
+
+    inputs = {'rows': filtered_df, 'cube': filtered_cube, 'segmentation': model, 'sampling': sampling}
+    for name, section in dashboard.SECTIONS.items():
+        result = record(f'compute:{name}', lambda: dashboard.compute_section(section, inputs))
+        figures = [value for value in result.values() if isinstance(value, go.Figure)]
+        payload = record(f'serialize:{name}', lambda: [fig.to_json() for fig in figures])
+        records[-1]['bytes'] = sum(len(text) for text in payload)
+
+    records.append({'rows': n_rows, 'stage': 'process', 'peak_rss_mb': _peak_rss_mb()})
+    return records
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: Path) -> None:
+    """Print the time ratio of every stage against an earlier results file"""
+    with open(baseline_path, encoding='utf-8') as handle:
+        baseline = json.load(handle)
+    earlier = {(item['rows'], item['stage']): item for item in baseline['results'] if 'seconds' in item}
+
+    print(f"\n⚖️ Compared with {baseline_path} ({baseline['meta']['commit']})")
+    for item in results:
+        before = earlier.get((item['rows'], item['stage']))
+        if before is None or 'seconds' not in item or not before['seconds']:
+            continue
+        ratio = item['seconds'] / before['seconds']
+        flag = '  ⚠️ slower' if ratio > 1.2 else ''
+        print(f"   {item['rows']:>10,}  {item['stage']:<36} {ratio:>6.2f}x{flag}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Run the benchmarks and write the results"""
+    parser = argparse.ArgumentParser(description="Benchmark every dashboard stage at scaled dataset sizes")
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES,
+                        help="Dataset sizes in rows, e.g. 1e3 1e5 1e7")
+    parser.add_argument('--output', help="Results file; defaults to benchmarks/results/<time>-<commit>.json")
+    parser.add_argument('--compare', help="Earlier results file to compare against")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc runs")
+    args = parser.parse_args(argv)
+
+    commit = _git_commit()
+    results = []
+    print(f"⏱️ Benchmarking commit {commit}")
+    with tempfile.TemporaryDirectory(prefix='bench-') as work_dir:
+        for size in args.sizes:
+            results.extend(benchmark_size(int(float(size)), Path(work_dir), not args.no_memory))
+
+    import numpy
+    import pandas
+    import plotly
+
+    meta = {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'versions': {'pandas': pandas.__version__, 'numpy': numpy.__version__, 'plotly': plotly.__version__},
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}-{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as handle:
+        json.dump({'meta': meta, 'results': results}, handle, indent=2)
+    print(f"\n📄 Results written to {output}")
+
+    if args.compare:
+        compare(results, Path(args.compare))
+
+
+if __name__ == "__main__":
+    main()
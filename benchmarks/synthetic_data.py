@@ -0,0 +1,124 @@
+"""
+Synthetic survey data for the AI-Powered E-commerce Analytics Hub benchmarks
+
+Generates responses with the columns and answer values the dashboard reads
+from Dataset.csv, at any size. AI endorsement depends on the age group, and
+satisfaction and AI tool usage depend on endorsement, so rates vary across
+groups the way they do in the survey. Rows are generated and written in
+chunks, so datasets of 10^7 rows never have to fit in memory as strings.
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+PathLike = Union[str, Path]
+
+# Categorical answers and their probabilities
+CATEGORIES: Dict[str, Tuple[Sequence[str], Sequence[float]]] = {
+    'Age': (['Gen Z', 'Millennials', 'Gen X', 'Baby Boomers'], [0.23, 0.25, 0.26, 0.26]),
+    'Gender': (['Male', 'Female'], [0.51, 0.49]),
+    'Country': (['India', 'UK', 'USA', 'Brazil', 'Germany'], [0.21, 0.20, 0.20, 0.20, 0.19]),
+    'Education': (['High School', 'Bachelor', 'Master', 'PhD'], [0.25, 0.25, 0.25, 0.25]),
+    'Living_Region': (['Urban', 'Suburban', 'Rural'], [0.34, 0.32, 0.34]),
+    'Annual_Salary': (['Low', 'Medium', 'Medium High', 'High'], [0.25, 0.24, 0.26, 0.25]),
+}
+
+# AI endorsement probability per age group
+ENDORSEMENT_BY_AGE = {'Gen Z': 0.62, 'Millennials': 0.56, 'Gen X': 0.45, 'Baby Boomers': 0.38}
+
+AI_TOOL_COLUMNS = [
+    'AI_Tools_Used _Chatbots',
+    'AI_Tools_Used_Virtual_Assistant',
+    'AI_Tools_Used_Voice&Photo_Search',
+]
+OTHER_FLAG_COLUMNS = [
+    'Payment_Method_Credit/Debit',
+    'Payment_Method_COD',
+    'Payment_Method_Ewallet',
+    'Product_Category_Appliances',
+    'Product_Category_Electronics',
+    'Product_Category_Groceries',
+    'Product_Category_Personal_Care',
+    'Product_Category_Clothing',
+]
+
+COLUMNS = (['ID'] + list(CATEGORIES) + ['Online_Consumer', 'AI_Endorsement', 'AI_Satisfication']
+           + AI_TOOL_COLUMNS + OTHER_FLAG_COLUMNS)
+
+
+def _yes_no(flags: np.ndarray) -> np.ndarray:
+    return np.where(flags, 'YES', 'NO')
+
+
+def generate_responses(n_rows: int, seed: int = 42, start_id: int = 1) -> pd.DataFrame:
+    """
+    Generate survey responses in the raw Dataset.csv format
+
+    Args:
+        n_rows: Number of responses
+        seed: Seed for reproducible data
+        start_id: ID of the first response
+
+    Returns:
+        DataFrame of string answers with the Dataset.csv columns
+    """
+    rng = np.random.default_rng(seed)
+    data = {'ID': np.arange(start_id, start_id + n_rows)}
+    for col, (values, probabilities) in CATEGORIES.items():
+        data[col] = rng.choice(np.asarray(values, dtype=object), size=n_rows, p=probabilities)
+
+    endorse_p = pd.Series(data['Age']).map(ENDORSEMENT_BY_AGE).to_numpy(dtype=float)
+    endorsed = rng.random(n_rows) < endorse_p
+    data['Online_Consumer'] = _yes_no(rng.random(n_rows) < 0.51)
+    data['AI_Endorsement'] = _yes_no(endorsed)
+    satisfied = rng.random(n_rows) < np.where(endorsed, 0.65, 0.35)
+    data['AI_Satisfication'] = np.where(satisfied, 'Satisfied', 'Not Satisfied')
+
+    for col in AI_TOOL_COLUMNS:
+        data[col] = _yes_no(rng.random(n_rows) < np.where(endorsed, 0.55, 0.25))
+    for col in OTHER_FLAG_COLUMNS:
+        data[col] = _yes_no(rng.random(n_rows) < 0.4)
+
+    return pd.DataFrame(data, columns=COLUMNS)
+
+
+def write_dataset(path: PathLike, n_rows: int, seed: int = 42, chunksize: int = 1_000_000) -> Path:
+    """
+    Write a synthetic Dataset.csv, chunk by chunk
+
+    Args:
+        path: Target CSV file
+        n_rows: Number of responses
+        seed: Seed for reproducible data
+        chunksize: Rows generated and written at a time
+
+    Returns:
+        Path of the written file
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8', newline='') as handle:
+        for chunk_number, start in enumerate(range(0, n_rows, chunksize)):
+            rows = min(chunksize, n_rows - start)
+            chunk = generate_responses(rows, seed=seed + chunk_number, start_id=start + 1)
+            chunk.to_csv(handle, index=False, header=chunk_number == 0)
+    return path
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Write a synthetic dataset: python benchmarks/synthetic_data.py <rows> <path>"""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if len(argv) < 2:
+        print("Usage: python benchmarks/synthetic_data.py <rows> <output.csv>")
+        sys.exit(1)
+
+    path = write_dataset(argv[1], int(float(argv[0])))
+    print(f"🧪 Wrote {int(float(argv[0])):,} synthetic responses to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -55,6 +55,7 @@ setup(
     entry_points={
         "console_scripts": [
             "ai-ecommerce-dashboard=app:main",
+            "ai-ecommerce-reports=utils.batch_reports:main",
         ],
     },
     include_package_data=True,
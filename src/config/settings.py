@@ -13,6 +13,10 @@ DATA_DIR = PROJECT_ROOT / "assets" / "data"
 DATASET_PATH = DATA_DIR / "Dataset.csv"
 MBA_DATASET_PATH = DATA_DIR / "mba_decision_dataset.csv"
 
+# Columnar copies of ingested datasets, keyed by source file hash; must be
+# writable, so point DATA_STORE_DIR at a volume when the data directory is read-only
+DATA_STORE_DIR = Path(os.environ.get("DATA_STORE_DIR", DATA_DIR / "store"))
+
 # Assets paths
 ASSETS_DIR = PROJECT_ROOT / "assets"
 IMAGES_DIR = ASSETS_DIR / "images"
@@ -40,7 +44,8 @@ CHART_CONFIG = {
     "template": "plotly_white",
     "color_scale": "viridis",
     "height": 600,
-    "margin": {"l": 50, "r": 50, "t": 50, "b": 50}
+    "margin": {"l": 50, "r": 50, "t": 50, "b": 50},
+    "skeleton_cache_size": 64  # figure skeletons kept per process, least recently used evicted
 }
 
 # Styling configuration
@@ -69,9 +74,63 @@ FEATURES = {
     "enable_trendlines": True
 }
 
+# Chunked streaming ingest for datasets larger than memory
+STREAMING_CONFIG = {
+    "enabled": False,
+    "source": str(DATASET_PATH),  # CSV path or glob of partitioned CSV files
+    "chunksize": 100_000,
+    "reservoir_size": 10_000,
+    "histogram_bin_width": 1.0,
+    "histogram_max_bins": 256  # bins double in width when a column needs more
+}
+
+# Customer segmentation model, fitted once per dataset version
+SEGMENTATION_CONFIG = {
+    "n_clusters": 4,
+    "random_state": 42,
+    "n_init": 1,
+    "mode": "full",  # "full" (KMeans) or "minibatch" (MiniBatchKMeans with partial_fit)
+    "batch_size": 4096,
+    "model_dir": DATA_STORE_DIR / "models"
+}
+
+# Read-only memory-mapped copy of each dataset version, shared by every process
+# and session on a host; point SHARED_STORE_DIR at a volume all replicas mount
+SHARED_STORE_CONFIG = {
+    "enabled": True,
+    "dir": Path(os.environ.get("SHARED_STORE_DIR", DATA_STORE_DIR / "mmap")),
+    "keep_versions": 2  # older versions are removed when a new one is written
+}
+
+# Approximate query mode: large selections use a stratified sample for row-level charts
+APPROXIMATION_CONFIG = {
+    "enabled": True,
+    "min_rows": 100_000,  # selections up to this size are always computed exactly
+    "sample_size": 50_000,
+    "strata": ["Country", "Age"],
+    "confidence": 0.95
+}
+
+# Filtered data export, written in chunks to a temporary file
+EXPORT_CONFIG = {
+    "chunksize": 100_000,  # source rows per chunk
+    "tmp_dir": None  # directory for export files; None uses the system default
+}
+
+# Headless batch reports over dataset slices
+REPORT_CONFIG = {
+    "workers": 4,  # worker processes; 1 computes in-process
+    "chunksize": 256,  # slices sent to a worker at a time
+    "output": PROJECT_ROOT / "reports" / "insights.json"  # .json or .parquet
+}
+
 # Performance settings
 PERFORMANCE = {
     "max_data_points": 10000,
+    "webgl_threshold": 1000,
+    "section_workers": 4,  # threads computing dashboard sections; 1 computes serially
+    "performance_panel": False,  # always show the sidebar performance panel (otherwise ?perf=1)
+    "trace_memory": False,  # record per-stage memory growth with tracemalloc
     "chart_timeout": 30,
     "enable_lazy_loading": True
 } 
\ No newline at end of file
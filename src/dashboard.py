@@ -2,12 +2,38 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
-from sklearn.preprocessing import LabelEncoder
-from sklearn.cluster import KMeans
-from sklearn.decomposition import PCA
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from config.settings import DATASET_PATH, FEATURES, PERFORMANCE, STREAMING_CONFIG
+from utils.approximate import draw_sample, rate_margin, sample_note, sampling_info, use_approximation
+from utils.chart_helpers import (
+    add_trendlines,
+    compact_figure,
+    create_hierarchy_chart,
+    express_trace_data,
+    hierarchy_data,
+    skeleton_figure,
+    trace_groups,
+)
+from utils.filter_index import build_filter_index
+from utils.export import EXPORT_FORMATS, available_formats, export_rows, export_source, source_columns
+from utils.incremental import LiveDataset
+from utils.instrumentation import PerformanceLog, enable_memory_tracing, figure_bytes
+from utils.point_budget import POINTS_COLUMN, apply_point_budget, scatter_render_mode
+from utils.segmentation import load_segmentation_model, segment_customers
+from utils.stream_ingest import source_version, stream_ingest
+from utils.result_cache import ResultCache, selection_key
+from utils.schema import (
+    AI_TOOL_COLUMNS,
+    PAYMENT_METHOD_COLUMNS,
+    PRODUCT_CATEGORY_COLUMNS,
+    flag_label,
+    short_name,
+)
 warnings.filterwarnings('ignore')
 
 # Page configuration
@@ -230,36 +256,54 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data
+@st.cache_resource
+def load_live_dataset():
+    """Columnar store view that follows appended rows, shared by all sessions"""
+    # Try the assets/data directory first, then fall back to the root directory
+    for path in (DATASET_PATH, Path('Dataset.csv')):
+        if path.exists():
+            return LiveDataset(path)
+    return None
+
+@st.cache_resource
+def load_stream_snapshot(version):
+    """Stream the configured source into running aggregates and a row sample"""
+    summary = stream_ingest(STREAMING_CONFIG['source'])
+    sample = summary.sample()
+    return {
+        'version': version,
+        'df': sample,
+        'cube': summary.cube,
+        'filter_index': build_filter_index(sample),
+        'rows': summary.rows,
+        'updated': None,
+    }
+
 def load_data():
-    """Load and preprocess the dataset"""
-    try:
-        # Try to load from the new assets/data directory
-        df = pd.read_csv('assets/data/Dataset.csv')
-    except FileNotFoundError:
-        try:
-            # Fallback to root directory
-            df = pd.read_csv('Dataset.csv')
-        except FileNotFoundError:
-            st.error("❌ Dataset.csv not found! Please ensure the file is in assets/data/ directory.")
-            return pd.DataFrame()
-    except UnicodeDecodeError:
-        try:
-            df = pd.read_csv('assets/data/Dataset.csv', encoding='latin-1')
-        except:
-            df = pd.read_csv('assets/data/Dataset.csv', encoding='cp1252')
-    
-    # Clean column names
-    df.columns = df.columns.str.strip()
-    
-    # Handle missing values
-    df = df.fillna('Unknown')
-    
-    return df
+    """
+    Load the current rows, rate cube, filter index and version of the dataset
+    
+    New rows appended to the columnar store are folded in on the next rerun,
+    reading only the appended parts. In streaming mode only a reservoir sample
+    is held as rows.
+    """
+    if STREAMING_CONFIG['enabled']:
+        return load_stream_snapshot(source_version(STREAMING_CONFIG['source']))
+    
+    live = load_live_dataset()
+    if live is None:
+        st.error("❌ Dataset.csv not found! Please ensure the file is in assets/data/ directory.")
+        st.stop()
+    live.refresh()
+    return live.snapshot()
 
-@st.cache_data
-def preprocess_data(df):
-    """Preprocess data for analysis"""
+@st.cache_resource
+def preprocess_data(version, _df):
+    """Preprocess data for analysis, once per dataset version"""
+    # The loaded rows may be memory-mapped and are shared by every session:
+    # the result references their columns instead of copying them
+    df = {col: _df[col] for col in _df.columns}
+    
     # Create age group mapping
     age_mapping = {
         'Gen Z': '18-25',
@@ -267,7 +311,7 @@ def preprocess_data(df):
         'Gen X': '41-56',
         'Baby Boomers': '57-75'
     }
-    df['Age_Group'] = df['Age'].map(age_mapping)
+    df['Age_Group'] = _df['Age'].map(age_mapping)
     
     # Create salary categories
     salary_mapping = {
@@ -276,19 +320,123 @@ def preprocess_data(df):
         'Medium High': 'Medium High ($100K-$150K)',
         'High': 'High (>$150K)'
     }
-    df['Salary_Category'] = df['Annual_Salary'].map(salary_mapping)
+    df['Salary_Category'] = _df['Annual_Salary'].map(salary_mapping)
+    
+    return pd.DataFrame(df, index=_df.index, copy=False)
+
+@st.cache_resource
+def load_segmentation(version, _df):
+    """Load or fit the segmentation model once per dataset version"""
+    return load_segmentation_model(_df, version)
+
+@st.cache_resource
+def load_sample(version, _df):
+    """Stratified sample of a dataset version and its filter index, drawn once"""
+    sample = draw_sample(_df)
+    return {'df': sample, 'filter_index': build_filter_index(sample)}
+
+@st.cache_resource
+def load_section_cache():
+    """Process-wide cache of computed dashboard sections"""
+    return ResultCache()
+
+@st.cache_resource
+def load_section_pool():
+    """Process-wide worker pool that computes dashboard sections"""
+    return ThreadPoolExecutor(max_workers=max(1, PERFORMANCE['section_workers']),
+                              thread_name_prefix='section')
+
+def compute_demographics(df, cube, sampling):
+    """Compute the key metrics and figures of the demographics section"""
+    # Interactive Sunburst Chart for Demographics, coloured by endorsement rate
+    # Figures are built once per process and later only get their data swapped
+    sunburst_nodes = cube.hierarchy(['Country', 'Age', 'Gender'])
+    fig_sunburst = skeleton_figure(
+        'demographics_sunburst',
+        lambda: create_hierarchy_chart(
+            sunburst_nodes,
+            kind='sunburst',
+            title="🌍 Demographics Sunburst Chart"
+        ).update_layout(
+            title_font_size=20,
+            title_x=0.5,
+            height=500
+        ),
+        [hierarchy_data(sunburst_nodes)]
+    )
+    
+    # Interactive Treemap for Age and Education, sized by AI endorsers
+    treemap_nodes = cube.hierarchy(['Age', 'Education', 'Gender'])
+    fig_treemap = skeleton_figure(
+        'demographics_treemap',
+        lambda: create_hierarchy_chart(
+            treemap_nodes,
+            kind='treemap',
+            values='AI_Endorsement',
+            title="🎓 Education & Age Treemap"
+        ).update_layout(
+            title_font_size=20,
+            title_x=0.5,
+            height=500
+        ),
+        [hierarchy_data(treemap_nodes, 'AI_Endorsement')]
+    )
     
-    return df
+    # 3D Scatter Plot for Demographics
+    # One marker per coincident point, sized by the number of respondents;
+    # categorical codes give the numeric mapping for the 3D plot
+    df_3d, _ = apply_point_budget(df, ['Country', 'Age', 'Gender'], color='AI_Endorsement')
+    df_3d['Country_encoded'] = df_3d['Country'].cat.codes
+    df_3d['Age_encoded'] = df_3d['Age'].cat.codes
+    df_3d['Gender_encoded'] = df_3d['Gender'].cat.codes
+    df_3d['AI_Endorsement'] = flag_label(df_3d['AI_Endorsement'])
+    
+    title_3d = "🌐 3D Demographics Scatter Plot" + sample_note(sampling)
+    fig_3d = skeleton_figure(
+        ('demographics_3d', trace_groups(df_3d, 'AI_Endorsement')),
+        lambda: px.scatter_3d(
+            df_3d,
+            x='Country_encoded',
+            y='Age_encoded',
+            z='Gender_encoded',
+            color='AI_Endorsement',
+            size=POINTS_COLUMN,
+            hover_data=['Country', 'Age', 'Gender', POINTS_COLUMN],
+            title=title_3d,
+            color_discrete_map={'YES': '#00ff88', 'NO': '#ff4444'}
+        ).update_layout(
+            title_font_size=20,
+            title_x=0.5,
+            height=600,
+            scene=dict(
+                xaxis_title="Country",
+                yaxis_title="Age Group",
+                zaxis_title="Gender"
+            )
+        ),
+        express_trace_data(df_3d, {'x': 'Country_encoded', 'y': 'Age_encoded', 'z': 'Gender_encoded'},
+                           by='AI_Endorsement', size=POINTS_COLUMN,
+                           customdata=['Country', 'Age', 'Gender', POINTS_COLUMN]),
+        layout={'title.text': title_3d}
+    )
+    
+    return {
+        'metrics': cube.key_metrics(),
+        'sunburst': fig_sunburst,
+        'treemap': fig_treemap,
+        'scatter_3d': fig_3d,
+    }
 
-def create_advanced_demographics(df):
+def create_advanced_demographics(section):
     """Create advanced demographics section with interactive charts"""
     st.markdown('<h2 class="section-header">📊 Advanced Demographics Analysis</h2>', unsafe_allow_html=True)
     
     # Key metrics with enhanced styling
+    metrics = section['metrics']
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        total_consumers = len(df)
+        total_consumers = metrics['total_consumers']
         st.markdown(f"""
         <div class="metric-card">
             <h3>👥 Total Consumers</h3>
@@ -297,8 +445,8 @@ def create_advanced_demographics(df):
         """, unsafe_allow_html=True)
     
     with col2:
-        online_consumers = len(df[df['Online_Consumer'] == 'YES'])
-        online_percentage = float(online_consumers / total_consumers * 100)
+        online_consumers = metrics['online_consumers']
+        online_percentage = metrics['online_rate']
         st.markdown(f"""
         <div class="metric-card">
             <h3>🛒 Online Consumers</h3>
@@ -308,8 +456,8 @@ def create_advanced_demographics(df):
         """, unsafe_allow_html=True)
     
     with col3:
-        ai_endorsers = len(df[df['AI_Endorsement'] == 'YES'])
-        ai_percentage = float(ai_endorsers / total_consumers * 100)
+        ai_endorsers = metrics['ai_endorsers']
+        ai_percentage = metrics['ai_adoption_rate']
         st.markdown(f"""
         <div class="metric-card">
             <h3>🤖 AI Endorsers</h3>
@@ -319,8 +467,8 @@ def create_advanced_demographics(df):
         """, unsafe_allow_html=True)
     
     with col4:
-        satisfied_ai = len(df[df['AI_Satisfication'] == 'Satisfied'])
-        satisfied_percentage = float(satisfied_ai / total_consumers * 100)
+        satisfied_ai = metrics['ai_satisfied']
+        satisfied_percentage = metrics['satisfaction_rate']
         st.markdown(f"""
         <div class="metric-card">
             <h3>😊 AI Satisfied</h3>
@@ -334,221 +482,128 @@ def create_advanced_demographics(df):
     
     with col1:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        # Interactive Sunburst Chart for Demographics
-        # Create a numerical column for coloring
-        df_sunburst = df.copy()
-        df_sunburst['AI_Endorsement_Numeric'] = (df_sunburst['AI_Endorsement'] == 'YES').astype(int)
-        
-        fig_sunburst = px.sunburst(
-            df_sunburst, 
-            path=['Country', 'Age', 'Gender'], 
-            title="🌍 Demographics Sunburst Chart",
-            color='AI_Endorsement_Numeric',
-            color_continuous_scale='viridis',
-            hover_data=['Education', 'Annual_Salary']
-        )
-        fig_sunburst.update_layout(
-            title_font_size=20,
-            title_x=0.5,
-            height=500
-        )
-        st.plotly_chart(fig_sunburst, use_container_width=True)
+        st.plotly_chart(section['sunburst'], use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
     
     with col2:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        # Interactive Treemap for Age and Education
-        # Create a numerical column for coloring
-        df_treemap = df.copy()
-        df_treemap['AI_Endorsement_Numeric'] = (df_treemap['AI_Endorsement'] == 'YES').astype(int)
-        
-        fig_treemap = px.treemap(
-            df_treemap,
-            path=['Age', 'Education', 'Gender'],
-            values='AI_Endorsement_Numeric',
-            color='AI_Endorsement_Numeric',
-            color_continuous_scale='viridis',
-            title="🎓 Education & Age Treemap"
-        )
-        fig_treemap.update_layout(
-            title_font_size=20,
-            title_x=0.5,
-            height=500
-        )
-        st.plotly_chart(fig_treemap, use_container_width=True)
+        st.plotly_chart(section['treemap'], use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
     
     # 3D Scatter Plot for Demographics
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    # Create numeric mapping for 3D plot
-    le_country = LabelEncoder()
-    le_age = LabelEncoder()
-    le_gender = LabelEncoder()
-    
-    df_3d = df.copy()
-    df_3d['Country_encoded'] = le_country.fit_transform(df_3d['Country'])
-    df_3d['Age_encoded'] = le_age.fit_transform(df_3d['Age'])
-    df_3d['Gender_encoded'] = le_gender.fit_transform(df_3d['Gender'])
-    df_3d['AI_Endorsement_encoded'] = (df_3d['AI_Endorsement'] == 'YES').astype(int)
-    
-    fig_3d = px.scatter_3d(
-        df_3d,
-        x='Country_encoded',
-        y='Age_encoded', 
-        z='Gender_encoded',
+    st.plotly_chart(section['scatter_3d'], use_container_width=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def compute_ai_analysis(df, cube, sampling):
+    """Compute the figures of the AI adoption section"""
+    # Animated Bar Chart for AI Endorsement by Age
+    ai_age_data = cube.rates('Age', ['AI_Endorsement']).reset_index()
+    fig_ai_age = px.bar(
+        ai_age_data,
+        x='Age',
+        y='AI_Endorsement',
+        title="📈 AI Endorsement by Age Group",
         color='AI_Endorsement',
-        size='AI_Endorsement_encoded',
-        hover_data=['Country', 'Age', 'Gender', 'Education'],
-        title="🌐 3D Demographics Scatter Plot",
-        color_discrete_map={'YES': '#00ff88', 'NO': '#ff4444'}
+        color_continuous_scale='viridis',
+        animation_frame='Age',
+        range_y=[0, 100]
     )
-    fig_3d.update_layout(
+    fig_ai_age.update_layout(
         title_font_size=20,
         title_x=0.5,
-        height=600,
-        scene=dict(
-            xaxis_title="Country",
-            yaxis_title="Age Group",
-            zaxis_title="Gender"
-        )
+        height=400,
+        xaxis_title="Age Group",
+        yaxis_title="AI Endorsement Rate (%)"
     )
-    st.plotly_chart(fig_3d, use_container_width=True)
-    st.markdown('</div>', unsafe_allow_html=True)
-
-def create_advanced_ai_analysis(df):
-    """Create advanced AI adoption analysis with interactive charts"""
-    st.markdown('<h2 class="section-header">🤖 Advanced AI Adoption Analysis</h2>', unsafe_allow_html=True)
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        # Animated Bar Chart for AI Endorsement by Age
-        ai_age_data = df.groupby('Age')['AI_Endorsement'].apply(lambda x: (x == 'YES').mean() * 100).reset_index()
-        fig_ai_age = px.bar(
-            ai_age_data, 
-            x='Age', 
-            y='AI_Endorsement',
-            title="📈 AI Endorsement by Age Group",
-            color='AI_Endorsement',
-            color_continuous_scale='viridis',
-            animation_frame='Age',
-            range_y=[0, 100]
-        )
-        fig_ai_age.update_layout(
-            title_font_size=20,
-            title_x=0.5,
-            height=400,
-            xaxis_title="Age Group",
-            yaxis_title="AI Endorsement Rate (%)"
-        )
-        st.plotly_chart(fig_ai_age, use_container_width=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+    # Interactive Donut Chart for AI Tools Usage
+    ai_tools = AI_TOOL_COLUMNS
+    tool_rates = cube.labelled_rates(ai_tools)
+    tool_df = pd.DataFrame({'Tool': tool_rates.index, 'Usage_Rate': tool_rates.values})
     
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        # Interactive Donut Chart for AI Tools Usage
-        ai_tools = ['AI_Tools_Used _Chatbots', 'AI_Tools_Used_Virtual_Assistant', 'AI_Tools_Used_Voice&Photo_Search']
-        tool_usage = []
-        
-        for tool in ai_tools:
-            usage_rate = (df[tool] == 'YES').mean() * 100
-            tool_usage.append({'Tool': tool.replace('AI_Tools_Used_', ''), 'Usage_Rate': usage_rate})
-        
-        tool_df = pd.DataFrame(tool_usage)
-        
-        fig_donut = px.pie(
-            tool_df, 
-            values='Usage_Rate', 
+    fig_donut = skeleton_figure(
+        'ai_tools_donut',
+        lambda: px.pie(
+            tool_df,
+            values='Usage_Rate',
             names='Tool',
             title="🛠️ AI Tools Usage Distribution",
             hole=0.6
-        )
-        fig_donut.update_traces(
-            textposition='inside', 
+        ).update_traces(
+            textposition='inside',
             textinfo='percent+label',
             hovertemplate="<b>%{label}</b><br>Usage Rate: %{value:.1f}%<extra></extra>"
-        )
-        fig_donut.update_layout(
+        ).update_layout(
             title_font_size=20,
             title_x=0.5,
             height=400
-        )
-        st.plotly_chart(fig_donut, use_container_width=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+        ),
+        express_trace_data(tool_df, {'labels': 'Tool', 'values': 'Usage_Rate'})
+    )
     
     # Advanced AI Analysis with Parallel Categories
-    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     # Prepare data for parallel categories
     ai_analysis_data = df[['Age', 'Education', 'Country', 'AI_Endorsement', 'AI_Satisfication']].copy()
     
     # Convert AI_Endorsement to numerical for coloring
-    ai_analysis_data['AI_Endorsement_Numeric'] = (ai_analysis_data['AI_Endorsement'] == 'YES').astype(int)
-    
-    fig_parallel = px.parallel_categories(
-        ai_analysis_data,
-        dimensions=['Age', 'Education', 'Country', 'AI_Endorsement', 'AI_Satisfication'],
-        color='AI_Endorsement_Numeric',
-        color_continuous_scale='viridis',
-        title="🔄 AI Adoption Journey Analysis"
-    )
-    fig_parallel.update_layout(
-        title_font_size=20,
-        title_x=0.5,
-        height=500
+    ai_analysis_data['AI_Endorsement_Numeric'] = ai_analysis_data['AI_Endorsement'].astype(int)
+    ai_analysis_data['AI_Endorsement'] = flag_label(ai_analysis_data['AI_Endorsement'])
+    
+    journey_dimensions = ['Age', 'Education', 'Country', 'AI_Endorsement', 'AI_Satisfication']
+    title_parallel = "🔄 AI Adoption Journey Analysis" + sample_note(sampling)
+    fig_parallel = skeleton_figure(
+        'ai_journey_parallel',
+        lambda: px.parallel_categories(
+            ai_analysis_data,
+            dimensions=journey_dimensions,
+            color='AI_Endorsement_Numeric',
+            color_continuous_scale='viridis',
+            title=title_parallel
+        ).update_layout(
+            title_font_size=20,
+            title_x=0.5,
+            height=500
+        ),
+        [{
+            'dimensions': [dict(label=dimension, values=ai_analysis_data[dimension].to_numpy())
+                           for dimension in journey_dimensions],
+            'line.color': ai_analysis_data['AI_Endorsement_Numeric'].to_numpy(),
+        }],
+        layout={'title.text': title_parallel}
     )
-    st.plotly_chart(fig_parallel, use_container_width=True)
-    st.markdown('</div>', unsafe_allow_html=True)
     
-    # AI Tools Usage Heatmap
-    col1, col2 = st.columns(2)
+    # AI Tools Usage by Age Heatmap
+    ai_tools_pivot = cube.rates('Age', ai_tools)
+    ai_tools_pivot.columns = [short_name(tool) for tool in ai_tools_pivot.columns]
     
-    with col1:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        # AI Tools Usage by Age Heatmap
-        ai_tools_age_data = []
-        for tool in ai_tools:
-            for age in df['Age'].unique():
-                subset = df[df['Age'] == age]
-                usage_rate = (subset[tool] == 'YES').mean() * 100
-                ai_tools_age_data.append({
-                    'Tool': tool.replace('AI_Tools_Used_', ''),
-                    'Age': age,
-                    'Usage_Rate': usage_rate
-                })
-        
-        ai_tools_age_df = pd.DataFrame(ai_tools_age_data)
-        ai_tools_pivot = ai_tools_age_df.pivot(index='Age', columns='Tool', values='Usage_Rate')
-        
-        fig_ai_heatmap = go.Figure(data=go.Heatmap(
+    fig_ai_heatmap = skeleton_figure(
+        'ai_tools_heatmap',
+        lambda: go.Figure(data=go.Heatmap(
             z=ai_tools_pivot.values,
             x=ai_tools_pivot.columns,
             y=ai_tools_pivot.index,
             colorscale='Viridis',
             colorbar=dict(title='Usage Rate (%)')
-        ))
-        fig_ai_heatmap.update_layout(
+        )).update_layout(
             title="🔥 AI Tools Usage by Age Heatmap",
             xaxis_title="AI Tools",
             yaxis_title="Age Group",
             title_font_size=20,
             title_x=0.5,
             height=400
-        )
-        st.plotly_chart(fig_ai_heatmap, use_container_width=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+        ),
+        [{'z': ai_tools_pivot.to_numpy(), 'x': ai_tools_pivot.columns.to_numpy(),
+          'y': ai_tools_pivot.index.to_numpy()}]
+    )
     
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        # AI Satisfaction vs Endorsement Scatter
-        ai_satisfaction_data = df.groupby(['Age', 'Country'])['AI_Satisfication'].apply(
-            lambda x: (x == 'Satisfied').mean() * 100).reset_index()
-        ai_endorsement_data = df.groupby(['Age', 'Country'])['AI_Endorsement'].apply(
-            lambda x: (x == 'YES').mean() * 100).reset_index()
-        
-        ai_combined = ai_satisfaction_data.merge(ai_endorsement_data, on=['Age', 'Country'])
-        
-        fig_scatter = px.scatter(
+    # AI Satisfaction vs Endorsement Scatter
+    ai_combined = cube.rates(['Age', 'Country'], ['AI_Satisfication', 'AI_Endorsement']).reset_index()
+    
+    render_mode = scatter_render_mode(len(ai_combined))
+    fig_scatter = skeleton_figure(
+        ('ai_satisfaction_scatter', trace_groups(ai_combined, 'Country'), render_mode),
+        lambda: px.scatter(
             ai_combined,
             x='AI_Endorsement',
             y='AI_Satisfication',
@@ -556,82 +611,103 @@ def create_advanced_ai_analysis(df):
             size='AI_Endorsement',
             hover_data=['Age'],
             title="📊 AI Satisfaction vs Endorsement",
-            trendline="ols"
-        )
-        fig_scatter.update_layout(
+            render_mode=render_mode
+        ).update_layout(
             title_font_size=20,
             title_x=0.5,
             height=400,
             xaxis_title="AI Endorsement Rate (%)",
             yaxis_title="AI Satisfaction Rate (%)"
-        )
-        st.plotly_chart(fig_scatter, use_container_width=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+        ),
+        express_trace_data(ai_combined, {'x': 'AI_Endorsement', 'y': 'AI_Satisfication'}, by='Country',
+                           size='AI_Endorsement', customdata=['Age'])
+    )
+    if FEATURES['enable_trendlines']:
+        # Closed-form per-country lines instead of a statsmodels fit per group
+        add_trendlines(fig_scatter, ai_combined['AI_Endorsement'], ai_combined['AI_Satisfication'],
+                       ai_combined['Country'])
+    
+    return {
+        'age_bar': fig_ai_age,
+        'tools_donut': fig_donut,
+        'parallel': fig_parallel,
+        'tools_heatmap': fig_ai_heatmap,
+        'satisfaction_scatter': fig_scatter,
+    }
 
-def create_advanced_payment_analysis(df):
-    """Create advanced payment method analysis"""
-    st.markdown('<h2 class="section-header">💳 Advanced Payment Method Analysis</h2>', unsafe_allow_html=True)
+def create_advanced_ai_analysis(section):
+    """Create advanced AI adoption analysis with interactive charts"""
+    st.markdown('<h2 class="section-header">🤖 Advanced AI Adoption Analysis</h2>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
     
-    payment_methods = ['Payment_Method_Credit/Debit', 'Payment_Method_COD', 'Payment_Method_Ewallet']
+    with col1:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.plotly_chart(section['age_bar'], use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.plotly_chart(section['tools_donut'], use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Advanced AI Analysis with Parallel Categories
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    st.plotly_chart(section['parallel'], use_container_width=True)
+    st.markdown('</div>', unsafe_allow_html=True)
     
+    # AI Tools Usage Heatmap
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        # Stacked Bar Chart for Payment Methods by Age
-        payment_age_data = []
-        for method in payment_methods:
-            for age in df['Age'].unique():
-                subset = df[df['Age'] == age]
-                usage_rate = (subset[method] == 'YES').mean() * 100
-                payment_age_data.append({
-                    'Method': method.replace('Payment_Method_', ''),
-                    'Age': age,
-                    'Usage_Rate': usage_rate
-                })
-        
-        payment_age_df = pd.DataFrame(payment_age_data)
-        
-        fig_stacked = px.bar(
+        st.plotly_chart(section['tools_heatmap'], use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.plotly_chart(section['satisfaction_scatter'], use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+def compute_payment_analysis(cube):
+    """Compute the figures of the payment method section"""
+    payment_methods = PAYMENT_METHOD_COLUMNS
+    
+    # Stacked Bar Chart for Payment Methods by Age
+    payment_age_df = cube.long_rates('Age', payment_methods, var_name='Method', value_name='Usage_Rate')
+    
+    fig_stacked = skeleton_figure(
+        ('payment_age_stacked', trace_groups(payment_age_df, 'Method')),
+        lambda: px.bar(
             payment_age_df,
             x='Age',
             y='Usage_Rate',
             color='Method',
             title="📊 Payment Method Preferences by Age",
             barmode='stack'
-        )
-        fig_stacked.update_layout(
+        ).update_layout(
             title_font_size=20,
             title_x=0.5,
             height=400,
             xaxis_title="Age Group",
             yaxis_title="Usage Rate (%)"
-        )
-        st.plotly_chart(fig_stacked, use_container_width=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+        ),
+        express_trace_data(payment_age_df, {'x': 'Age', 'y': 'Usage_Rate'}, by='Method')
+    )
     
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        # Interactive Radar Chart for Payment Methods
-        payment_radar_data = []
-        for method in payment_methods:
-            usage_rate = (df[method] == 'YES').mean() * 100
-            payment_radar_data.append({
-                'Method': method.replace('Payment_Method_', ''),
-                'Usage_Rate': usage_rate
-            })
-        
-        payment_radar_df = pd.DataFrame(payment_radar_data)
-        
-        fig_radar = go.Figure()
-        fig_radar.add_trace(go.Scatterpolar(
+    # Interactive Radar Chart for Payment Methods
+    payment_rates = cube.labelled_rates(payment_methods)
+    payment_radar_df = pd.DataFrame({'Method': payment_rates.index, 'Usage_Rate': payment_rates.values})
+    
+    fig_radar = skeleton_figure(
+        'payment_radar',
+        lambda: go.Figure(go.Scatterpolar(
             r=payment_radar_df['Usage_Rate'],
             theta=payment_radar_df['Method'],
             fill='toself',
             name='Payment Methods',
             line_color='#ff7f0e'
-        ))
-        fig_radar.update_layout(
+        )).update_layout(
             polar=dict(
                 radialaxis=dict(
                     visible=True,
@@ -642,27 +718,14 @@ def create_advanced_payment_analysis(df):
             title_font_size=20,
             title_x=0.5,
             height=400
-        )
-        st.plotly_chart(fig_radar, use_container_width=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+        ),
+        express_trace_data(payment_radar_df, {'r': 'Usage_Rate', 'theta': 'Method'})
+    )
     
     # Payment Methods by Country and Region
-    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    payment_geo_data = []
-    for method in payment_methods:
-        for country in df['Country'].unique():
-            for region in df['Living_Region'].unique():
-                subset = df[(df['Country'] == country) & (df['Living_Region'] == region)]
-                if len(subset) > 0:
-                    usage_rate = (subset[method] == 'YES').mean() * 100
-                    payment_geo_data.append({
-                        'Method': method.replace('Payment_Method_', ''),
-                        'Country': country,
-                        'Region': region,
-                        'Usage_Rate': usage_rate
-                    })
-    
-    payment_geo_df = pd.DataFrame(payment_geo_data)
+    payment_geo_df = (cube.long_rates(['Country', 'Living_Region'], payment_methods,
+                                      var_name='Method', value_name='Usage_Rate')
+                      .rename(columns={'Living_Region': 'Region'}))
     
     fig_geo_payment = px.scatter(
         payment_geo_df,
@@ -681,36 +744,46 @@ def create_advanced_payment_analysis(df):
         xaxis_title="Country",
         yaxis_title="Usage Rate (%)"
     )
-    st.plotly_chart(fig_geo_payment, use_container_width=True)
-    st.markdown('</div>', unsafe_allow_html=True)
-
-def create_advanced_product_analysis(df):
-    """Create advanced product category analysis"""
-    st.markdown('<h2 class="section-header">🛍️ Advanced Product Category Analysis</h2>', unsafe_allow_html=True)
     
-    product_categories = [
-        'Product_Category_Appliances', 'Product_Category_Electronics',
-        'Product_Category_Groceries', 'Product_Category_Personal_Care',
-        'Product_Category_Clothing'
-    ]
+    return {
+        'age_stacked': fig_stacked,
+        'radar': fig_radar,
+        'geography': fig_geo_payment,
+    }
+
+def create_advanced_payment_analysis(section):
+    """Create advanced payment method analysis"""
+    st.markdown('<h2 class="section-header">💳 Advanced Payment Method Analysis</h2>', unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        # Interactive Bubble Chart for Product Categories
-        category_data = []
-        for category in product_categories:
-            purchase_rate = (df[category] == 'YES').mean() * 100
-            category_data.append({
-                'Category': category.replace('Product_Category_', ''),
-                'Purchase_Rate': purchase_rate,
-                'Size': purchase_rate * 2  # For bubble size
-            })
-        
-        category_df = pd.DataFrame(category_data)
-        
-        fig_bubble = px.scatter(
+        st.plotly_chart(section['age_stacked'], use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.plotly_chart(section['radar'], use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Payment Methods by Country and Region
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    st.plotly_chart(section['geography'], use_container_width=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def compute_product_analysis(cube):
+    """Compute the figures of the product category section"""
+    product_categories = PRODUCT_CATEGORY_COLUMNS
+    
+    # Interactive Bubble Chart for Product Categories
+    category_rates = cube.labelled_rates(product_categories)
+    category_df = pd.DataFrame({'Category': category_rates.index, 'Purchase_Rate': category_rates.values})
+    category_df['Size'] = category_df['Purchase_Rate'] * 2  # For bubble size
+    
+    fig_bubble = skeleton_figure(
+        'product_bubble',
+        lambda: px.scatter(
             category_df,
             x='Category',
             y='Purchase_Rate',
@@ -719,108 +792,114 @@ def create_advanced_product_analysis(df):
             color_continuous_scale='viridis',
             title="🫧 Product Category Purchase Rates",
             hover_data=['Purchase_Rate']
-        )
-        fig_bubble.update_layout(
+        ).update_layout(
             title_font_size=20,
             title_x=0.5,
             height=400,
             xaxis_title="Product Category",
             yaxis_title="Purchase Rate (%)"
-        )
-        st.plotly_chart(fig_bubble, use_container_width=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+        ),
+        express_trace_data(category_df, {'x': 'Category', 'y': 'Purchase_Rate', 'marker.color': 'Purchase_Rate'},
+                           size='Size')
+    )
     
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        # Product Categories by AI Endorsement
-        category_ai_data = []
-        for category in product_categories:
-            ai_endorsers = df[df['AI_Endorsement'] == 'YES']
-            non_ai_endorsers = df[df['AI_Endorsement'] == 'NO']
-            
-            ai_rate = (ai_endorsers[category] == 'YES').mean() * 100
-            non_ai_rate = (non_ai_endorsers[category] == 'YES').mean() * 100
-            
-            category_ai_data.extend([
-                {'Category': category.replace('Product_Category_', ''), 'Group': 'AI Endorsers', 'Rate': ai_rate},
-                {'Category': category.replace('Product_Category_', ''), 'Group': 'Non-AI Endorsers', 'Rate': non_ai_rate}
-            ])
-        
-        category_ai_df = pd.DataFrame(category_ai_data)
-        
-        fig_category_ai = px.bar(
+    # Product Categories by AI Endorsement
+    category_ai_rates = cube.rates('AI_Endorsement', product_categories)
+    category_ai_rates.index = category_ai_rates.index.map({True: 'AI Endorsers', False: 'Non-AI Endorsers'})
+    category_ai_rates.columns = [short_name(category) for category in category_ai_rates.columns]
+    category_ai_df = (category_ai_rates.rename_axis(index='Group', columns='Category')
+                      .stack().rename('Rate').reset_index()
+                      .sort_values(['Group'], kind='stable'))
+    
+    fig_category_ai = skeleton_figure(
+        ('product_by_endorsement', trace_groups(category_ai_df, 'Group')),
+        lambda: px.bar(
             category_ai_df,
             x='Category',
             y='Rate',
             color='Group',
             title="🤖 Category Preferences by AI Endorsement",
             barmode='group'
-        )
-        fig_category_ai.update_layout(
+        ).update_layout(
             title_font_size=20,
             title_x=0.5,
             height=400,
             xaxis_title="Product Category",
             yaxis_title="Purchase Rate (%)"
-        )
-        st.plotly_chart(fig_category_ai, use_container_width=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+        ),
+        express_trace_data(category_ai_df, {'x': 'Category', 'y': 'Rate'}, by='Group')
+    )
     
     # Advanced Product Analysis with Parallel Categories
-    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    # Prepare data for product analysis
-    product_analysis_data = df[['Age', 'Country', 'AI_Endorsement'] + product_categories].copy()
-    
-    # Convert product categories to single column
-    product_melted = []
-    for _, row in product_analysis_data.iterrows():
-        for category in product_categories:
-            if row[category] == 'YES':
-                product_melted.append({
-                    'Age': row['Age'],
-                    'Country': row['Country'],
-                    'AI_Endorsement': row['AI_Endorsement'],
-                    'Product_Category': category.replace('Product_Category_', ''),
-                    'Purchased': 'Yes'
-                })
-    
-    product_melted_df = pd.DataFrame(product_melted)
-    
-    if len(product_melted_df) > 0:
+    # One row per distinct purchase path, weighted by how many purchases took it
+    product_paths = cube.long_counts(['Age', 'Country', 'AI_Endorsement'], product_categories,
+                                     var_name='Product_Category', value_name='Purchases')
+    
+    fig_product_parallel = None
+    if len(product_paths) > 0:
         # Convert AI_Endorsement to numerical for coloring
-        product_melted_df['AI_Endorsement_Numeric'] = (product_melted_df['AI_Endorsement'] == 'YES').astype(int)
+        endorsement_numeric = product_paths['AI_Endorsement'].astype(int)
+        product_paths['AI_Endorsement'] = flag_label(product_paths['AI_Endorsement'])
         
-        fig_product_parallel = px.parallel_categories(
-            product_melted_df,
-            dimensions=['Age', 'Country', 'AI_Endorsement', 'Product_Category'],
-            color='AI_Endorsement_Numeric',
-            color_continuous_scale='viridis',
-            title="🔄 Product Purchase Journey Analysis"
-        )
-        fig_product_parallel.update_layout(
-            title_font_size=20,
-            title_x=0.5,
-            height=500
+        dimensions = [
+            dict(label=dimension, values=product_paths[dimension].to_numpy())
+            for dimension in ['Age', 'Country', 'AI_Endorsement', 'Product_Category']
+        ]
+        fig_product_parallel = skeleton_figure(
+            'product_journey_parallel',
+            lambda: go.Figure(go.Parcats(
+                dimensions=dimensions,
+                counts=product_paths['Purchases'],
+                line=dict(color=endorsement_numeric, colorscale='viridis', showscale=True)
+            )).update_layout(
+                title="🔄 Product Purchase Journey Analysis",
+                title_font_size=20,
+                title_x=0.5,
+                height=500
+            ),
+            [{
+                'dimensions': dimensions,
+                'counts': product_paths['Purchases'].to_numpy(),
+                'line.color': endorsement_numeric.to_numpy(),
+            }]
         )
-        st.plotly_chart(fig_product_parallel, use_container_width=True)
-    st.markdown('</div>', unsafe_allow_html=True)
+    
+    return {
+        'bubble': fig_bubble,
+        'by_endorsement': fig_category_ai,
+        'journey': fig_product_parallel,
+    }
 
-def create_advanced_geographic_analysis(df):
-    """Create advanced geographic analysis"""
-    st.markdown('<h2 class="section-header">🌍 Advanced Geographic Analysis</h2>', unsafe_allow_html=True)
+def create_advanced_product_analysis(section):
+    """Create advanced product category analysis"""
+    st.markdown('<h2 class="section-header">🛍️ Advanced Product Category Analysis</h2>', unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        # Interactive Bubble Map for Countries
-        country_stats = df.groupby('Country').agg({
-            'AI_Endorsement': lambda x: (x == 'YES').mean() * 100,
-            'Online_Consumer': lambda x: (x == 'YES').mean() * 100,
-            'AI_Satisfication': lambda x: (x == 'Satisfied').mean() * 100
-        }).reset_index()
-        
-        fig_bubble_map = px.scatter(
+        st.plotly_chart(section['bubble'], use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.plotly_chart(section['by_endorsement'], use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Advanced Product Analysis with Parallel Categories
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    if section['journey'] is not None:
+        st.plotly_chart(section['journey'], use_container_width=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def compute_geographic_analysis(cube):
+    """Compute the figures of the geographic section"""
+    # Interactive Bubble Map for Countries
+    country_stats = cube.rates('Country', ['AI_Endorsement', 'Online_Consumer', 'AI_Satisfication']).reset_index()
+    
+    fig_bubble_map = skeleton_figure(
+        ('country_bubble', trace_groups(country_stats, 'Country')),
+        lambda: px.scatter(
             country_stats,
             x='AI_Endorsement',
             y='Online_Consumer',
@@ -828,105 +907,122 @@ def create_advanced_geographic_analysis(df):
             color='Country',
             hover_data=['AI_Satisfication'],
             title="🌐 Country Performance Bubble Chart"
-        )
-        fig_bubble_map.update_layout(
+        ).update_layout(
             title_font_size=20,
             title_x=0.5,
             height=400,
             xaxis_title="AI Endorsement Rate (%)",
             yaxis_title="Online Consumer Rate (%)"
-        )
-        st.plotly_chart(fig_bubble_map, use_container_width=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+        ),
+        express_trace_data(country_stats, {'x': 'AI_Endorsement', 'y': 'Online_Consumer'}, by='Country',
+                           size='AI_Satisfication', customdata=['AI_Satisfication'])
+    )
     
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        # Region Distribution with Sunburst
-        # Create a numerical column for coloring
-        df_geo_sunburst = df.copy()
-        df_geo_sunburst['AI_Endorsement_Numeric'] = (df_geo_sunburst['AI_Endorsement'] == 'YES').astype(int)
-        
-        fig_region_sunburst = px.sunburst(
-            df_geo_sunburst,
-            path=['Country', 'Living_Region', 'Age'],
-            title="🗺️ Geographic Distribution Sunburst",
-            color='AI_Endorsement_Numeric',
-            color_continuous_scale='viridis'
-        )
-        fig_region_sunburst.update_layout(
+    # Region Distribution with Sunburst, coloured by endorsement rate
+    region_nodes = cube.hierarchy(['Country', 'Living_Region', 'Age'])
+    fig_region_sunburst = skeleton_figure(
+        'region_sunburst',
+        lambda: create_hierarchy_chart(
+            region_nodes,
+            kind='sunburst',
+            title="🗺️ Geographic Distribution Sunburst"
+        ).update_layout(
             title_font_size=20,
             title_x=0.5,
             height=400
-        )
-        st.plotly_chart(fig_region_sunburst, use_container_width=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+        ),
+        [hierarchy_data(region_nodes)]
+    )
     
     # Geographic AI Adoption Heatmap
-    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    geo_ai_data = df.groupby(['Country', 'Living_Region'])['AI_Endorsement'].apply(
-        lambda x: (x == 'YES').mean() * 100).reset_index()
+    geo_ai_data = cube.rates(['Country', 'Living_Region'], ['AI_Endorsement']).reset_index()
     
     geo_pivot = geo_ai_data.pivot(index='Living_Region', columns='Country', values='AI_Endorsement')
     
-    fig_geo_heatmap = go.Figure(data=go.Heatmap(
-        z=geo_pivot.values,
-        x=geo_pivot.columns,
-        y=geo_pivot.index,
-        colorscale='Viridis',
-        colorbar=dict(title='AI Endorsement (%)')
-    ))
-    fig_geo_heatmap.update_layout(
-        title="🔥 AI Endorsement Rate by Country and Region",
-        xaxis_title="Country",
-        yaxis_title="Living Region",
-        title_font_size=20,
-        title_x=0.5,
-        height=500
+    fig_geo_heatmap = skeleton_figure(
+        'geo_heatmap',
+        lambda: go.Figure(data=go.Heatmap(
+            z=geo_pivot.values,
+            x=geo_pivot.columns,
+            y=geo_pivot.index,
+            colorscale='Viridis',
+            colorbar=dict(title='AI Endorsement (%)')
+        )).update_layout(
+            title="🔥 AI Endorsement Rate by Country and Region",
+            xaxis_title="Country",
+            yaxis_title="Living Region",
+            title_font_size=20,
+            title_x=0.5,
+            height=500
+        ),
+        [{'z': geo_pivot.to_numpy(), 'x': geo_pivot.columns.to_numpy(), 'y': geo_pivot.index.to_numpy()}]
     )
-    st.plotly_chart(fig_geo_heatmap, use_container_width=True)
-    st.markdown('</div>', unsafe_allow_html=True)
-
-def create_advanced_customer_segmentation(df):
-    """Create advanced customer segmentation analysis"""
-    st.markdown('<h2 class="section-header">👥 Advanced Customer Segmentation</h2>', unsafe_allow_html=True)
-    
-    # Prepare data for clustering
-    le = LabelEncoder()
-    df_cluster = df.copy()
     
-    # Encode categorical variables
-    categorical_cols = ['Age', 'Gender', 'Education', 'Annual_Salary', 'Living_Region']
-    for col in categorical_cols:
-        df_cluster[col + '_encoded'] = le.fit_transform(df_cluster[col])
-    
-    # Select features for clustering
-    features = [col + '_encoded' for col in categorical_cols] + ['AI_Endorsement']
-    X = df_cluster[features].copy()
-    X['AI_Endorsement'] = (X['AI_Endorsement'] == 'YES').astype(int)
-    
-    # Perform K-means clustering
-    kmeans = KMeans(n_clusters=4, random_state=42)
-    df_cluster['Cluster'] = kmeans.fit_predict(X)
-    
-    # Create AI_Endorsement_encoded column for the 3D plot
-    df_cluster['AI_Endorsement_encoded'] = (df_cluster['AI_Endorsement'] == 'YES').astype(int)
+    return {
+        'country_bubble': fig_bubble_map,
+        'region_sunburst': fig_region_sunburst,
+        'heatmap': fig_geo_heatmap,
+    }
+
+def create_advanced_geographic_analysis(section):
+    """Create advanced geographic analysis"""
+    st.markdown('<h2 class="section-header">🌍 Advanced Geographic Analysis</h2>', unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        # 3D Scatter Plot for Clusters
-        fig_cluster_3d = px.scatter_3d(
-            df_cluster,
+        st.plotly_chart(section['country_bubble'], use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.plotly_chart(section['region_sunburst'], use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Geographic AI Adoption Heatmap
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    st.plotly_chart(section['heatmap'], use_container_width=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def compute_customer_segmentation(df, model, sampling):
+    """Compute the clusters, figures and summary table of the segmentation section"""
+    # Label the filtered consumers with the K-means model fitted on the full dataset
+    df_cluster, cluster_info = segment_customers(df, model)
+    
+    # Cluster rates from a sample carry confidence intervals
+    rate_keys = ['ai_adoption', 'online_rate', 'satisfaction_rate']
+    for cluster in cluster_info.values():
+        if sampling:
+            population = cluster['size'] * sampling['population'] / sampling['sample']
+            cluster['margins'] = [float(rate_margin(cluster[key], cluster['size'], population))
+                                  for key in rate_keys]
+        else:
+            cluster['margins'] = [0.0] * len(rate_keys)
+    
+    # Collapse coincident respondents into count-sized markers for the 3D plot
+    df_cluster_3d, _ = apply_point_budget(df_cluster, ['Age', 'Education', 'Annual_Salary'],
+                                          color='Cluster', mean_columns=['AI_Endorsement'])
+    df_cluster_3d['Age_encoded'] = df_cluster_3d['Age'].cat.codes
+    df_cluster_3d['Education_encoded'] = df_cluster_3d['Education'].cat.codes
+    df_cluster_3d['Annual_Salary_encoded'] = df_cluster_3d['Annual_Salary'].cat.codes
+    df_cluster_3d['AI_Endorsement_Rate'] = (df_cluster_3d['AI_Endorsement'] * 100).round(1)
+    
+    # 3D Scatter Plot for Clusters
+    cluster_hover = ['Age', 'Education', 'Annual_Salary', POINTS_COLUMN, 'AI_Endorsement_Rate']
+    title_cluster_3d = "🎯 3D Customer Segmentation" + sample_note(sampling)
+    fig_cluster_3d = skeleton_figure(
+        'clusters_3d',
+        lambda: px.scatter_3d(
+            df_cluster_3d,
             x='Age_encoded',
             y='Education_encoded',
             z='Annual_Salary_encoded',
             color='Cluster',
-            size='AI_Endorsement_encoded',
-            hover_data=['Age', 'Education', 'Annual_Salary', 'Gender'],
-            title="🎯 3D Customer Segmentation"
-        )
-        fig_cluster_3d.update_layout(
+            size=POINTS_COLUMN,
+            hover_data=cluster_hover,
+            title=title_cluster_3d
+        ).update_layout(
             title_font_size=20,
             title_x=0.5,
             height=500,
@@ -935,30 +1031,29 @@ def create_advanced_customer_segmentation(df):
                 yaxis_title="Education Level",
                 zaxis_title="Salary Level"
             )
-        )
-        st.plotly_chart(fig_cluster_3d, use_container_width=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+        ),
+        # Cluster numbers are numeric, so px draws one trace with a continuous colour scale
+        express_trace_data(df_cluster_3d,
+                           {'x': 'Age_encoded', 'y': 'Education_encoded', 'z': 'Annual_Salary_encoded',
+                            'marker.color': 'Cluster'},
+                           size=POINTS_COLUMN, customdata=cluster_hover),
+        layout={'title.text': title_cluster_3d}
+    )
     
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        # Cluster Characteristics Radar Chart
-        cluster_analysis = df_cluster.groupby('Cluster').agg({
-            'AI_Endorsement': lambda x: (x == 'YES').mean() * 100,
-            'Online_Consumer': lambda x: (x == 'YES').mean() * 100,
-            'AI_Satisfication': lambda x: (x == 'Satisfied').mean() * 100
-        }).reset_index()
-        
-        fig_radar_cluster = go.Figure()
-        
-        for _, cluster in cluster_analysis.iterrows():
-            fig_radar_cluster.add_trace(go.Scatterpolar(
-                r=[cluster['AI_Endorsement'], cluster['Online_Consumer'], cluster['AI_Satisfication']],
+    # Cluster Characteristics Radar Chart, one trace per cluster
+    fig_radar_cluster = skeleton_figure(
+        ('cluster_radar', tuple(cluster_info)),
+        lambda: go.Figure([
+            go.Scatterpolar(
+                r=[cluster[key] for key in rate_keys],
                 theta=['AI Endorsement', 'Online Consumer', 'AI Satisfaction'],
+                customdata=cluster['margins'],
+                hovertemplate="%{theta}: %{r:.1f}% ± %{customdata:.1f}<extra>" + cluster_name + "</extra>",
                 fill='toself',
-                name=f'Cluster {cluster["Cluster"]}'
-            ))
-        
-        fig_radar_cluster.update_layout(
+                name=cluster_name
+            )
+            for cluster_name, cluster in cluster_info.items()
+        ]).update_layout(
             polar=dict(
                 radialaxis=dict(
                     visible=True,
@@ -968,73 +1063,114 @@ def create_advanced_customer_segmentation(df):
             title_font_size=20,
             title_x=0.5,
             height=500
-        )
-        st.plotly_chart(fig_radar_cluster, use_container_width=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+        ),
+        [{'r': [cluster[key] for key in rate_keys], 'customdata': cluster['margins']}
+         for cluster in cluster_info.values()]
+    )
     
     # Cluster Analysis Table
-    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    cluster_summary = df_cluster.groupby('Cluster').agg({
-        'Age': lambda x: x.mode()[0] if len(x.mode()) > 0 else 'Unknown',
-        'Gender': lambda x: x.mode()[0] if len(x.mode()) > 0 else 'Unknown',
-        'AI_Endorsement': lambda x: (x == 'YES').mean() * 100,
-        'Online_Consumer': lambda x: (x == 'YES').mean() * 100
-    }).round(2)
+    cluster_summary = pd.DataFrame(
+        [[info['most_common_age'], info['most_common_gender'], info['ai_adoption'], info['online_rate']]
+         for info in cluster_info.values()],
+        index=pd.Index([int(name.split()[-1]) for name in cluster_info], name='Cluster')
+    ).round(2)
     
     cluster_summary.columns = ['Most Common Age', 'Most Common Gender', 'AI Endorsement %', 'Online Consumer %']
+    if sampling:
+        cluster_summary.insert(3, 'AI Endorsement ±', [round(info['margins'][0], 2) for info in cluster_info.values()])
+        cluster_summary['Online Consumer ±'] = [round(info['margins'][1], 2) for info in cluster_info.values()]
+    
+    return {
+        'clusters_3d': fig_cluster_3d,
+        'radar': fig_radar_cluster,
+        'summary': cluster_summary,
+    }
+
+def create_advanced_customer_segmentation(section):
+    """Create advanced customer segmentation analysis"""
+    st.markdown('<h2 class="section-header">👥 Advanced Customer Segmentation</h2>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.plotly_chart(section['clusters_3d'], use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.plotly_chart(section['radar'], use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
     
+    # Cluster Analysis Table
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     st.subheader("📊 Cluster Analysis Results")
-    st.dataframe(cluster_summary, use_container_width=True)
+    st.dataframe(section['summary'], use_container_width=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
-def create_advanced_insights(df):
+def compute_insights(cube):
+    """Compute the headline values and figure of the insights section"""
+    # Calculate key metrics
+    metrics = cube.key_metrics()
+    
+    # AI adoption insights
+    ai_by_age = cube.rates('Age', ['AI_Endorsement'])['AI_Endorsement']
+    
+    # AI endorsement by education
+    ai_by_edu = cube.rates('Education', ['AI_Endorsement'])['AI_Endorsement']
+    
+    # Interactive insights chart
+    insights_data = {
+        'Metric': ['AI Endorsement', 'Online Consumer', 'AI Satisfaction'],
+        'Rate': [metrics['ai_adoption_rate'], metrics['online_rate'], metrics['satisfaction_rate']]
+    }
+    insights_df = pd.DataFrame(insights_data)
+    
+    fig_insights = skeleton_figure(
+        'insights_metrics_bar',
+        lambda: px.bar(
+            insights_df,
+            x='Metric',
+            y='Rate',
+            color='Rate',
+            color_continuous_scale='viridis',
+            title="📊 Key Performance Metrics"
+        ).update_layout(
+            title_font_size=20,
+            title_x=0.5,
+            height=400,
+            xaxis_title="Metrics",
+            yaxis_title="Rate (%)"
+        ),
+        express_trace_data(insights_df, {'x': 'Metric', 'y': 'Rate', 'marker.color': 'Rate'})
+    )
+    
+    return {
+        'metrics': metrics,
+        # Most popular AI tool, payment method and product category
+        'most_popular_tool': cube.labelled_rates(AI_TOOL_COLUMNS).idxmax(),
+        'most_popular_payment': cube.labelled_rates(PAYMENT_METHOD_COLUMNS).idxmax(),
+        'most_popular_category': cube.labelled_rates(PRODUCT_CATEGORY_COLUMNS).idxmax(),
+        'ai_by_age': ai_by_age,
+        'ai_by_edu': ai_by_edu,
+        'key_metrics_bar': fig_insights,
+    }
+
+def create_advanced_insights(section):
     """Create advanced insights with interactive elements"""
     st.markdown('<h2 class="section-header">💡 Advanced Business Insights</h2>', unsafe_allow_html=True)
     
-    # Calculate key metrics
-    total_consumers = len(df)
-    ai_endorsement_rate = float((df['AI_Endorsement'] == 'YES').mean() * 100)
-    online_consumer_rate = float((df['Online_Consumer'] == 'YES').mean() * 100)
-    ai_satisfaction_rate = float((df['AI_Satisfication'] == 'Satisfied').mean() * 100)
-    
-    # Most popular AI tool
-    ai_tools = ['AI_Tools_Used _Chatbots', 'AI_Tools_Used_Virtual_Assistant', 'AI_Tools_Used_Voice&Photo_Search']
-    tool_usage = {}
-    for tool in ai_tools:
-        tool_name = tool.replace('AI_Tools_Used_', '')
-        tool_usage[tool_name] = (df[tool] == 'YES').mean() * 100
-    
-    most_popular_tool = max(tool_usage, key=tool_usage.get)
-    
-    # Most popular payment method
-    payment_methods = ['Payment_Method_Credit/Debit', 'Payment_Method_COD', 'Payment_Method_Ewallet']
-    payment_usage = {}
-    for method in payment_methods:
-        method_name = method.replace('Payment_Method_', '')
-        payment_usage[method_name] = (df[method] == 'YES').mean() * 100
-    
-    most_popular_payment = max(payment_usage, key=payment_usage.get)
-    
-    # Most popular product category
-    product_categories = [
-        'Product_Category_Appliances', 'Product_Category_Electronics',
-        'Product_Category_Groceries', 'Product_Category_Personal_Care',
-        'Product_Category_Clothing'
-    ]
-    category_usage = {}
-    for category in product_categories:
-        category_name = category.replace('Product_Category_', '')
-        category_usage[category_name] = (df[category] == 'YES').mean() * 100
-    
-    most_popular_category = max(category_usage, key=category_usage.get)
+    metrics = section['metrics']
+    total_consumers = metrics['total_consumers']
+    ai_endorsement_rate = metrics['ai_adoption_rate']
+    online_consumer_rate = metrics['online_rate']
+    ai_satisfaction_rate = metrics['satisfaction_rate']
     
-    # AI adoption insights
-    ai_by_age = df.groupby('Age')['AI_Endorsement'].apply(lambda x: (x == 'YES').mean() * 100)
+    ai_by_age = section['ai_by_age']
     highest_ai_age = ai_by_age.idxmax()
     lowest_ai_age = ai_by_age.idxmin()
     
-    # AI endorsement by education
-    ai_by_edu = df.groupby('Education')['AI_Endorsement'].apply(lambda x: (x == 'YES').mean() * 100)
+    ai_by_edu = section['ai_by_edu']
     highest_ai_edu = ai_by_edu.idxmax()
     
     # Create interactive insights dashboard
@@ -1053,34 +1189,13 @@ def create_advanced_insights(df):
         st.markdown("""
         ### 🏆 Top Performers
         """)
-        st.metric("Most Popular AI Tool", most_popular_tool)
-        st.metric("Most Popular Payment", most_popular_payment)
-        st.metric("Most Popular Category", most_popular_category)
+        st.metric("Most Popular AI Tool", section['most_popular_tool'])
+        st.metric("Most Popular Payment", section['most_popular_payment'])
+        st.metric("Most Popular Category", section['most_popular_category'])
     
     # Interactive insights chart
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    insights_data = {
-        'Metric': ['AI Endorsement', 'Online Consumer', 'AI Satisfaction'],
-        'Rate': [ai_endorsement_rate, online_consumer_rate, ai_satisfaction_rate]
-    }
-    insights_df = pd.DataFrame(insights_data)
-    
-    fig_insights = px.bar(
-        insights_df,
-        x='Metric',
-        y='Rate',
-        color='Rate',
-        color_continuous_scale='viridis',
-        title="📊 Key Performance Metrics"
-    )
-    fig_insights.update_layout(
-        title_font_size=20,
-        title_x=0.5,
-        height=400,
-        xaxis_title="Metrics",
-        yaxis_title="Rate (%)"
-    )
-    st.plotly_chart(fig_insights, use_container_width=True)
+    st.plotly_chart(section['key_metrics_bar'], use_container_width=True)
     st.markdown('</div>', unsafe_allow_html=True)
     
     # AI adoption insights
@@ -1093,15 +1208,200 @@ def create_advanced_insights(df):
     - **Highest AI Adoption Education Level:** {highest_ai_edu} ({ai_by_edu[highest_ai_edu]:.1f}%)
     """)
 
+# Dashboard sections in display order. Each declares the inputs its compute
+# function takes, so inputs of unopened sections are never built.
+SECTIONS = {
+    'demographics': {
+        'label': "📊 Demographics",
+        'requires': ('rows', 'cube', 'sampling'),
+        'compute': compute_demographics,
+        'render': create_advanced_demographics,
+    },
+    'ai_analysis': {
+        'label': "🤖 AI Adoption",
+        'requires': ('rows', 'cube', 'sampling'),
+        'compute': compute_ai_analysis,
+        'render': create_advanced_ai_analysis,
+    },
+    'payment_analysis': {
+        'label': "💳 Payment Methods",
+        'requires': ('cube',),
+        'compute': compute_payment_analysis,
+        'render': create_advanced_payment_analysis,
+    },
+    'product_analysis': {
+        'label': "🛍️ Product Categories",
+        'requires': ('cube',),
+        'compute': compute_product_analysis,
+        'render': create_advanced_product_analysis,
+    },
+    'geographic_analysis': {
+        'label': "🌍 Geography",
+        'requires': ('cube',),
+        'compute': compute_geographic_analysis,
+        'render': create_advanced_geographic_analysis,
+    },
+    'customer_segmentation': {
+        'label': "👥 Customer Segmentation",
+        'requires': ('rows', 'segmentation', 'sampling'),
+        'compute': compute_customer_segmentation,
+        'render': create_advanced_customer_segmentation,
+    },
+    'insights': {
+        'label': "💡 Business Insights",
+        'requires': ('cube',),
+        'compute': compute_insights,
+        'render': create_advanced_insights,
+    },
+}
+
+def compute_section(section, inputs):
+    """Run a section's compute function on the inputs it declares"""
+    return section['compute'](*(inputs[name] for name in section['requires']))
+
+def timed_compute_section(name, inputs, perf):
+    """Compute a section inside a 'compute:<name>' stage of the performance log"""
+    section = SECTIONS[name]
+    rows = len(inputs['rows']) if 'rows' in section['requires'] else inputs['cube'].total
+    with perf.stage(f'compute:{name}', rows=rows):
+        result = compute_section(section, inputs)
+    
+    # Round, downcast and de-duplicate figure data before it is sent to the browser
+    with perf.stage(f'compact:{name}') as record:
+        saved = 0
+        for value in result.values():
+            if isinstance(value, go.Figure):
+                _, stats = compact_figure(value, measure=perf.detailed)
+                saved += stats['bytes_saved'] or 0
+        if perf.detailed:
+            record['bytes_saved'] = saved
+    return result
+
+def compute_sections(names, inputs, pool=None, perf=None):
+    """
+    Compute several sections, concurrently when a worker pool is given
+    
+    Compute functions are pure, so they can run on worker threads; pandas,
+    scikit-learn and statsmodels release the GIL in their heavy parts.
+    """
+    perf = perf or PerformanceLog()
+    if pool is None or len(names) < 2:
+        return {name: timed_compute_section(name, inputs, perf) for name in names}
+    
+    futures = {name: pool.submit(timed_compute_section, name, inputs, perf) for name in names}
+    return {name: future.result() for name, future in futures.items()}
+
+def create_export_controls(df, filter_index, selection, source=None):
+    """
+    Sidebar export with a column and format picker
+    
+    With a ``source`` (streaming mode, where ``df`` is only a sample) the
+    matching rows are read from the source files instead of from ``df``.
+    """
+    with st.sidebar.expander("📥 Export Filtered Data"):
+        if source is not None:
+            st.caption("Exports read every matching row from the source files, not the sample.")
+        # Streaming exports re-read the source files, which lack the columns
+        # derived in preprocessing
+        options = source_columns(source) if source is not None else list(df.columns)
+        columns = st.multiselect(
+            "Columns",
+            options=options,
+            default=options
+        )
+        fmt = st.selectbox(
+            "Format",
+            options=available_formats(),
+            format_func=lambda name: EXPORT_FORMATS[name][2]
+        )
+        
+        if st.button("📥 Download Filtered Data", disabled=not columns):
+            # Rows are picked chunk by chunk with the filter mask and streamed
+            # to a temporary file, which is removed once it has been handed over
+            if source is not None:
+                path = export_source(source, selection, columns, fmt)
+            else:
+                path = export_rows(df, filter_index.mask(selection), columns, fmt)
+            try:
+                extension, mime, label = EXPORT_FORMATS[fmt]
+                with open(path, 'rb') as handle:
+                    st.download_button(
+                        label=f"Download {label}",
+                        data=handle,
+                        file_name=f"filtered_ecommerce_data{extension}",
+                        mime=mime
+                    )
+            finally:
+                path.unlink()
+
+def performance_panel_enabled():
+    """Show the performance panel when configured or requested with ?perf=1"""
+    if PERFORMANCE['performance_panel']:
+        return True
+    try:
+        value = st.query_params.get('perf')
+    except AttributeError:
+        # Streamlit < 1.30
+        value = st.experimental_get_query_params().get('perf', [None])[0]
+    return value in ('1', 'true', 'yes')
+
+def render_performance_panel(perf, results, cache_hits):
+    """Sidebar table of the current rerun's stages and section costs"""
+    with st.sidebar.expander("⏱️ Performance", expanded=True):
+        stages = perf.frame()
+        prep = stages[~stages['stage'].str.match('(compute|compact|render):')]
+        st.markdown("**Data preparation**")
+        st.dataframe(prep.reindex(columns=['stage', 'seconds', 'rows']).round(4),
+                     hide_index=True, use_container_width=True)
+        
+        sections = []
+        for name, result in results.items():
+            compute = perf.get(f'compute:{name}') or {}
+            compact = perf.get(f'compact:{name}') or {}
+            render = perf.get(f'render:{name}') or {}
+            sections.append({
+                'section': name,
+                'cache': 'hit' if name in cache_hits else 'miss',
+                'compute_s': compute.get('seconds', 0.0),
+                'render_s': render.get('seconds', 0.0),
+                'rows': compute.get('rows'),
+                'payload_kb': figure_bytes(result) / 1024,
+                'saved_kb': compact.get('bytes_saved', 0) / 1024,
+            })
+        st.markdown("**Sections**")
+        st.dataframe(pd.DataFrame(sections).round(4), hide_index=True, use_container_width=True)
+
 def main():
     """Main dashboard function"""
+    # Per-rerun timings of every data-prep step and section
+    show_performance = performance_panel_enabled()
+    perf = PerformanceLog(detailed=show_performance)
+    if PERFORMANCE['trace_memory']:
+        enable_memory_tracing()
+    
+    # Load the current dataset version, including any rows appended since the last rerun
+    with perf.stage('load_data') as record:
+        dataset = load_data()
+        record['rows'] = dataset['rows']
+    version = dataset['version']
+    with perf.stage('preprocess_data', rows=len(dataset['df'])):
+        df = preprocess_data(version, dataset['df'])
+    filter_index = dataset['filter_index']
+    
+    # Data badge describing what is actually loaded
+    if dataset['updated'] is not None:
+        updated = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(dataset['updated']))
+        data_badge = f"📈 {dataset['rows']:,} rows · updated {updated}"
+    else:
+        data_badge = f"📈 {dataset['rows']:,} rows streamed"
+    
     # Attractive Header Section
     st.markdown('<h1 class="main-header">🚀 AI-Powered E-commerce Analytics Hub</h1>', unsafe_allow_html=True)
     
     st.markdown('<p class="subtitle">Comprehensive Consumer Behavior Analysis & AI Adoption Insights</p>', unsafe_allow_html=True)
     
     # Dashboard Info Card
-    st.markdown("""
+    st.markdown(f"""
     <div class="dashboard-info">
         <h3>🎯 Dashboard Overview</h3>
         <p>
@@ -1114,76 +1414,162 @@ def main():
         </p>
         <div style="text-align: center; margin-top: 1rem;">
             <span class="status-badge">🟢 Live Analytics</span>
-            <span class="status-badge">📈 Real-time Data</span>
+            <span class="status-badge">{data_badge}</span>
             <span class="status-badge">🎨 Interactive Charts</span>
         </div>
     </div>
     """, unsafe_allow_html=True)
     
-    # Load and preprocess data
-    df = load_data()
-    df = preprocess_data(df)
-    
     # Sidebar filters with enhanced styling
     st.sidebar.markdown("## 🔍 Advanced Filters")
+    selection = {}
     
     # Country filter
-    selected_countries = st.sidebar.multiselect(
+    selection['Country'] = st.sidebar.multiselect(
         "🌍 Select Countries",
-        options=df['Country'].unique(),
-        default=df['Country'].unique()
+        options=filter_index.values('Country'),
+        default=filter_index.values('Country')
     )
     
     # Age filter
-    selected_ages = st.sidebar.multiselect(
+    selection['Age'] = st.sidebar.multiselect(
         "👥 Select Age Groups",
-        options=df['Age'].unique(),
-        default=df['Age'].unique()
+        options=filter_index.values('Age'),
+        default=filter_index.values('Age')
     )
     
     # Gender filter
-    selected_genders = st.sidebar.multiselect(
+    selection['Gender'] = st.sidebar.multiselect(
         "👤 Select Gender",
-        options=df['Gender'].unique(),
-        default=df['Gender'].unique()
+        options=filter_index.values('Gender'),
+        default=filter_index.values('Gender')
     )
     
+    # Education filter
+    if 'Education' in filter_index.columns:
+        selection['Education'] = st.sidebar.multiselect(
+            "🎓 Select Education",
+            options=filter_index.values('Education'),
+            default=filter_index.values('Education')
+        )
+    
+    # Living region filter
+    if 'Living_Region' in filter_index.columns:
+        selection['Living_Region'] = st.sidebar.multiselect(
+            "🏙️ Select Living Region",
+            options=filter_index.values('Living_Region'),
+            default=filter_index.values('Living_Region')
+        )
+    
     # AI Endorsement filter
-    selected_ai = st.sidebar.multiselect(
+    selection['AI_Endorsement'] = st.sidebar.multiselect(
         "🤖 Select AI Endorsement",
-        options=df['AI_Endorsement'].unique(),
-        default=df['AI_Endorsement'].unique()
+        options=filter_index.values('AI_Endorsement'),
+        default=filter_index.values('AI_Endorsement'),
+        format_func=lambda value: 'YES' if value else 'NO'
     )
     
-    # Apply filters
-    filtered_df = df[
-        (df['Country'].isin(selected_countries)) &
-        (df['Age'].isin(selected_ages)) &
-        (df['Gender'].isin(selected_genders)) &
-        (df['AI_Endorsement'].isin(selected_ai))
-    ]
-    
-    # Display filtered data info
-    st.sidebar.markdown(f"**📊 Filtered Data:** {len(filtered_df)} records")
-    
-    # Add download button for filtered data
-    if st.sidebar.button("📥 Download Filtered Data"):
-        csv = filtered_df.to_csv(index=False)
-        st.sidebar.download_button(
-            label="Download CSV",
-            data=csv,
-            file_name="filtered_ecommerce_data.csv",
-            mime="text/csv"
+    # Section selector; with lazy loading only the opened sections are computed
+    if PERFORMANCE['enable_lazy_loading']:
+        st.sidebar.markdown("## 📑 Sections")
+        open_sections = st.sidebar.multiselect(
+            "📂 Open Sections",
+            options=list(SECTIONS),
+            default=list(SECTIONS)[:1],
+            format_func=lambda name: SECTIONS[name]['label']
         )
+    else:
+        open_sections = list(SECTIONS)
+    
+    # Large selections take their row-level charts from a stratified sample
+    force_exact = st.sidebar.checkbox(
+        "🎯 Force exact computation",
+        value=False,
+        help="Compute every chart from all matching rows, even for large selections"
+    )
+    
+    # Rates come from the dataset's cube narrowed to the selection, which
+    # costs a pass over its cells rather than over the rows
+    with perf.stage('filter_cube') as record:
+        filtered_cube = dataset['cube'].filter(selection)
+        record['rows'] = filtered_cube.total
+    approximate = not STREAMING_CONFIG['enabled'] and use_approximation(filtered_cube.total, force_exact)
+    
+    # Apply filters: bitwise OR within a column, AND across columns
+    with perf.stage('filter_rows', approximate=approximate) as record:
+        if approximate:
+            sample = load_sample(version, df)
+            filtered_df = sample['filter_index'].apply(sample['df'], selection)
+        else:
+            filtered_df = filter_index.apply(df, selection)
+        record['rows'] = len(filtered_df)
     
-    # Create dashboard sections
-    create_advanced_demographics(filtered_df)
-    create_advanced_ai_analysis(filtered_df)
-    create_advanced_payment_analysis(filtered_df)
-    create_advanced_product_analysis(filtered_df)
-    create_advanced_geographic_analysis(filtered_df)
-    create_advanced_customer_segmentation(filtered_df)
-    create_advanced_insights(filtered_df)
+    # Display filtered data info
+    if STREAMING_CONFIG['enabled'] or approximate:
+        # The rows are a sample of the matching records
+        sampling = sampling_info(filtered_cube.total, len(filtered_df))
+        st.sidebar.markdown(f"**📊 Filtered Data:** {filtered_cube.total} records "
+                            f"({len(filtered_df)} sampled)")
+    else:
+        sampling = None
+        st.sidebar.markdown(f"**📊 Filtered Data:** {len(filtered_df)} records")
+    cache_status = st.sidebar.empty()
+    
+    # The sections chart at least one matching record
+    no_records = filtered_cube.total == 0 or filtered_df.empty
+    if no_records:
+        open_sections = []
+    
+    # Export of the filtered data, written in chunks only when requested
+    if FEATURES['enable_export']:
+        source = STREAMING_CONFIG['source'] if STREAMING_CONFIG['enabled'] else None
+        create_export_controls(df, filter_index, selection, source)
+    
+    # Reuse sections already computed for the same selection
+    section_cache = load_section_cache()
+    key = selection_key(selection, f"{version}:{'approximate' if approximate else 'exact'}")
+    results = {}
+    for name in open_sections:
+        found, result = section_cache.get((name, key))
+        if found:
+            results[name] = result
+    cache_hits = set(results)
+    missing = [name for name in open_sections if name not in results]
+    
+    # Build only the inputs the missing sections declare, once, before they fan out
+    input_builders = {
+        'rows': lambda: filtered_df,
+        'cube': lambda: filtered_cube,
+        'sampling': lambda: sampling,
+        'segmentation': partial(load_segmentation, version, df),
+    }
+    required = {name for section in missing for name in SECTIONS[section]['requires']}
+    inputs = {}
+    for name in required:
+        with perf.stage(f'input:{name}'):
+            inputs[name] = input_builders[name]()
+    
+    # Compute the missing sections on the worker pool, then place the figures
+    pool = load_section_pool() if PERFORMANCE['section_workers'] > 1 else None
+    for name, result in compute_sections(missing, inputs, pool, perf).items():
+        section_cache.set((name, key), result)
+        results[name] = result
+    
+    if no_records:
+        st.warning("🔍 No records match the selected filters. Widen the selection to see the charts.")
+    elif not open_sections:
+        st.info("📂 Open a section from the sidebar to start exploring.")
+    
+    for name in open_sections:
+        with perf.stage(f'render:{name}', cache='hit' if name in cache_hits else 'miss'):
+            SECTIONS[name]['render'](results[name])
+    
+    stats = section_cache.stats
+    cache_status.markdown(f"**⚡ Section Cache:** {stats['hits']} hits / {stats['misses']} misses")
+    
+    # Hidden performance panel, opened with ?perf=1 or the performance_panel setting
+    if show_performance:
+        render_performance_panel(perf, {name: results[name] for name in open_sections}, cache_hits)
     
     # Footer
     st.markdown("---")
@@ -1,11 +1,42 @@
 """
 Utility functions for the AI-Powered E-commerce Analytics Hub
+
+Submodules are imported on first use: ``from utils import compute_key_metrics``
+still works, but importing one submodule, e.g. ``utils.rate_cube``, does not
+load the plotting helpers or their dependencies.
 """
 
-from .data_insights import *
-from .chart_helpers import *
-from .data_processing import *
+import importlib
+from typing import Any, List
 
 __version__ = "1.0.0"
 __author__ = "AI Analytics Team"
-__email__ = "contact@aianalytics.com" 
\ No newline at end of file
+__email__ = "contact@aianalytics.com"
+
+# Modules whose public names are available on the package, in lookup order
+_EXPORTING_MODULES = ("data_insights", "chart_helpers", "data_processing")
+
+
+def _public_names(module: Any) -> List[str]:
+    """Names a star import of the module would bind"""
+    names = getattr(module, "__all__", None)
+    if names is None:
+        names = [name for name in vars(module) if not name.startswith("_")]
+    return list(names)
+
+
+def __getattr__(name: str) -> Any:
+    for module_name in _EXPORTING_MODULES:
+        module = importlib.import_module(f".{module_name}", __name__)
+        if name in _public_names(module):
+            value = getattr(module, name)
+            globals()[name] = value
+            return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    names = set(globals())
+    for module_name in _EXPORTING_MODULES:
+        names.update(_public_names(importlib.import_module(f".{module_name}", __name__)))
+    return sorted(names)
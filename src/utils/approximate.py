@@ -0,0 +1,99 @@
+"""
+Approximate query mode for the AI-Powered E-commerce Analytics Hub
+
+A sample stratified by Country and Age is drawn once per dataset version.
+Large selections take their row-level work from the part of that sample that
+matches the filters, so it stays bounded as the dataset grows; small
+selections are computed exactly. Rates computed from the sample carry
+normal-approximation confidence intervals with a finite population correction.
+"""
+
+from statistics import NormalDist
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config.settings import APPROXIMATION_CONFIG
+
+from .point_budget import stratified_sample
+
+
+def use_approximation(n_rows: int, force_exact: bool = False) -> bool:
+    """
+    Decide whether a selection is large enough to answer from a sample
+
+    Args:
+        n_rows: Number of rows in the selection
+        force_exact: User override that always selects exact computation
+
+    Returns:
+        True when the approximate mode should be used
+    """
+    if force_exact or not APPROXIMATION_CONFIG["enabled"]:
+        return False
+    return n_rows > APPROXIMATION_CONFIG["min_rows"]
+
+
+def draw_sample(df: pd.DataFrame, n: Optional[int] = None, strata: Optional[Sequence[str]] = None,
+                random_state: int = 42) -> pd.DataFrame:
+    """
+    Proportionally allocated stratified sample of a dataset
+
+    Every stratum keeps its share of the rows, so the rows of the sample that
+    match a filter selection are again a proportional sample of that selection.
+
+    Args:
+        df: Typed DataFrame
+        n: Target sample size; defaults to the configured value
+        strata: Stratification columns; defaults to Country and Age
+        random_state: Seed for reproducible samples
+
+    Returns:
+        Sampled rows, in their original order
+    """
+    n = n or APPROXIMATION_CONFIG["sample_size"]
+    strata = [col for col in (strata or APPROXIMATION_CONFIG["strata"]) if col in df.columns]
+    if not strata:
+        return df.sample(min(n, len(df)), random_state=random_state).sort_index()
+    return stratified_sample(df, strata, n, random_state)
+
+
+def sampling_info(population: int, sample: int) -> Dict[str, Any]:
+    """Sampling metadata passed to the sections computed from a sample"""
+    return {"population": int(population), "sample": int(sample)}
+
+
+def rate_margin(rate: Any, n: Any, population: Any = None, confidence: Optional[float] = None) -> Any:
+    """
+    Half-width of the confidence interval of a sampled rate
+
+    Args:
+        rate: Rate or rates in percent (0-100)
+        n: Sample size behind each rate
+        population: Population size behind each rate, for the finite
+            population correction; omitted for an infinite population
+        confidence: Confidence level; defaults to the configured value
+
+    Returns:
+        Margin in percentage points, with the shape of ``rate``
+    """
+    confidence = confidence or APPROXIMATION_CONFIG["confidence"]
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = np.asarray(rate, dtype=float) / 100
+    n = np.asarray(n, dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        margin = z * np.sqrt(p * (1 - p) / n)
+        if population is not None:
+            population = np.asarray(population, dtype=float)
+            fpc = np.sqrt(np.clip((population - n) / np.maximum(population - 1, 1), 0, 1))
+            margin = margin * fpc
+    return margin * 100
+
+
+def sample_note(sampling: Optional[Dict[str, Any]]) -> str:
+    """Short label describing the sample behind a chart, empty in exact mode"""
+    if not sampling:
+        return ""
+    return f" (≈ sample of {sampling['sample']:,} / {sampling['population']:,})"
@@ -2,14 +2,17 @@
 Chart helper functions for creating consistent and attractive visualizations
 """
 
+import plotly
 import plotly.graph_objects as go
-import plotly.express as px
-import plotly.figure_factory as ff
-from plotly.subplots import make_subplots
+import plotly.io as pio
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple, Any
-import streamlit as st
+import re
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from config.settings import CHART_CONFIG
+
+from .result_cache import ResultCache
 
 def create_gradient_colors(n_colors: int, start_color: str = "#1f77b4", end_color: str = "#ff7f0e") -> List[str]:
     """
@@ -45,6 +48,63 @@ def create_gradient_colors(n_colors: int, start_color: str = "#1f77b4", end_colo
     
     return colors
 
+# Layout settings of the chart themes
+CHART_THEMES: Dict[str, Dict[str, Any]] = {
+    "professional": {
+        "template": "plotly_white",
+        "font_family": "Arial, sans-serif",
+        "font_size": 12,
+        "title_font_size": 16,
+        "paper_bgcolor": "rgba(0,0,0,0)",
+        "plot_bgcolor": "rgba(0,0,0,0)",
+        "margin": {"l": 60, "r": 40, "t": 60, "b": 60}
+    },
+    "modern": {
+        "template": "plotly_dark",
+        "font_family": "Segoe UI, sans-serif",
+        "font_size": 11,
+        "title_font_size": 18,
+        "paper_bgcolor": "#1a1a1a",
+        "plot_bgcolor": "#1a1a1a",
+        "margin": {"l": 50, "r": 30, "t": 50, "b": 50}
+    },
+    "minimal": {
+        "template": "simple_white",
+        "font_family": "Helvetica, sans-serif",
+        "font_size": 10,
+        "title_font_size": 14,
+        "paper_bgcolor": "white",
+        "plot_bgcolor": "white",
+        "margin": {"l": 40, "r": 20, "t": 40, "b": 40}
+    }
+}
+
+# Theme layouts, built once per process instead of on every call
+_THEME_LAYOUTS: Dict[str, Dict[str, Any]] = {}
+
+def _theme_layout(theme: str) -> Dict[str, Any]:
+    """Layout properties of a theme, with its template resolved once"""
+    layout = _THEME_LAYOUTS.get(theme)
+    if layout is None:
+        config = CHART_THEMES.get(theme, CHART_THEMES["professional"])
+        layout = {
+            "template": pio.templates[config["template"]],
+            "font": dict(
+                family=config["font_family"],
+                size=config["font_size"]
+            ),
+            "title": dict(
+                font=dict(size=config["title_font_size"])
+            ),
+            "paper_bgcolor": config["paper_bgcolor"],
+            "plot_bgcolor": config["plot_bgcolor"],
+            "margin": config["margin"],
+            "hovermode": "closest",
+            "showlegend": True
+        }
+        _THEME_LAYOUTS[theme] = layout
+    return layout
+
 def apply_chart_theme(fig: go.Figure, theme: str = "professional") -> go.Figure:
     """
     Apply consistent theme to charts
@@ -56,56 +116,220 @@ def apply_chart_theme(fig: go.Figure, theme: str = "professional") -> go.Figure:
     Returns:
         Updated figure object
     """
-    themes = {
-        "professional": {
-            "template": "plotly_white",
-            "font_family": "Arial, sans-serif",
-            "font_size": 12,
-            "title_font_size": 16,
-            "paper_bgcolor": "rgba(0,0,0,0)",
-            "plot_bgcolor": "rgba(0,0,0,0)",
-            "margin": {"l": 60, "r": 40, "t": 60, "b": 60}
-        },
-        "modern": {
-            "template": "plotly_dark",
-            "font_family": "Segoe UI, sans-serif",
-            "font_size": 11,
-            "title_font_size": 18,
-            "paper_bgcolor": "#1a1a1a",
-            "plot_bgcolor": "#1a1a1a",
-            "margin": {"l": 50, "r": 30, "t": 50, "b": 50}
-        },
-        "minimal": {
-            "template": "simple_white",
-            "font_family": "Helvetica, sans-serif",
-            "font_size": 10,
-            "title_font_size": 14,
-            "paper_bgcolor": "white",
-            "plot_bgcolor": "white",
-            "margin": {"l": 40, "r": 20, "t": 40, "b": 40}
-        }
+    fig.update_layout(**_theme_layout(theme))
+    
+    return fig
+
+def create_hierarchy_chart(nodes: pd.DataFrame, kind: str = "sunburst", values: str = "count",
+                           title: str = "", rate_label: str = "AI Endorsement",
+                           colorscale: str = "viridis") -> go.Figure:
+    """
+    Create a sunburst or treemap from a pre-aggregated node table
+
+    Args:
+        nodes: Node table as returned by RateCube.hierarchy
+        kind: Chart type ('sunburst' or 'treemap')
+        values: Node table column that sizes each node
+        title: Chart title
+        rate_label: Name of the rate shown in the colour bar and hover text
+        colorscale: Plotly colour scale for the rate
+
+    Returns:
+        Plotly figure object
+    """
+    trace_type = go.Treemap if kind == "treemap" else go.Sunburst
+    data = hierarchy_data(nodes, values)
+    fig = go.Figure(trace_type(
+        ids=data["ids"],
+        labels=data["labels"],
+        parents=data["parents"],
+        values=data["values"],
+        branchvalues="total",
+        marker=dict(
+            colors=data["marker.colors"],
+            colorscale=colorscale,
+            showscale=True,
+            colorbar=dict(title=f"{rate_label} (%)")
+        ),
+        customdata=data["customdata"],
+        hovertemplate=(
+            "<b>%{label}</b><br>Consumers: %{customdata[0]:,}<br>"
+            f"{rate_label}: %{{customdata[1]:.1f}}%<extra></extra>"
+        )
+    ))
+    fig.update_layout(title=title)
+    return fig
+
+def hierarchy_data(nodes: pd.DataFrame, values: str = "count") -> Dict[str, Any]:
+    """
+    Data arrays of a sunburst or treemap trace, for FigureSkeleton.render
+    
+    Args:
+        nodes: Node table as returned by RateCube.hierarchy
+        values: Node table column that sizes each node
+    
+    Returns:
+        Dict of trace property paths to arrays
+    """
+    return {
+        "ids": nodes["id"].to_numpy(),
+        "labels": nodes["label"].to_numpy(),
+        "parents": nodes["parent"].to_numpy(),
+        "values": nodes[values].to_numpy(),
+        "marker.colors": nodes["rate"].to_numpy(),
+        "customdata": np.column_stack([nodes["count"], nodes["rate"]]),
     }
+
+def _set_path(props: Dict[str, Any], path: str, value: Any) -> None:
+    """Set a dotted property path, copying the nested dicts along it"""
+    *parents, name = path.split(".")
+    for key in parents:
+        props[key] = dict(props.get(key) or {})
+        props = props[key]
+    props[name] = value
+
+def _drop_path(props: Dict[str, Any], path: str) -> None:
+    """Remove a dotted property path, copying the nested dicts along it"""
+    *parents, name = path.split(".")
+    for key in parents:
+        if not isinstance(props.get(key), dict):
+            return
+        props[key] = dict(props[key])
+        props = props[key]
+    props.pop(name, None)
+
+class FigureSkeleton:
+    """
+    Layout and trace structure of a chart, validated once and reused
     
-    config = themes.get(theme, themes["professional"])
+    Holds the plain property dicts of a fully built figure. ``render`` copies
+    them, swaps in new data arrays and constructs the figure without Plotly's
+    per-property validation, which dominates the cost of building a figure
+    through Plotly Express. The data of the first build is not kept: the
+    properties every render replaces are dropped from the stored traces.
     
-    fig.update_layout(
-        template=config["template"],
-        font=dict(
-            family=config["font_family"],
-            size=config["font_size"]
-        ),
-        title=dict(
-            font=dict(size=config["title_font_size"])
-        ),
-        paper_bgcolor=config["paper_bgcolor"],
-        plot_bgcolor=config["plot_bgcolor"],
-        margin=config["margin"],
-        hovermode="closest",
-        showlegend=True
-    )
+    Args:
+        fig: Validated figure whose layout and trace styling are reused
+        data_paths: Property paths of each trace that renders replace
+    """
+    
+    def __init__(self, fig: go.Figure, data_paths: Optional[List[Iterable[str]]] = None):
+        spec = fig.to_plotly_json()
+        self.layout: Dict[str, Any] = spec["layout"]
+        self.traces: List[Dict[str, Any]] = spec["data"]
+        for trace, paths in zip(self.traces, data_paths or []):
+            for path in paths:
+                _drop_path(trace, path)
+    
+    def render(self, traces: List[Dict[str, Any]], layout: Optional[Dict[str, Any]] = None) -> go.Figure:
+        """
+        Build a figure from the skeleton with new data
+        
+        Args:
+            traces: One dict per skeleton trace, in order, mapping property
+                paths such as 'x' or 'marker.color' to their new values
+            layout: Layout property paths to replace, e.g. {'title.text': ...}
+        
+        Returns:
+            New figure object; the skeleton is left unchanged
+        """
+        if len(traces) != len(self.traces):
+            raise ValueError(f"Skeleton has {len(self.traces)} traces, got data for {len(traces)}")
+        
+        data = []
+        for skeleton, update in zip(self.traces, traces):
+            trace = dict(skeleton)
+            for path, value in update.items():
+                _set_path(trace, path, value)
+            data.append(trace)
+        
+        figure_layout = dict(self.layout)
+        for path, value in (layout or {}).items():
+            _set_path(figure_layout, path, value)
+        
+        # The figure deep-copies the dicts, so renders never share state
+        return go.Figure({"data": data, "layout": figure_layout}, _validate=False)
+
+# Process-wide skeletons, keyed by chart and trace structure. Keys include the
+# trace groups, so they grow with the filter selections seen; least recently
+# used skeletons are evicted beyond the configured size
+_SKELETONS = ResultCache(max_entries=CHART_CONFIG["skeleton_cache_size"], ttl=None)
+
+def skeleton_figure(key: Hashable, build: Callable[[], go.Figure], traces: List[Dict[str, Any]],
+                    layout: Optional[Dict[str, Any]] = None) -> go.Figure:
+    """
+    Build a chart from its cached skeleton, creating the skeleton on first use
+    
+    The first call for a key builds the figure with ``build`` and keeps its
+    skeleton; later calls only render ``traces`` and ``layout`` into a copy.
+    The key must change whenever the trace structure does, e.g. include the
+    group names of a chart with one trace per group.
+    
+    Args:
+        key: Chart and trace structure, e.g. ('payment_stacked', groups)
+        build: Builds the complete figure for the current data
+        traces: Data of each trace, as for FigureSkeleton.render
+        layout: Layout values that vary between renders, such as the title
     
+    Returns:
+        Plotly figure object
+    """
+    found, skeleton = _SKELETONS.get(key)
+    if found:
+        return skeleton.render(traces, layout)
+    
+    fig = build()
+    _SKELETONS.set(key, FigureSkeleton(fig, [list(trace) for trace in traces]))
     return fig
 
+def clear_figure_skeletons() -> None:
+    """Drop all cached skeletons, e.g. after changing how charts are built"""
+    _SKELETONS.clear()
+
+def trace_groups(df: pd.DataFrame, by: Optional[str] = None) -> Tuple[Any, ...]:
+    """Group values in the order Plotly Express draws one trace per group"""
+    if by is None:
+        return ()
+    return tuple(pd.unique(df[by].to_numpy()))
+
+def express_trace_data(df: pd.DataFrame, columns: Dict[str, str], by: Optional[str] = None,
+                       size: Optional[str] = None, size_max: int = 20,
+                       customdata: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Data of the traces Plotly Express draws for a DataFrame
+    
+    Mirrors how px splits rows into one trace per ``color`` group, in order
+    of appearance, and scales marker sizes against the largest size.
+    
+    Args:
+        df: Data the chart was built from
+        columns: Trace property path -> column, e.g. {'x': 'Age', 'marker.color': 'Rate'}
+        by: Discrete ``color`` column; None for a single trace
+        size: ``size`` column, if the chart sizes its markers
+        size_max: ``size_max`` passed to px
+        customdata: Columns px places in customdata for ``hover_data``
+    
+    Returns:
+        One dict per trace, as for FigureSkeleton.render
+    """
+    sizeref = df[size].max() / size_max ** 2 if size is not None and len(df) else None
+    if by is None:
+        parts = [df]
+    else:
+        values = df[by].to_numpy()
+        parts = [df[values == group] for group in trace_groups(df, by)]
+    
+    traces = []
+    for part in parts:
+        trace = {path: part[col].to_numpy() for path, col in columns.items()}
+        if size is not None:
+            trace["marker.size"] = part[size].to_numpy()
+            trace["marker.sizeref"] = sizeref
+        if customdata:
+            trace["customdata"] = part[customdata].to_numpy()
+        traces.append(trace)
+    return traces
+
 def add_annotations(fig: go.Figure, annotations: List[Dict[str, Any]]) -> go.Figure:
     """
     Add custom annotations to charts
@@ -267,4 +491,423 @@ def create_summary_stats(df: pd.DataFrame, numeric_columns: List[str]) -> Dict[s
                 "max": col_stats["max"]
             }
     
-    return stats 
\ No newline at end of file
+    return stats 
+
+# Default LOWESS span, as a fraction of the points, and bins per group
+LOWESS_FRAC = 2 / 3
+LOWESS_BINS = 200
+
+def _group_codes(n: int, groups: Optional[Any]) -> Tuple[np.ndarray, pd.Index]:
+    """Integer code per point and the group labels; one group when None"""
+    if groups is None:
+        return np.zeros(n, dtype=np.intp), pd.Index([None])
+    codes, labels = pd.factorize(pd.Series(groups), sort=False)
+    return codes.astype(np.intp), pd.Index(labels)
+
+def fit_trendlines(x: Any, y: Any, groups: Optional[Any] = None) -> pd.DataFrame:
+    """
+    Least-squares lines of y on x for every group at once
+    
+    Per-group means and centred sums are computed with np.bincount, so all
+    groups are fitted in two vectorized passes instead of one model per group.
+    
+    Args:
+        x: Predictor values
+        y: Response values
+        groups: Group label per point; None fits a single line
+    
+    Returns:
+        DataFrame indexed by group with n, slope, intercept, r_squared,
+        x_min and x_max; slope is NaN for groups without variation in x
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    codes, labels = _group_codes(len(x), groups)
+    
+    valid = np.isfinite(x) & np.isfinite(y) & (codes >= 0)
+    x, y, codes = x[valid], y[valid], codes[valid]
+    k = len(labels)
+    
+    n = np.bincount(codes, minlength=k).astype(float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_mean = np.bincount(codes, weights=x, minlength=k) / n
+        y_mean = np.bincount(codes, weights=y, minlength=k) / n
+        dx = x - x_mean[codes]
+        dy = y - y_mean[codes]
+        sxx = np.bincount(codes, weights=dx * dx, minlength=k)
+        sxy = np.bincount(codes, weights=dx * dy, minlength=k)
+        syy = np.bincount(codes, weights=dy * dy, minlength=k)
+        
+        slope = np.where(sxx > 0, sxy / sxx, np.nan)
+        intercept = y_mean - slope * x_mean
+        r_squared = np.where(syy > 0, sxy * sxy / (sxx * syy), 1.0)
+    
+    x_min = np.full(k, np.nan)
+    x_max = np.full(k, np.nan)
+    np.fmin.at(x_min, codes, x)
+    np.fmax.at(x_max, codes, x)
+    
+    return pd.DataFrame({
+        "n": n.astype(int),
+        "slope": slope,
+        "intercept": intercept,
+        "r_squared": np.where(np.isnan(slope), np.nan, r_squared),
+        "x_min": x_min,
+        "x_max": x_max,
+    }, index=labels)
+
+def _lowess_curve(x: np.ndarray, y: np.ndarray, weights: np.ndarray, frac: float) -> np.ndarray:
+    """Locally weighted linear fit evaluated at every x, with point weights"""
+    span = max(frac * weights.sum(), 1.0)
+    distance = np.abs(x[:, None] - x[None, :])
+    
+    # Bandwidth per point: distance that covers `span` of the total weight
+    order = np.argsort(distance, axis=1)
+    sorted_distance = np.take_along_axis(distance, order, axis=1)
+    covered = np.cumsum(weights[order], axis=1)
+    reach = np.minimum((covered < span).sum(axis=1), len(x) - 1)
+    bandwidth = sorted_distance[np.arange(len(x)), reach]
+    bandwidth = np.where(bandwidth > 0, bandwidth, 1.0)
+    
+    tricube = np.clip(1 - (distance / bandwidth[:, None]) ** 3, 0, None) ** 3 * weights[None, :]
+    w_sum = tricube.sum(axis=1)
+    x_bar = tricube @ x / w_sum
+    y_bar = tricube @ y / w_sum
+    dx = x[None, :] - x_bar[:, None]
+    sxx = (tricube * dx * dx).sum(axis=1)
+    sxy = (tricube * dx * (y[None, :] - y_bar[:, None])).sum(axis=1)
+    slope = np.where(sxx > 0, sxy / np.where(sxx > 0, sxx, 1.0), 0.0)
+    return y_bar + slope * (x - x_bar)
+
+def lowess_trendlines(x: Any, y: Any, groups: Optional[Any] = None, frac: float = LOWESS_FRAC,
+                      bins: int = LOWESS_BINS) -> pd.DataFrame:
+    """
+    LOWESS curves of y on x for every group
+    
+    Groups with more than ``bins`` points are first reduced to the mean x and
+    y of equal-width x bins, weighted by their counts, so the cost depends on
+    the number of bins rather than points. Smaller groups are smoothed
+    exactly. No robustness iterations are applied.
+    
+    Args:
+        x: Predictor values
+        y: Response values
+        groups: Group label per point; None fits a single curve
+        frac: Fraction of the points that influences each fitted value
+        bins: Maximum number of evaluation points per group
+    
+    Returns:
+        DataFrame with group, x and fitted y, sorted by x within each group
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    codes, labels = _group_codes(len(x), groups)
+    valid = np.isfinite(x) & np.isfinite(y) & (codes >= 0)
+    x, y, codes = x[valid], y[valid], codes[valid]
+    
+    curves = []
+    for code, label in enumerate(labels):
+        member = codes == code
+        gx, gy = x[member], y[member]
+        if len(gx) < 2:
+            continue
+        weights = np.ones(len(gx))
+        if len(gx) > bins:
+            edges = np.linspace(gx.min(), gx.max(), bins + 1)
+            bin_of = np.clip(np.searchsorted(edges, gx, side="right") - 1, 0, bins - 1)
+            weights = np.bincount(bin_of, minlength=bins).astype(float)
+            occupied = weights > 0
+            gx = np.bincount(bin_of, weights=gx, minlength=bins)[occupied] / weights[occupied]
+            gy = np.bincount(bin_of, weights=gy, minlength=bins)[occupied] / weights[occupied]
+            weights = weights[occupied]
+        order = np.argsort(gx, kind="stable")
+        gx, gy, weights = gx[order], gy[order], weights[order]
+        curves.append(pd.DataFrame({"group": label, "x": gx, "y": _lowess_curve(gx, gy, weights, frac)}))
+    
+    if not curves:
+        return pd.DataFrame(columns=["group", "x", "y"])
+    return pd.concat(curves, ignore_index=True)
+
+def add_trendlines(fig: go.Figure, x: Any, y: Any, groups: Optional[Any] = None, method: str = "ols",
+                   frac: float = LOWESS_FRAC, bins: int = LOWESS_BINS) -> go.Figure:
+    """
+    Add one trendline per group to a scatter figure
+    
+    Replaces Plotly Express ``trendline=`` without fitting a statsmodels model
+    per group. Lines take the colour and legend group of the scatter trace
+    whose name matches their group.
+    
+    Args:
+        fig: Scatter figure, e.g. from px.scatter with ``color=groups``
+        x: Predictor values of the plotted points
+        y: Response values of the plotted points
+        groups: Group label per point, matching the trace names; None for one line
+        method: 'ols' for least-squares lines or 'lowess' for smoothed curves
+        frac: LOWESS span, as a fraction of the points
+        bins: Maximum LOWESS evaluation points per group
+    
+    Returns:
+        Updated figure object
+    """
+    if method not in ("ols", "lowess"):
+        raise ValueError(f"Unknown trendline method {method!r}; expected 'ols' or 'lowess'")
+    
+    # Colour and legend group of the scatter trace drawn for each group
+    styles = {}
+    for trace in fig.data:
+        color = trace.marker.color if getattr(trace, "marker", None) is not None else None
+        styles.setdefault(str(trace.name), {"color": color if isinstance(color, str) else None,
+                                            "legendgroup": trace.legendgroup})
+    
+    def style(label: Any) -> Dict[str, Any]:
+        if groups is None:
+            return next(iter(styles.values()), {})
+        return styles.get(str(label), {})
+    
+    if method == "ols":
+        lines = fit_trendlines(x, y, groups).dropna(subset=["slope"])
+        for label, line in lines.iterrows():
+            ends = np.array([line["x_min"], line["x_max"]])
+            trace_style = style(label)
+            fig.add_trace(go.Scatter(
+                x=ends,
+                y=line["intercept"] + line["slope"] * ends,
+                mode="lines",
+                name=f"{label} trend" if groups is not None else "Trend",
+                legendgroup=trace_style.get("legendgroup"),
+                showlegend=False,
+                line=dict(color=trace_style.get("color"), width=2),
+                hovertemplate=(
+                    f"<b>OLS trendline{f' ({label})' if groups is not None else ''}</b><br>"
+                    f"y = {line['slope']:.4g} * x + {line['intercept']:.4g}<br>"
+                    f"R<sup>2</sup> = {line['r_squared']:.4f}<extra></extra>"
+                )
+            ))
+        return fig
+    
+    curves = lowess_trendlines(x, y, groups, frac=frac, bins=bins)
+    for label, curve in curves.groupby("group", sort=False):
+        trace_style = style(label)
+        fig.add_trace(go.Scatter(
+            x=curve["x"].to_numpy(),
+            y=curve["y"].to_numpy(),
+            mode="lines",
+            name=f"{label} trend" if groups is not None else "Trend",
+            legendgroup=trace_style.get("legendgroup"),
+            showlegend=False,
+            line=dict(color=trace_style.get("color"), width=2),
+            hovertemplate=(
+                f"<b>LOWESS trendline{f' ({label})' if groups is not None else ''}</b><br>"
+                "x = %{x:.4g}<br>y = %{y:.4g}<extra></extra>"
+            )
+        ))
+    return fig
+
+# Decimal places kept for floating-point trace data
+COMPACT_DECIMALS = 4
+
+# Plotly >= 6 sends numpy arrays as typed binary buffers, where float32
+# halves the payload; older versions write JSON numbers, where rounding helps
+_BINARY_ARRAYS = int(plotly.__version__.split(".")[0]) >= 6
+_MIN_BINARY_SIZE = 16
+
+# Numeric trace attributes that may hold one value per point
+_POINT_ATTRIBUTES = ("x", "y", "z", "r", "values", "lat", "lon")
+_MARKER_ATTRIBUTES = ("size", "color", "opacity")
+
+# Template layout keys that only matter when a trace of these types is drawn
+_SUBPLOT_TRACE_TYPES = {
+    "scene": {"scatter3d", "surface", "mesh3d", "cone", "streamtube", "volume", "isosurface"},
+    "polar": {"scatterpolar", "scatterpolargl", "barpolar"},
+    "geo": {"scattergeo", "choropleth"},
+    "ternary": {"scatterternary"},
+    "mapbox": {"scattermapbox", "choroplethmapbox", "densitymapbox"},
+}
+
+_CUSTOMDATA_REFERENCE = re.compile(r"%\{customdata\[(\d+)\](:[^}]*)?\}")
+
+def _replace_array(obj: Any, name: str, values: Any) -> None:
+    """Set an array property, even when only its dtype changed"""
+    if values is obj[name]:
+        return
+    # Plotly skips assignments of equal values, which would keep the old dtype
+    obj[name] = None
+    obj[name] = values
+
+def _compact_values(values: Any, decimals: int, allow_missing: bool = True) -> Any:
+    """
+    Round and downcast a numeric array; other values are returned unchanged
+
+    With ``allow_missing`` False, arrays holding NaN or infinite values are
+    returned unchanged too, for properties such as marker sizes that Plotly
+    only accepts as finite numbers.
+    """
+    if values is None or isinstance(values, (str, int, float)):
+        return values
+    array = np.asarray(values)
+    if array.size == 0 or array.dtype.kind not in "fiu":
+        return values
+    if not allow_missing and array.dtype.kind == "f" and not np.isfinite(array).all():
+        return values
+    if array.size < _MIN_BINARY_SIZE:
+        # Short arrays are smaller as JSON numbers than as typed buffers
+        return np.round(array, decimals).tolist() if array.dtype.kind == "f" else values
+    
+    if array.dtype.kind == "f":
+        rounded = np.round(array, decimals)
+        if not np.isfinite(rounded).all() or (rounded != np.round(rounded)).any():
+            return rounded.astype(np.float32) if _BINARY_ARRAYS else rounded
+        array = rounded
+    
+    # Integral values: the smallest integer type that holds them
+    low, high = array.min(), array.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return array.astype(dtype)
+    return array
+
+def _compact_customdata(trace: Any, decimals: int) -> None:
+    """Inline hover columns that hold one repeated string, and compact the rest"""
+    if getattr(trace, "customdata", None) is None:
+        return
+    data = np.asarray(trace.customdata, dtype=object)
+    template = getattr(trace, "hovertemplate", None)
+    if data.ndim != 2 or not isinstance(template, str):
+        _replace_array(trace, "customdata", _compact_values(trace.customdata, decimals))
+        return
+    if data.shape[0] == 0:
+        # An empty selection leaves nothing to inline or compact
+        return
+    
+    references: Dict[int, List[Optional[str]]] = {}
+    for match in _CUSTOMDATA_REFERENCE.finditer(template):
+        references.setdefault(int(match.group(1)), []).append(match.group(2))
+    
+    kept, literals = [], {}
+    for column in range(data.shape[1]):
+        values = data[:, column]
+        first = values[0]
+        repeated = isinstance(first, str) and all(value == first for value in values)
+        if repeated and all(spec is None for spec in references.get(column, [])):
+            literals[column] = first
+        else:
+            kept.append(column)
+    if not literals:
+        return
+    
+    positions = {column: position for position, column in enumerate(kept)}
+    
+    def replace(match: Any) -> str:
+        column = int(match.group(1))
+        if column in literals:
+            return literals[column]
+        return f"%{{customdata[{positions[column]}]{match.group(2) or ''}}}"
+    
+    trace.hovertemplate = _CUSTOMDATA_REFERENCE.sub(replace, template)
+    if not kept:
+        trace.customdata = None
+        return
+    remaining = data[:, kept]
+    try:
+        trace.customdata = _compact_values(remaining.astype(np.float64), decimals)
+    except (TypeError, ValueError):
+        trace.customdata = remaining
+
+def _compact_parcats(trace: Any) -> None:
+    """Encode parallel-category values as integer codes and merge identical paths"""
+    dimensions = list(trace.dimensions)
+    if not dimensions or any(dim.ticktext is not None for dim in dimensions):
+        return
+    
+    paths, labels = {}, []
+    for position, dim in enumerate(dimensions):
+        values = pd.Series(np.asarray(dim.values, dtype=object))
+        if dim.categoryorder == "array" and dim.categoryarray is not None:
+            categories = list(dim.categoryarray)
+            categories += [value for value in pd.unique(values) if value not in set(categories)]
+            codes = pd.Categorical(values, categories=categories).codes
+        else:
+            # Categories keep the order of first appearance, as with categoryorder='trace'
+            codes, categories = pd.factorize(values, sort=False)
+        paths[f"dim{position}"] = codes
+        labels.append([str(category) for category in categories])
+    
+    n_rows = len(paths["dim0"])
+    color = trace.line.color if trace.line is not None else None
+    by = list(paths)
+    if color is not None and not isinstance(color, str) and len(color) == n_rows:
+        paths["color"] = np.asarray(color)
+        by.append("color")
+    counts = trace.counts
+    paths["counts"] = np.asarray(counts) if counts is not None and np.ndim(counts) else np.ones(n_rows)
+    
+    merged = pd.DataFrame(paths).groupby(by, sort=False)["counts"].sum().reset_index()
+    for position, dim in enumerate(dimensions):
+        dim.values = _compact_values(merged[f"dim{position}"].to_numpy(), 0)
+        dim.categoryarray = list(range(len(labels[position])))
+        dim.categoryorder = "array"
+        dim.ticktext = labels[position]
+    if "color" in merged:
+        trace.line.color = _compact_values(merged["color"].to_numpy(), COMPACT_DECIMALS)
+    trace.counts = _compact_values(merged["counts"].to_numpy(), 0)
+
+def _strip_template(fig: go.Figure) -> None:
+    """Drop template defaults for trace types and subplots the figure does not use"""
+    template = fig.layout.template.to_plotly_json()
+    trace_types = {trace.type for trace in fig.data}
+    
+    data = template.get("data", {})
+    template["data"] = {name: value for name, value in data.items() if name in trace_types}
+    if not template["data"]:
+        del template["data"]
+    layout = template.get("layout", {})
+    for key, types in _SUBPLOT_TRACE_TYPES.items():
+        if key in layout and not trace_types & types:
+            del layout[key]
+    fig.layout.template = template
+
+def compact_figure(fig: go.Figure, decimals: int = COMPACT_DECIMALS,
+                   measure: bool = False) -> Tuple[go.Figure, Dict[str, Any]]:
+    """
+    Shrink a figure's payload before it is sent to the browser
+    
+    Point data is rounded to display precision and downcast, hover columns
+    that repeat one string are inlined into the hover template, parallel
+    category paths are merged into counted integer codes, and template
+    defaults for unused trace types and subplots are dropped. The figure is
+    modified in place and renders the same.
+    
+    Args:
+        fig: Plotly figure object
+        decimals: Decimal places kept for floating-point data
+        measure: Serialize the figure before and after to report bytes saved
+    
+    Returns:
+        Tuple of (the figure, dict with 'bytes_before', 'bytes_after' and
+        'bytes_saved', which are None unless measured)
+    """
+    before = len(fig.to_json()) if measure else None
+    
+    for trace in fig.data:
+        if trace.type == "parcats":
+            _compact_parcats(trace)
+            continue
+        for name in _POINT_ATTRIBUTES:
+            if name in trace:
+                _replace_array(trace, name, _compact_values(trace[name], decimals))
+        marker = trace.marker if "marker" in trace else None
+        if marker is not None:
+            for name in _MARKER_ATTRIBUTES:
+                if name in marker:
+                    # Built without validation, markers of an empty selection can hold NaN
+                    _replace_array(marker, name, _compact_values(marker[name], decimals, allow_missing=False))
+        _compact_customdata(trace, decimals)
+    _strip_template(fig)
+    
+    after = len(fig.to_json()) if measure else None
+    return fig, {
+        "bytes_before": before,
+        "bytes_after": after,
+        "bytes_saved": before - after if measure else None,
+    }
@@ -4,30 +4,33 @@ Quick Data Insights Script
 Demonstrates key findings from the E-commerce AI Behavior Dataset
 """
 
-import pandas as pd
-import numpy as np
+from config.settings import DATASET_PATH
+
+from .data_store import load_dataset
+from .schema import (
+    AI_TOOL_COLUMNS,
+    PAYMENT_METHOD_COLUMNS,
+    PRODUCT_CATEGORY_COLUMNS,
+    SATISFIED_VALUE,
+    short_name,
+)
 
 def load_and_analyze_data():
     """Load data and perform quick analysis"""
     print("🛒 E-commerce AI Behavior Dataset - Quick Insights")
     print("=" * 60)
     
-    # Load data with encoding handling
-    try:
-        df = pd.read_csv('Dataset.csv')
-    except UnicodeDecodeError:
-        try:
-            df = pd.read_csv('Dataset.csv', encoding='latin-1')
-        except:
-            df = pd.read_csv('Dataset.csv', encoding='cp1252')
+    # Typed columns from the columnar store
+    df = load_dataset(DATASET_PATH)
+    satisfied = df['AI_Satisfication'] == SATISFIED_VALUE
     print(f"📊 Dataset loaded: {len(df)} records, {len(df.columns)} columns")
     
     # Basic statistics
     print("\n📈 Key Metrics:")
     print(f"   • Total Consumers: {len(df):,}")
-    print(f"   • Online Consumers: {len(df[df['Online_Consumer'] == 'YES']):,} ({(df['Online_Consumer'] == 'YES').mean()*100:.1f}%)")
-    print(f"   • AI Endorsers: {len(df[df['AI_Endorsement'] == 'YES']):,} ({(df['AI_Endorsement'] == 'YES').mean()*100:.1f}%)")
-    print(f"   • AI Satisfied: {len(df[df['AI_Satisfication'] == 'Satisfied']):,} ({(df['AI_Satisfication'] == 'Satisfied').mean()*100:.1f}%)")
+    print(f"   • Online Consumers: {int(df['Online_Consumer'].sum()):,} ({df['Online_Consumer'].mean()*100:.1f}%)")
+    print(f"   • AI Endorsers: {int(df['AI_Endorsement'].sum()):,} ({df['AI_Endorsement'].mean()*100:.1f}%)")
+    print(f"   • AI Satisfied: {int(satisfied.sum()):,} ({satisfied.mean()*100:.1f}%)")
     
     # Country distribution
     print("\n🌍 Geographic Distribution:")
@@ -45,36 +48,32 @@ def load_and_analyze_data():
     
     # AI adoption by age
     print("\n🤖 AI Adoption by Age:")
-    ai_by_age = df.groupby('Age')['AI_Endorsement'].apply(lambda x: (x == 'YES').mean() * 100)
+    ai_by_age = df.groupby('Age', observed=True)['AI_Endorsement'].mean() * 100
     for age, rate in ai_by_age.items():
         print(f"   • {age}: {rate:.1f}%")
     
     # Most popular AI tools
     print("\n🛠️ AI Tools Usage:")
-    ai_tools = ['AI_Tools_Used _Chatbots', 'AI_Tools_Used_Virtual_Assistant', 'AI_Tools_Used_Voice&Photo_Search']
+    ai_tools = AI_TOOL_COLUMNS
     for tool in ai_tools:
-        usage_rate = (df[tool] == 'YES').mean() * 100
-        tool_name = tool.replace('AI_Tools_Used_', '')
+        usage_rate = df[tool].mean() * 100
+        tool_name = short_name(tool)
         print(f"   • {tool_name}: {usage_rate:.1f}%")
     
     # Payment methods
     print("\n💳 Payment Method Preferences:")
-    payment_methods = ['Payment_Method_Credit/Debit', 'Payment_Method_COD', 'Payment_Method_Ewallet']
+    payment_methods = PAYMENT_METHOD_COLUMNS
     for method in payment_methods:
-        usage_rate = (df[method] == 'YES').mean() * 100
-        method_name = method.replace('Payment_Method_', '')
+        usage_rate = df[method].mean() * 100
+        method_name = short_name(method)
         print(f"   • {method_name}: {usage_rate:.1f}%")
     
     # Product categories
     print("\n🛍️ Product Category Preferences:")
-    product_categories = [
-        'Product_Category_Appliances', 'Product_Category_Electronics',
-        'Product_Category_Groceries', 'Product_Category_Personal_Care',
-        'Product_Category_Clothing'
-    ]
+    product_categories = PRODUCT_CATEGORY_COLUMNS
     for category in product_categories:
-        purchase_rate = (df[category] == 'YES').mean() * 100
-        category_name = category.replace('Product_Category_', '')
+        purchase_rate = df[category].mean() * 100
+        category_name = short_name(category)
         print(f"   • {category_name}: {purchase_rate:.1f}%")
     
     # Key insights
@@ -87,30 +86,26 @@ def load_and_analyze_data():
     # Most popular AI tool
     tool_usage = {}
     for tool in ai_tools:
-        tool_name = tool.replace('AI_Tools_Used_', '')
-        tool_usage[tool_name] = (df[tool] == 'YES').mean() * 100
+        tool_usage[short_name(tool)] = df[tool].mean() * 100
     most_popular_tool = max(tool_usage, key=tool_usage.get)
     print(f"   • Most popular AI tool: {most_popular_tool} ({tool_usage[most_popular_tool]:.1f}%)")
     
     # Most popular payment method
     payment_usage = {}
     for method in payment_methods:
-        method_name = method.replace('Payment_Method_', '')
-        payment_usage[method_name] = (df[method] == 'YES').mean() * 100
+        payment_usage[short_name(method)] = df[method].mean() * 100
     most_popular_payment = max(payment_usage, key=payment_usage.get)
     print(f"   • Most popular payment: {most_popular_payment} ({payment_usage[most_popular_payment]:.1f}%)")
     
     # Most popular product category
     category_usage = {}
     for category in product_categories:
-        category_name = category.replace('Product_Category_', '')
-        category_usage[category_name] = (df[category] == 'YES').mean() * 100
+        category_usage[short_name(category)] = df[category].mean() * 100
     most_popular_category = max(category_usage, key=category_usage.get)
     print(f"   • Most popular category: {most_popular_category} ({category_usage[most_popular_category]:.1f}%)")
     
     # AI satisfaction vs endorsement
-    ai_endorsers = df[df['AI_Endorsement'] == 'YES']
-    ai_satisfaction_rate = (ai_endorsers['AI_Satisfication'] == 'Satisfied').mean() * 100
+    ai_satisfaction_rate = satisfied[df['AI_Endorsement']].mean() * 100
     print(f"   • AI satisfaction among endorsers: {ai_satisfaction_rate:.1f}%")
     
     print("\n" + "=" * 60)
@@ -1 +1,396 @@
-"""Data processing utilities for the AI-Powered E-commerce Analytics Hub"""
+"""Data processing utilities for the AI-Powered E-commerce Analytics Hub
+
+This module is the computation layer behind the dashboard. It has no Streamlit
+dependency, so the same functions can be benchmarked and reused in batch jobs.
+Every rate is computed from the typed columns produced by ``utils.schema`` with
+a single vectorized reduction over all requested columns at once.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import DATASET_PATH
+
+from .data_store import load_dataset
+from .schema import (
+    AI_TOOL_COLUMNS,
+    PAYMENT_METHOD_COLUMNS,
+    PRODUCT_CATEGORY_COLUMNS,
+    SATISFIED_VALUE,
+    TRUE_VALUE,
+    apply_schema,
+    short_name,
+)
+
+# Columns used as clustering features, in addition to AI_Endorsement
+SEGMENTATION_FEATURES = ['Age', 'Gender', 'Education', 'Annual_Salary', 'Living_Region']
+
+
+def load_data(path: Optional[str] = None) -> pd.DataFrame:
+    """
+    Load the dataset with typed columns
+
+    Args:
+        path: Source CSV file; defaults to the configured dataset
+
+    Returns:
+        Typed DataFrame
+    """
+    return load_dataset(path or DATASET_PATH)
+
+
+def clean_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalise column names and convert columns to the typed schema
+
+    Safe to call on data that has already been cleaned.
+
+    Args:
+        df: Raw or typed DataFrame
+
+    Returns:
+        Typed DataFrame
+    """
+    df = df.rename(columns=lambda col: col.strip())
+    return apply_schema(df)
+
+
+def indicator_frame(df: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+    """
+    Build a boolean frame of the "positive" answer for each column
+
+    Flag columns are used as-is; AI_Satisfication becomes ``== 'Satisfied'``.
+
+    Args:
+        df: Typed DataFrame
+        columns: Columns to convert
+
+    Returns:
+        Boolean DataFrame with the same column names
+    """
+    indicators = {}
+    for col in columns:
+        values = df[col]
+        if values.dtype == bool:
+            indicators[col] = values
+        elif col == 'AI_Satisfication':
+            indicators[col] = values == SATISFIED_VALUE
+        else:
+            indicators[col] = values == TRUE_VALUE
+    return pd.DataFrame(indicators, index=df.index)
+
+
+def flag_rates(df: pd.DataFrame, columns: Sequence[str]) -> pd.Series:
+    """
+    Compute the percentage of positive answers for several columns at once
+
+    Args:
+        df: Typed DataFrame
+        columns: Flag columns (or AI_Satisfication)
+
+    Returns:
+        Series of rates (0-100) indexed by column name
+    """
+    if len(df) == 0:
+        return pd.Series(np.nan, index=list(columns), dtype=float)
+    return indicator_frame(df, columns).mean() * 100
+
+
+def rates_by(df: pd.DataFrame, by: Sequence[str], columns: Sequence[str]) -> pd.DataFrame:
+    """
+    Compute positive-answer rates for several columns per group in one pass
+
+    Args:
+        df: Typed DataFrame
+        by: Grouping columns
+        columns: Flag columns (or AI_Satisfication)
+
+    Returns:
+        DataFrame indexed by the group keys with one rate column per input column
+    """
+    indicators = indicator_frame(df, columns)
+    keys = [df[col] for col in by]
+    return indicators.groupby(keys, observed=True).mean() * 100
+
+
+def filter_data(df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Keep the rows matching every filter
+
+    Args:
+        df: Typed DataFrame
+        filters: Mapping of column name to an allowed value or list of values.
+            Flag columns accept booleans or 'YES'/'NO'.
+
+    Returns:
+        Filtered DataFrame
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for col, allowed in filters.items():
+        if col not in df.columns or allowed is None:
+            continue
+        if isinstance(allowed, (str, bool)) or not isinstance(allowed, Iterable):
+            allowed = [allowed]
+        if df[col].dtype == bool:
+            allowed = [value == TRUE_VALUE if isinstance(value, str) else bool(value) for value in allowed]
+        mask &= df[col].isin(list(allowed)).to_numpy()
+    return df[mask]
+
+
+def compute_key_metrics(df: pd.DataFrame) -> Dict[str, float]:
+    """
+    Compute the headline consumer counts and rates
+
+    Args:
+        df: Typed DataFrame
+
+    Returns:
+        Dictionary with total, online, endorsement and satisfaction counts and rates
+    """
+    counts = indicator_frame(df, ['Online_Consumer', 'AI_Endorsement', 'AI_Satisfication']).sum()
+    return metrics_from_counts(counts, len(df))
+
+
+def metrics_from_counts(counts: pd.Series, total: int) -> Dict[str, float]:
+    """
+    Turn positive-answer counts into the headline metrics dictionary
+
+    Args:
+        counts: Positive answers for Online_Consumer, AI_Endorsement and AI_Satisfication
+        total: Number of respondents
+
+    Returns:
+        Dictionary with total, online, endorsement and satisfaction counts and rates
+    """
+    counts = counts[['Online_Consumer', 'AI_Endorsement', 'AI_Satisfication']]
+    rates = counts / total * 100 if total else counts * np.nan
+
+    return {
+        'total_consumers': total,
+        'online_consumers': int(counts['Online_Consumer']),
+        'ai_endorsers': int(counts['AI_Endorsement']),
+        'ai_satisfied': int(counts['AI_Satisfication']),
+        'online_rate': float(rates['Online_Consumer']),
+        'ai_adoption_rate': float(rates['AI_Endorsement']),
+        'satisfaction_rate': float(rates['AI_Satisfication']),
+    }
+
+
+def create_demographic_summary(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Summarise the consumer base
+
+    Args:
+        df: Typed DataFrame
+
+    Returns:
+        Key metrics plus value counts for each demographic column present
+    """
+    summary: Dict[str, Any] = compute_key_metrics(df)
+    for col in ['Age', 'Gender', 'Country', 'Education', 'Living_Region', 'Annual_Salary']:
+        if col in df.columns:
+            counts = df[col].value_counts()
+            summary[f'{col.lower()}_distribution'] = counts[counts > 0].to_dict()
+    return summary
+
+
+def _analyze_flag_family(df: pd.DataFrame, columns: Sequence[str]) -> Dict[str, Any]:
+    columns = [col for col in columns if col in df.columns]
+    rates = flag_rates(df, columns)
+    rates.index = [short_name(col) for col in rates.index]
+
+    most_popular = None
+    if len(rates) and rates.notna().any():
+        name = rates.idxmax()
+        most_popular = (name, float(rates[name]))
+
+    result: Dict[str, Any] = {
+        'rates': rates.to_dict(),
+        'most_popular': most_popular,
+    }
+    if 'Age' in df.columns and columns:
+        by_age = rates_by(df, ['Age'], columns)
+        by_age.columns = [short_name(col) for col in by_age.columns]
+        result['by_age'] = by_age
+    return result
+
+
+def analyze_payment_methods(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Analyze payment method usage
+
+    Args:
+        df: Typed DataFrame
+
+    Returns:
+        Dictionary with 'rates', 'most_popular' (name, rate) and 'by_age'
+    """
+    return _analyze_flag_family(df, PAYMENT_METHOD_COLUMNS)
+
+
+def analyze_product_categories(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Analyze product category purchases
+
+    Args:
+        df: Typed DataFrame
+
+    Returns:
+        Dictionary with 'rates', 'most_popular' (name, rate) and 'by_age'
+    """
+    return _analyze_flag_family(df, PRODUCT_CATEGORY_COLUMNS)
+
+
+def analyze_ai_tools(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Analyze AI tool usage
+
+    Args:
+        df: Typed DataFrame
+
+    Returns:
+        Dictionary with 'rates', 'most_popular' (name, rate) and 'by_age'
+    """
+    return _analyze_flag_family(df, AI_TOOL_COLUMNS)
+
+
+def most_common_by(df: pd.DataFrame, by: str, column: str) -> pd.Series:
+    """
+    Find the most frequent value of a column within each group
+
+    Args:
+        df: Typed DataFrame
+        by: Grouping column
+        column: Column whose mode is wanted
+
+    Returns:
+        Series of modes indexed by group
+    """
+    counts = df.groupby([by, column], observed=True).size()
+    return counts.groupby(level=0).idxmax().str[1]
+
+
+def encode_features(df: pd.DataFrame, columns: Sequence[str] = SEGMENTATION_FEATURES) -> pd.DataFrame:
+    """
+    Encode categorical columns as integer codes for modelling
+
+    Args:
+        df: Typed DataFrame
+        columns: Categorical columns to encode
+
+    Returns:
+        DataFrame with one '<column>_encoded' column per input column
+    """
+    return pd.DataFrame(
+        {f'{col}_encoded': df[col].cat.codes for col in columns if col in df.columns},
+        index=df.index,
+    )
+
+
+def perform_customer_segmentation(df: pd.DataFrame, n_clusters: int = 4,
+                                  random_state: int = 42) -> Tuple[pd.DataFrame, Dict[str, Dict[str, Any]]]:
+    """
+    Cluster consumers on demographics and AI endorsement with K-means
+
+    Args:
+        df: Typed DataFrame
+        n_clusters: Number of segments
+        random_state: Seed for reproducible clusters
+
+    Returns:
+        Tuple of (DataFrame with encoded features and a 'Cluster' column,
+        per-cluster summary keyed by 'Cluster <n>')
+    """
+    from .segmentation import SegmentationModel, segment_customers
+
+    model = SegmentationModel.fit(df, n_clusters=n_clusters, random_state=random_state)
+    return segment_customers(df, model)
+
+
+def summarize_clusters(df_segmented: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """
+    Describe each segment of a clustered DataFrame
+
+    Args:
+        df_segmented: Typed DataFrame with a 'Cluster' column
+
+    Returns:
+        Per-cluster summary keyed by 'Cluster <n>'
+    """
+    cluster_rates = rates_by(df_segmented, ['Cluster'],
+                             ['AI_Endorsement', 'Online_Consumer', 'AI_Satisfication'])
+    sizes = df_segmented['Cluster'].value_counts()
+    most_common_age = most_common_by(df_segmented, 'Cluster', 'Age')
+    most_common_gender = most_common_by(df_segmented, 'Cluster', 'Gender')
+
+    cluster_analysis = {}
+    for cluster, row in cluster_rates.iterrows():
+        cluster_analysis[f'Cluster {cluster}'] = {
+            'size': int(sizes[cluster]),
+            'percentage': float(sizes[cluster] / len(df_segmented) * 100),
+            'ai_adoption': float(row['AI_Endorsement']),
+            'online_rate': float(row['Online_Consumer']),
+            'satisfaction_rate': float(row['AI_Satisfication']),
+            'most_common_age': most_common_age.get(cluster),
+            'most_common_gender': most_common_gender.get(cluster),
+        }
+
+    return cluster_analysis
+
+
+def generate_insights(df: pd.DataFrame) -> List[str]:
+    """
+    Produce human-readable insight statements
+
+    Args:
+        df: Typed DataFrame
+
+    Returns:
+        List of insight strings
+    """
+    if len(df) == 0:
+        return []
+
+    metrics = compute_key_metrics(df)
+    insights = [
+        f"📈 {metrics['online_rate']:.1f}% of consumers shop online",
+        f"🤖 {metrics['ai_adoption_rate']:.1f}% of consumers endorse AI",
+        f"😊 {metrics['satisfaction_rate']:.1f}% of consumers are satisfied with AI",
+    ]
+
+    if 'Age' in df.columns:
+        ai_by_age = rates_by(df, ['Age'], ['AI_Endorsement'])['AI_Endorsement']
+        insights.append(f"👥 Highest AI adoption: {ai_by_age.idxmax()} ({ai_by_age.max():.1f}%)")
+        insights.append(f"👥 Lowest AI adoption: {ai_by_age.idxmin()} ({ai_by_age.min():.1f}%)")
+
+    if 'Education' in df.columns:
+        ai_by_edu = rates_by(df, ['Education'], ['AI_Endorsement'])['AI_Endorsement']
+        insights.append(f"🎓 Highest AI adoption by education: {ai_by_edu.idxmax()} ({ai_by_edu.max():.1f}%)")
+
+    for label, analysis in [('AI tool', analyze_ai_tools(df)),
+                            ('payment method', analyze_payment_methods(df)),
+                            ('product category', analyze_product_categories(df))]:
+        if analysis['most_popular']:
+            name, rate = analysis['most_popular']
+            insights.append(f"🏆 Most popular {label}: {name} ({rate:.1f}%)")
+
+    satisfied_endorsers = flag_rates(df[df['AI_Endorsement']], ['AI_Satisfication'])['AI_Satisfication']
+    if not np.isnan(satisfied_endorsers):
+        insights.append(f"💡 AI satisfaction among endorsers: {satisfied_endorsers:.1f}%")
+
+    return insights
+
+
+def main() -> None:
+    """Load, clean and summarise the configured dataset"""
+    df = clean_data(load_data())
+    summary = create_demographic_summary(df)
+    print(f"🧹 Cleaned {summary['total_consumers']:,} records from {DATASET_PATH}")
+    for insight in generate_insights(df):
+        print(f"   {insight}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Filtered data export for the AI-Powered E-commerce Analytics Hub
+
+Exports are written chunk by chunk to a temporary file instead of being built
+as one in-memory string. Rows are selected with the filter mask one chunk at a
+time, so the filtered frame is never materialised, and only the chosen columns
+are written. In streaming mode, where only a sample is held in memory, the
+export reads the source files again chunk by chunk so it contains every
+matching row.
+"""
+
+import gzip
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from config.settings import EXPORT_CONFIG
+
+from .filter_index import FilterIndex
+from .stream_ingest import iter_source_chunks
+
+PathLike = Union[str, Path]
+
+# Export format name -> (file extension, MIME type, label)
+EXPORT_FORMATS: Dict[str, tuple] = {
+    "csv": (".csv", "text/csv", "CSV"),
+    "csv.gz": (".csv.gz", "application/gzip", "CSV (gzip)"),
+    "parquet": (".parquet", "application/octet-stream", "Parquet"),
+}
+
+
+def available_formats() -> List[str]:
+    """Export formats usable in this environment; Parquet needs pyarrow"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return [fmt for fmt in EXPORT_FORMATS if fmt != "parquet"]
+    return list(EXPORT_FORMATS)
+
+
+def source_columns(source: PathLike) -> List[str]:
+    """
+    Columns of the rows read from source files, i.e. the columns a streaming export can contain
+
+    Columns derived after loading, such as the dashboard's Age_Group, are not
+    part of the source files.
+
+    Args:
+        source: CSV file or glob of partitioned CSV files
+
+    Returns:
+        Column names of the typed source chunks
+    """
+    chunks = iter_source_chunks(source, 1)
+    try:
+        first = next(chunks, None)
+    finally:
+        chunks.close()
+    return [] if first is None else list(first.columns)
+
+
+def iter_export_chunks(df: pd.DataFrame, mask: Optional[np.ndarray] = None,
+                       columns: Optional[Sequence[str]] = None,
+                       chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """
+    Yield the selected rows and columns of a DataFrame chunk by chunk
+
+    Args:
+        df: Full DataFrame
+        mask: Boolean row mask, or None for every row
+        columns: Columns to keep; defaults to all
+        chunksize: Source rows per chunk; defaults to the configured value
+
+    Yields:
+        DataFrame chunks of at most ``chunksize`` rows
+    """
+    chunksize = chunksize or EXPORT_CONFIG["chunksize"]
+    columns = list(columns) if columns is not None else list(df.columns)
+    for start in range(0, len(df), chunksize):
+        chunk = df.iloc[start:start + chunksize]
+        if mask is not None:
+            chunk = chunk[mask[start:start + chunksize]]
+        if len(chunk):
+            yield chunk[columns]
+
+
+def iter_source_export_chunks(source: PathLike, selection: Mapping[str, Iterable[Any]],
+                              columns: Optional[Sequence[str]] = None,
+                              chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """
+    Yield the rows of source files that match a filter selection, chunk by chunk
+
+    Args:
+        source: CSV file or glob of partitioned CSV files
+        selection: Mapping of column name to the selected values
+        columns: Columns to keep; defaults to all
+        chunksize: Source rows per chunk; defaults to the configured value
+
+    Yields:
+        Typed DataFrame chunks of the matching rows
+    """
+    chunksize = chunksize or EXPORT_CONFIG["chunksize"]
+    for chunk in iter_source_chunks(source, chunksize):
+        index = FilterIndex.from_frame(chunk, [col for col in selection if col in chunk.columns])
+        mask = index.mask({col: values for col, values in selection.items() if col in index.columns})
+        yield from iter_export_chunks(chunk, mask, columns, chunksize)
+
+
+def write_export(chunks: Iterator[pd.DataFrame], path: PathLike, fmt: str = "csv",
+                 columns: Optional[Sequence[str]] = None) -> Path:
+    """
+    Write chunks to a file in an export format
+
+    Args:
+        chunks: DataFrame chunks with the same columns
+        path: Target file
+        fmt: One of EXPORT_FORMATS
+        columns: Header for an export without rows
+
+    Returns:
+        Path of the written file
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {list(EXPORT_FORMATS)}")
+
+    path = Path(path)
+    if fmt == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table, row_group_size=len(chunk))
+            if writer is None:
+                pd.DataFrame(columns=list(columns or [])).to_parquet(path, index=False)
+        finally:
+            if writer is not None:
+                writer.close()
+        return path
+
+    opener = gzip.open if fmt == "csv.gz" else open
+    with opener(path, "wt", encoding="utf-8", newline="") as handle:
+        header = True
+        for chunk in chunks:
+            chunk.to_csv(handle, index=False, header=header)
+            header = False
+        if header:
+            pd.DataFrame(columns=list(columns or [])).to_csv(handle, index=False)
+    return path
+
+
+def _export_to_temp(chunks: Iterator[pd.DataFrame], columns: Optional[Sequence[str]], fmt: str) -> Path:
+    """Write export chunks to a new temporary file, removing it if writing fails"""
+    suffix = EXPORT_FORMATS[fmt][0] if fmt in EXPORT_FORMATS else ""
+    handle, name = tempfile.mkstemp(prefix="export-", suffix=suffix, dir=EXPORT_CONFIG["tmp_dir"])
+    os.close(handle)
+    try:
+        return write_export(chunks, name, fmt, columns)
+    except BaseException:
+        os.remove(name)
+        raise
+
+
+def export_rows(df: pd.DataFrame, mask: Optional[np.ndarray] = None,
+                columns: Optional[Sequence[str]] = None, fmt: str = "csv") -> Path:
+    """
+    Export the selected rows and columns to a new temporary file
+
+    The caller owns the file and should remove it once it has been served.
+
+    Args:
+        df: Full DataFrame
+        mask: Boolean row mask, or None for every row
+        columns: Columns to export; defaults to all
+        fmt: One of EXPORT_FORMATS
+
+    Returns:
+        Path of the temporary file
+    """
+    return _export_to_temp(iter_export_chunks(df, mask, columns), columns, fmt)
+
+
+def export_source(source: PathLike, selection: Mapping[str, Iterable[Any]],
+                  columns: Optional[Sequence[str]] = None, fmt: str = "csv") -> Path:
+    """
+    Export the rows of source files that match a selection to a new temporary file
+
+    Used in streaming mode, where the DataFrame in memory is only a sample.
+    The caller owns the file and should remove it once it has been served.
+
+    Args:
+        source: CSV file or glob of partitioned CSV files
+        selection: Mapping of column name to the selected values
+        columns: Columns to export; defaults to all
+        fmt: One of EXPORT_FORMATS
+
+    Returns:
+        Path of the temporary file
+    """
+    return _export_to_temp(iter_source_export_chunks(source, selection, columns), columns, fmt)
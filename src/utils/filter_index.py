@@ -0,0 +1,179 @@
+"""
+Bitmap filter index for the AI-Powered E-commerce Analytics Hub
+
+Every distinct value of a filterable column gets a packed bitset marking the
+rows that hold it. A sidebar selection is then answered with bitwise ORs within
+a column and ANDs across columns, instead of ``isin`` lookups over every row on
+every rerun.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Columns the sidebar can filter on
+FILTER_COLUMNS = ['Country', 'Age', 'Gender', 'Education', 'Living_Region', 'AI_Endorsement']
+
+
+class FilterIndex:
+    """
+    Packed row bitmaps for each value of each filter column
+
+    Args:
+        n_rows: Number of rows in the indexed DataFrame
+        bitmaps: Mapping of column name to {value: packed uint8 bitset}
+    """
+
+    def __init__(self, n_rows: int, bitmaps: Dict[str, Dict[Any, np.ndarray]]):
+        self.n_rows = n_rows
+        self.bitmaps = bitmaps
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: Optional[Sequence[str]] = None) -> "FilterIndex":
+        """
+        Build the bitmaps for a typed DataFrame
+
+        Args:
+            df: Typed DataFrame
+            columns: Columns to index; defaults to the filter columns present
+
+        Returns:
+            FilterIndex
+        """
+        if columns is None:
+            columns = [col for col in FILTER_COLUMNS if col in df.columns]
+
+        bitmaps = {}
+        for col in columns:
+            values = df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                categories = list(values.cat.categories)
+                codes = values.cat.codes.to_numpy()
+            else:
+                codes, uniques = pd.factorize(values, sort=True)
+                categories = list(uniques)
+
+            bitmaps[col] = {
+                category: np.packbits(codes == code)
+                for code, category in enumerate(categories)
+            }
+
+        return cls(len(df), bitmaps)
+
+    def append(self, batch: pd.DataFrame) -> "FilterIndex":
+        """
+        Extend the index with appended rows
+
+        Only the batch is scanned; existing bitmaps are copied with the new
+        bits attached after their last row. Values first seen in the batch get
+        bitmaps that are empty for the existing rows.
+
+        Args:
+            batch: Typed rows appended after the indexed ones
+
+        Returns:
+            New FilterIndex over the existing and appended rows
+        """
+        batch_index = FilterIndex.from_frame(batch, [col for col in self.columns if col in batch.columns])
+        n_rows = self.n_rows + batch_index.n_rows
+        tail = self.n_rows % 8
+        empty_old = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        empty_new = np.zeros((batch_index.n_rows + 7) // 8, dtype=np.uint8)
+
+        bitmaps = {}
+        for col in self.columns:
+            old_bitmaps = self.bitmaps[col]
+            new_bitmaps = batch_index.bitmaps.get(col, {})
+            bitmaps[col] = {}
+            for value in list(old_bitmaps) + [value for value in new_bitmaps if value not in old_bitmaps]:
+                old_bits = old_bitmaps.get(value, empty_old)
+                new_bits = new_bitmaps.get(value, empty_new)
+                if tail:
+                    # Re-pack the last partial byte together with the new rows
+                    head_bits = np.unpackbits(old_bits[-1:], count=tail)
+                    new_rows = np.unpackbits(new_bits, count=batch_index.n_rows)
+                    bits = np.concatenate([old_bits[:-1], np.packbits(np.concatenate([head_bits, new_rows]))])
+                else:
+                    bits = np.concatenate([old_bits, new_bits])
+                bitmaps[col][value] = bits
+
+        return FilterIndex(n_rows, bitmaps)
+
+    @property
+    def columns(self) -> List[str]:
+        """Indexed column names"""
+        return list(self.bitmaps)
+
+    def values(self, column: str) -> List[Any]:
+        """Distinct values of an indexed column, in category order"""
+        return list(self.bitmaps[column])
+
+    def _column_bits(self, column: str, selected: Iterable[Any]) -> Optional[np.ndarray]:
+        """OR the bitmaps of the selected values; None when nothing is excluded"""
+        bitmaps = self.bitmaps[column]
+        selected = [value for value in selected if value in bitmaps]
+        if len(selected) == len(bitmaps):
+            return None
+
+        bits = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for value in selected:
+            np.bitwise_or(bits, bitmaps[value], out=bits)
+        return bits
+
+    def mask(self, selection: Mapping[str, Iterable[Any]]) -> Optional[np.ndarray]:
+        """
+        Row mask for a filter selection
+
+        Values are ORed within a column and columns are ANDed together.
+        Columns whose every value is selected are skipped.
+
+        Args:
+            selection: Mapping of column name to the selected values
+
+        Returns:
+            Boolean array with one entry per row, or None when the selection
+            keeps every row
+        """
+        bits = None
+        for column, selected in selection.items():
+            column_bits = self._column_bits(column, selected)
+            if column_bits is None:
+                continue
+            if bits is None:
+                bits = column_bits
+            else:
+                np.bitwise_and(bits, column_bits, out=bits)
+
+        if bits is None:
+            return None
+        return np.unpackbits(bits, count=self.n_rows).astype(bool)
+
+    def apply(self, df: pd.DataFrame, selection: Mapping[str, Iterable[Any]]) -> pd.DataFrame:
+        """
+        Filter the indexed DataFrame by a selection
+
+        Args:
+            df: The DataFrame the index was built from
+            selection: Mapping of column name to the selected values
+
+        Returns:
+            Filtered DataFrame
+        """
+        mask = self.mask(selection)
+        if mask is None:
+            return df
+        return df[mask]
+
+
+def build_filter_index(df: pd.DataFrame) -> FilterIndex:
+    """
+    Build the index the dashboard sidebar filters use
+
+    Args:
+        df: Typed DataFrame
+
+    Returns:
+        FilterIndex over the filter columns present
+    """
+    return FilterIndex.from_frame(df)
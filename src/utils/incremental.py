@@ -0,0 +1,289 @@
+"""
+Incremental appends for the AI-Powered E-commerce Analytics Hub
+
+New survey responses are appended to the columnar store as additional Parquet
+parts. The persisted rate cube is updated by adding the batch's cells, and each
+append records a new dataset version, so caches keyed by the version pick up
+the new rows while work stays proportional to the batch. With the shared
+memory-mapped store a live view is extended the same way: only the batch is
+written and mapped, instead of copying every row into a new frame.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd
+
+from config.settings import DATA_STORE_DIR, SHARED_STORE_CONFIG
+
+from .data_store import (
+    PART_NAME,
+    dataset_dir,
+    ingest_csv,
+    read_manifest,
+    read_parts,
+    read_source_csv,
+    source_digest,
+    store_lock,
+    write_manifest,
+)
+from .filter_index import FilterIndex, build_filter_index
+from .rate_cube import RateCube, build_rate_cube
+from .schema import apply_schema, concat_typed
+from .shared_store import append_shared_frame, open_shared_frame, share_frame
+
+PathLike = Union[str, Path]
+
+CUBE_NAME = "cube.parquet"
+
+# Prefix for the dimension columns of a persisted cube; dimensions such as
+# AI_Endorsement are also aggregated columns of the cells
+DIMENSION_PREFIX = "dim:"
+
+
+def _stored_manifest(source: PathLike, store_dir: PathLike) -> Dict[str, Any]:
+    """Return the manifest of the stored dataset, ingesting the source first if needed"""
+    digest = source_digest(source, store_dir)
+    manifest = read_manifest(digest, store_dir)
+    if manifest.get("format") != "parquet":
+        _, manifest = ingest_csv(source, store_dir)
+    if manifest.get("format") != "parquet":
+        raise RuntimeError("Appending rows requires a Parquet engine (pip install pyarrow)")
+    manifest.setdefault("parts", [PART_NAME])
+    manifest.setdefault("version", digest)
+    return manifest
+
+
+def save_cube(cube: RateCube, manifest: Dict[str, Any], store_dir: PathLike = DATA_STORE_DIR) -> None:
+    """Persist the cube of a stored dataset and record its version in the manifest"""
+    target = dataset_dir(manifest["digest"], store_dir) / CUBE_NAME
+    tmp_path = target.with_name(CUBE_NAME + ".tmp")
+    levels = [DIMENSION_PREFIX + dim for dim in cube.dimensions]
+    cube.cells.rename_axis(levels).reset_index().to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, target)
+    manifest["cube_version"] = manifest["version"]
+    manifest["cube_dimensions"] = cube.dimensions
+
+
+def load_cube(manifest: Dict[str, Any], store_dir: PathLike = DATA_STORE_DIR) -> Optional[RateCube]:
+    """Load the persisted cube of a stored dataset, or None when it is out of date"""
+    if manifest.get("cube_version") != manifest.get("version"):
+        return None
+    try:
+        cells = pd.read_parquet(dataset_dir(manifest["digest"], store_dir) / CUBE_NAME)
+    except (OSError, ValueError):
+        return None
+    dimensions = manifest["cube_dimensions"]
+    cells = cells.set_index([DIMENSION_PREFIX + dim for dim in dimensions]).rename_axis(dimensions)
+    return RateCube(cells, dimensions)
+
+
+def append_rows(batch: pd.DataFrame, source: PathLike, store_dir: PathLike = DATA_STORE_DIR) -> Dict[str, Any]:
+    """
+    Append a batch of responses to a stored dataset
+
+    The batch is written as a new Parquet part and its cube cells are added to
+    the persisted cube; existing parts are never rewritten. Appends to the
+    same dataset hold its lock, so concurrent writers never pick the same part
+    name or overwrite each other's manifest.
+
+    Args:
+        batch: Raw or typed rows with the dataset's columns
+        source: Source CSV file the stored dataset was ingested from
+        store_dir: Root directory of the data store
+
+    Returns:
+        Updated manifest, including the new 'version'
+    """
+    batch = batch.rename(columns=lambda col: col.strip())
+    typed = apply_schema(batch).reset_index(drop=True)
+
+    digest = source_digest(source, store_dir)
+    directory = dataset_dir(digest, store_dir)
+    with store_lock(directory):
+        manifest = _stored_manifest(source, store_dir)
+        part = f"part-{len(manifest['parts']):05d}.parquet"
+        tmp_part = directory / (part + ".tmp")
+        typed.to_parquet(tmp_part, index=False)
+        os.replace(tmp_part, directory / part)
+
+        # Delta aggregation: the stored cube plus the batch's cells
+        cube = load_cube(manifest, store_dir)
+        if cube is None:
+            cube = build_rate_cube(read_parts(manifest["digest"], manifest["parts"], store_dir))
+        cube = cube.merge(RateCube.from_frame(typed, cube.dimensions))
+
+        previous_version = manifest["version"]
+        with open(directory / part, "rb") as handle:
+            part_digest = hashlib.sha256(handle.read()).hexdigest()
+        manifest["parts"] = manifest["parts"] + [part]
+        manifest["rows"] = int(manifest["rows"]) + len(typed)
+        manifest["version"] = hashlib.sha256(f"{previous_version}:{part_digest}".encode("utf-8")).hexdigest()
+        manifest["updated"] = time.time()
+
+        save_cube(cube, manifest, store_dir)
+        write_manifest(manifest, store_dir)
+    _update_segmentation(typed, previous_version, manifest["version"])
+    return manifest
+
+
+def _update_segmentation(batch: pd.DataFrame, previous_version: str, version: str) -> None:
+    """Carry a minibatch segmentation model forward to the new version"""
+    from .segmentation import SegmentationModel, model_path, update_segmentation_model
+
+    path = model_path(previous_version)
+    if not path.exists():
+        return
+    try:
+        model = SegmentationModel.load(path)
+    except (OSError, ValueError, KeyError, EOFError):
+        return
+    update_segmentation_model(model, batch, version)
+
+
+def append_csv(path: PathLike, source: PathLike, store_dir: PathLike = DATA_STORE_DIR) -> Dict[str, Any]:
+    """
+    Append the rows of a CSV batch file to a stored dataset
+
+    Args:
+        path: CSV file with new responses
+        source: Source CSV file the stored dataset was ingested from
+        store_dir: Root directory of the data store
+
+    Returns:
+        Updated manifest
+    """
+    return append_rows(read_source_csv(path), source, store_dir)
+
+
+class LiveDataset:
+    """
+    In-memory view of a stored dataset that follows appends
+
+    ``refresh`` reads only the parts added since the last refresh and folds
+    them into the rows, the rate cube and the filter index. With a shared
+    store the rows are memory-mapped, so processes on the same host share one
+    copy; a process that finds the version already mapped skips reading the
+    Parquet parts, and appended rows are written to the end of the mapped
+    column files, so a refresh costs time proportional to the batch (plus a
+    copy of the filter bitmaps, one bit per row and value). Without a shared
+    store every refresh copies all rows into a new frame, which is O(rows).
+
+    Args:
+        source: Source CSV file
+        store_dir: Root directory of the data store
+        shared_dir: Root directory of the shared memory-mapped store; defaults
+            to the configured one, or no sharing when disabled in the config
+    """
+
+    def __init__(self, source: PathLike, store_dir: PathLike = DATA_STORE_DIR,
+                 shared_dir: Optional[PathLike] = None):
+        self.source = Path(source)
+        self.store_dir = Path(store_dir)
+        if shared_dir is None and SHARED_STORE_CONFIG["enabled"]:
+            shared_dir = SHARED_STORE_CONFIG["dir"]
+        self.shared_dir = Path(shared_dir) if shared_dir is not None else None
+        self.version: Optional[str] = None
+        self.digest: Optional[str] = None
+        self.parts: List[str] = []
+        self.df = pd.DataFrame()
+        self.cube: Optional[RateCube] = None
+        self.filter_index: Optional[FilterIndex] = None
+        self.updated: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def refresh(self) -> bool:
+        """
+        Bring the view up to the stored version
+
+        Returns:
+            True when new data was loaded
+        """
+        with self._lock:
+            manifest = _stored_manifest(self.source, self.store_dir)
+            if manifest["version"] == self.version:
+                return False
+
+            new_parts = manifest["parts"][len(self.parts):]
+            if manifest["digest"] != self.digest or manifest["parts"][:len(self.parts)] != self.parts:
+                # Different source file: start over from its stored parts
+                shared = self._open_shared(manifest["version"])
+                if shared is not None:
+                    self.df = shared
+                else:
+                    self.df = read_parts(manifest["digest"], manifest["parts"], self.store_dir)
+                self.cube = load_cube(manifest, self.store_dir)
+                if self.cube is None:
+                    self.cube = build_rate_cube(self.df)
+                self.filter_index = build_filter_index(self.df)
+            else:
+                batch = read_parts(manifest["digest"], new_parts, self.store_dir)
+                shared = self._append_shared(batch, manifest["version"])
+                # Without the shared store every row is copied into the new frame
+                self.df = shared if shared is not None else concat_typed([self.df, batch])
+                self.cube = self.cube.merge(RateCube.from_frame(batch, self.cube.dimensions))
+                self.filter_index = self.filter_index.append(batch)
+
+            if self.shared_dir is not None and shared is None:
+                self.df = share_frame(self.df, manifest["version"], self.shared_dir)
+            self.digest = manifest["digest"]
+            self.parts = list(manifest["parts"])
+            self.version = manifest["version"]
+            self.updated = manifest.get("updated", manifest.get("created"))
+            return True
+
+    def _open_shared(self, version: str) -> Optional[pd.DataFrame]:
+        """Mapped rows of a version written by any process, or None"""
+        if self.shared_dir is None:
+            return None
+        return open_shared_frame(version, self.shared_dir)
+
+    def _append_shared(self, batch: pd.DataFrame, version: str) -> Optional[pd.DataFrame]:
+        """Mapped rows of a version that extends the current one by a batch, or None"""
+        if self.shared_dir is None or self.version is None:
+            return None
+        try:
+            return append_shared_frame(batch, self.version, version, self.shared_dir)
+        except OSError:
+            return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Consistent view of the current state for one dashboard run
+
+        Returns:
+            Dict with 'version', 'df', 'cube', 'filter_index', 'rows' and 'updated'
+        """
+        with self._lock:
+            return {
+                "version": self.version,
+                "df": self.df,
+                "cube": self.cube,
+                "filter_index": self.filter_index,
+                "rows": len(self.df),
+                "updated": self.updated,
+            }
+
+
+def main() -> None:
+    """Append a CSV batch to the configured dataset"""
+    import sys
+
+    from config.settings import DATASET_PATH
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m utils.incremental <batch.csv>")
+        sys.exit(1)
+
+    manifest = append_csv(sys.argv[1], DATASET_PATH)
+    print(f"➕ Appended {sys.argv[1]} to {DATASET_PATH}")
+    print(f"   • Rows: {manifest['rows']:,} in {len(manifest['parts'])} parts")
+    print(f"   • Version: {manifest['version'][:16]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Stage instrumentation for the AI-Powered E-commerce Analytics Hub
+
+Every data-prep step and dashboard section of a rerun is wrapped in
+``PerformanceLog.stage``, which records its wall time, memory growth (when
+tracemalloc is tracing) and any fields the stage adds, such as rows processed
+or cache status. Each record is also emitted as one JSON log line on the
+``ecommerce.performance`` logger.
+"""
+
+import json
+import logging
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+import pandas as pd
+
+logger = logging.getLogger("ecommerce.performance")
+
+_MB = 1024 * 1024
+
+
+def enable_memory_tracing() -> None:
+    """Start tracemalloc so stages also record their memory growth"""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def figure_bytes(result: Mapping[str, Any]) -> int:
+    """
+    Size of the JSON payload of the figures in a section result
+
+    Args:
+        result: Section result dict, as returned by a compute function
+
+    Returns:
+        Total number of bytes of the serialized figures
+    """
+    from plotly.basedatatypes import BaseFigure
+
+    return sum(len(value.to_json()) for value in result.values() if isinstance(value, BaseFigure))
+
+
+class PerformanceLog:
+    """
+    Stage metrics of one dashboard rerun, safe to record from worker threads
+
+    Args:
+        run_id: Identifier attached to every record; generated when omitted
+        detailed: Also take measurements that cost extra work, such as
+            serialized payload sizes
+    """
+
+    def __init__(self, run_id: Optional[str] = None, detailed: bool = False):
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.detailed = detailed
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Measure a block of work
+
+        The yielded dict is the stage's record; the block may add fields to
+        it, e.g. ``record['rows'] = len(df)``. Wall time and, when tracing,
+        memory growth are added when the block exits, even on error.
+
+        Args:
+            name: Stage name, e.g. 'load_data' or 'compute:demographics'
+            **fields: Initial fields of the record
+
+        Yields:
+            The stage record
+        """
+        record: Dict[str, Any] = {"stage": name, **fields}
+        tracing = tracemalloc.is_tracing()
+        memory_start = tracemalloc.get_traced_memory()[0] if tracing else 0
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            if tracing:
+                # Process-wide, so concurrent stages see each other's allocations
+                record["memory_mb"] = (tracemalloc.get_traced_memory()[0] - memory_start) / _MB
+            record["thread"] = threading.current_thread().name
+            with self._lock:
+                self.records.append(record)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(json.dumps({"event": "stage", "run": self.run_id, **record}, default=str))
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Most recent record of a stage, or None"""
+        with self._lock:
+            for record in reversed(self.records):
+                if record["stage"] == name:
+                    return record
+        return None
+
+    def frame(self) -> pd.DataFrame:
+        """Records as a DataFrame, in completion order"""
+        with self._lock:
+            return pd.DataFrame(list(self.records))
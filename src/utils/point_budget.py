@@ -0,0 +1,119 @@
+"""
+Point budget for row-level charts in the AI-Powered E-commerce Analytics Hub
+
+Scatter charts whose axes are category codes draw many respondents on the same
+coordinates. These helpers collapse coincident points into one marker sized by
+count, stratified-sample the markers when they still exceed
+``PERFORMANCE['max_data_points']``, and pick WebGL rendering for large 2D
+scatters.
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import PERFORMANCE
+
+# Name of the marker weight column added by collapse_points
+POINTS_COLUMN = 'Points'
+
+
+def point_budget() -> int:
+    """Return the configured maximum number of markers per chart"""
+    return int(PERFORMANCE.get('max_data_points', 10000))
+
+
+def collapse_points(df: pd.DataFrame, by: Sequence[str],
+                    mean_columns: Sequence[str] = ()) -> pd.DataFrame:
+    """
+    Merge rows that share the same values in ``by`` into one marker
+
+    Args:
+        df: Row-level DataFrame
+        by: Columns that define a marker (coordinates and colour)
+        mean_columns: Numeric or boolean columns to average per marker
+
+    Returns:
+        DataFrame with one row per marker, the ``by`` columns, a 'Points' count
+        and the averaged columns
+    """
+    grouped = df.groupby(list(by), observed=True)
+    markers = grouped.size().rename(POINTS_COLUMN).to_frame()
+    if mean_columns:
+        markers = markers.join(grouped[list(mean_columns)].mean())
+    return markers.reset_index()
+
+
+def stratified_sample(df: pd.DataFrame, strata: Sequence[str], n: int,
+                      random_state: int = 42) -> pd.DataFrame:
+    """
+    Sample rows so that every stratum keeps its share of the data
+
+    Each stratum keeps ``ceil(size * n / len(df))`` rows, so small strata are
+    never sampled away entirely.
+
+    Args:
+        df: DataFrame to sample
+        strata: Columns defining the strata
+        n: Target number of rows
+        random_state: Seed for reproducible samples
+
+    Returns:
+        Sampled DataFrame in the original row order
+    """
+    if len(df) <= n:
+        return df
+
+    rng = np.random.default_rng(random_state)
+    codes = df.groupby(list(strata), observed=True).ngroup().to_numpy()
+    sizes = np.bincount(codes)
+    quotas = np.ceil(sizes * (n / len(df))).astype(np.int64)
+
+    order = rng.permutation(len(df))
+    shuffled_codes = codes[order]
+    rank = pd.Series(shuffled_codes).groupby(shuffled_codes).cumcount().to_numpy()
+    keep = np.sort(order[rank < quotas[shuffled_codes]])
+    return df.iloc[keep]
+
+
+def apply_point_budget(df: pd.DataFrame, by: Sequence[str], color: Optional[str] = None,
+                       mean_columns: Sequence[str] = (),
+                       budget: Optional[int] = None) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """
+    Collapse coincident points and sample the markers down to the budget
+
+    Args:
+        df: Row-level DataFrame
+        by: Coordinate columns
+        color: Colour column; also used as the sampling stratum
+        mean_columns: Columns to average per marker
+        budget: Maximum markers; defaults to ``PERFORMANCE['max_data_points']``
+
+    Returns:
+        Tuple of (marker DataFrame, stats dict with 'rows', 'markers' and 'drawn')
+    """
+    budget = budget or point_budget()
+    keys = list(by) + ([color] if color else [])
+    markers = collapse_points(df, keys, mean_columns)
+
+    drawn = markers
+    if len(markers) > budget:
+        drawn = stratified_sample(markers, [color] if color else list(by[:1]), budget)
+
+    stats = {'rows': len(df), 'markers': len(markers), 'drawn': len(drawn)}
+    return drawn, stats
+
+
+def scatter_render_mode(n_points: int) -> str:
+    """
+    Choose the Plotly Express render mode for a 2D scatter
+
+    Args:
+        n_points: Number of markers in the figure
+
+    Returns:
+        'webgl' when the markers exceed the configured threshold, else 'svg'
+    """
+    threshold = int(PERFORMANCE.get('webgl_threshold', 1000))
+    return 'webgl' if n_points > threshold else 'svg'
@@ -0,0 +1,271 @@
+"""
+Precomputed rate cube for the AI-Powered E-commerce Analytics Hub
+
+One group-by pass over the data produces, for every combination of the
+dashboard's dimensions, the number of respondents and the number of positive
+answers for every flag column. Any single-dimension or pairwise breakdown is
+then a sum over those cells, which are far fewer than the input rows.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .data_processing import indicator_frame, metrics_from_counts
+from .schema import flag_columns, short_name
+
+# Dimensions the dashboard breaks rates down by
+CUBE_DIMENSIONS = ['Age', 'Country', 'Education', 'Gender', 'Living_Region', 'AI_Endorsement']
+
+# Name of the respondent count column in the cube cells
+COUNT_COLUMN = 'count'
+
+Dimensions = Union[str, Sequence[str]]
+
+
+def cube_columns(columns: Iterable[str]) -> List[str]:
+    """
+    Select the columns a cube aggregates: every flag plus AI satisfaction
+
+    Args:
+        columns: Available column names
+
+    Returns:
+        Column names to sum in the cube
+    """
+    columns = list(columns)
+    selected = flag_columns(columns)
+    if 'AI_Satisfication' in columns:
+        selected.append('AI_Satisfication')
+    return selected
+
+
+class RateCube:
+    """
+    Respondent counts and positive-answer sums per dimension combination
+
+    Args:
+        cells: DataFrame indexed by the dimension values, with a count column
+            and one sum column per aggregated flag
+        dimensions: Names of the index levels
+    """
+
+    def __init__(self, cells: pd.DataFrame, dimensions: Sequence[str]):
+        self.cells = cells
+        self.dimensions = list(dimensions)
+        self.columns = [col for col in cells.columns if col != COUNT_COLUMN]
+        self._marginals: Dict[Tuple[str, ...], pd.DataFrame] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dimensions: Optional[Sequence[str]] = None,
+                   columns: Optional[Sequence[str]] = None) -> "RateCube":
+        """
+        Aggregate a typed DataFrame into a cube in a single group-by
+
+        Args:
+            df: Typed DataFrame
+            dimensions: Grouping columns; defaults to the dashboard dimensions present
+            columns: Columns to sum; defaults to every flag plus AI satisfaction
+
+        Returns:
+            RateCube
+        """
+        if dimensions is None:
+            dimensions = [dim for dim in CUBE_DIMENSIONS if dim in df.columns]
+        if columns is None:
+            columns = cube_columns(df.columns)
+
+        indicators = indicator_frame(df, columns).astype(np.uint8)
+        indicators[COUNT_COLUMN] = np.uint8(1)
+        keys = [df[dim] for dim in dimensions]
+        cells = indicators.groupby(keys, observed=True).sum().astype(np.int64)
+        return cls(cells, dimensions)
+
+    def merge(self, other: "RateCube") -> "RateCube":
+        """
+        Combine two cubes over the same dimensions, e.g. from separate chunks
+
+        Args:
+            other: Cube aggregated over the same dimensions and columns
+
+        Returns:
+            New RateCube whose cells are the sums of both
+        """
+        if other.dimensions != self.dimensions:
+            raise ValueError(f"Cannot merge cubes over {self.dimensions} and {other.dimensions}")
+
+        cells = pd.concat([self.cells, other.cells])
+        cells = cells.groupby(level=list(range(len(self.dimensions))), observed=True).sum()
+        cells.index.names = self.dimensions
+        return RateCube(cells.fillna(0).astype(np.int64), self.dimensions)
+
+    def filter(self, selection: Mapping[str, Iterable[Any]]) -> "RateCube":
+        """
+        Keep the cells matching a filter selection on the cube dimensions
+
+        Args:
+            selection: Mapping of dimension name to the selected values;
+                columns that are not cube dimensions are ignored
+
+        Returns:
+            New RateCube over the selected cells
+        """
+        keep = np.ones(len(self.cells), dtype=bool)
+        for dim, values in selection.items():
+            if dim in self.dimensions:
+                keep &= self.cells.index.get_level_values(dim).isin(list(values))
+        return RateCube(self.cells[keep], self.dimensions)
+
+    @property
+    def total(self) -> int:
+        """Total number of respondents in the cube"""
+        return int(self.cells[COUNT_COLUMN].sum())
+
+    def sums(self, by: Dimensions = ()) -> pd.DataFrame:
+        """
+        Sum the cells over every dimension not in ``by``
+
+        Args:
+            by: Dimension or dimensions to keep
+
+        Returns:
+            DataFrame of counts and positive-answer sums; a single row labelled
+            'All' when ``by`` is empty
+        """
+        by = (by,) if isinstance(by, str) else tuple(by)
+        if by not in self._marginals:
+            if not by:
+                marginal = self.cells.sum().to_frame('All').T
+            elif by == tuple(self.dimensions):
+                marginal = self.cells
+            else:
+                marginal = self.cells.groupby(level=list(by), observed=True).sum()
+            self._marginals[by] = marginal
+        return self._marginals[by]
+
+    def counts(self, by: Dimensions = ()) -> pd.Series:
+        """Number of respondents per group"""
+        return self.sums(by)[COUNT_COLUMN]
+
+    def rates(self, by: Dimensions = (), columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Percentage of positive answers per group
+
+        Args:
+            by: Dimension or dimensions to break down by
+            columns: Aggregated columns to return; defaults to all
+
+        Returns:
+            DataFrame of rates (0-100) indexed by group
+        """
+        sums = self.sums(by)
+        columns = list(columns) if columns is not None else self.columns
+        counts = sums[COUNT_COLUMN].where(sums[COUNT_COLUMN] > 0)
+        return sums[columns].div(counts, axis=0) * 100
+
+    def overall_rates(self, columns: Optional[Sequence[str]] = None) -> pd.Series:
+        """Percentage of positive answers across all respondents"""
+        return self.rates((), columns).iloc[0]
+
+    def long_rates(self, by: Dimensions, columns: Sequence[str], var_name: str,
+                   value_name: str) -> pd.DataFrame:
+        """
+        Per-group rates for a flag family in long form
+
+        Args:
+            by: Dimension or dimensions to break down by
+            columns: Aggregated columns to include
+            var_name: Name of the column holding the flag display names
+            value_name: Name of the rate column
+
+        Returns:
+            DataFrame with one row per (group, flag), ordered flag by flag
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        rates = self.rates(by, columns)
+        rates.columns = [short_name(col) for col in rates.columns]
+        return rates.reset_index().melt(id_vars=by, var_name=var_name, value_name=value_name)
+
+    def long_counts(self, by: Dimensions, columns: Sequence[str], var_name: str,
+                    value_name: str) -> pd.DataFrame:
+        """
+        Per-group positive-answer counts for a flag family in long form
+
+        Rows with a zero count are dropped, so each row is a distinct
+        (group, flag) path that at least one respondent took.
+
+        Args:
+            by: Dimension or dimensions to break down by
+            columns: Aggregated columns to include
+            var_name: Name of the column holding the flag display names
+            value_name: Name of the count column
+
+        Returns:
+            DataFrame with one row per observed (group, flag)
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        sums = self.sums(by)[list(columns)]
+        sums.columns = [short_name(col) for col in sums.columns]
+        long = sums.reset_index().melt(id_vars=by, var_name=var_name, value_name=value_name)
+        return long[long[value_name] > 0].reset_index(drop=True)
+
+    def hierarchy(self, path: Sequence[str], column: str = 'AI_Endorsement') -> pd.DataFrame:
+        """
+        Node table for sunburst and treemap charts
+
+        Every prefix of ``path`` contributes one level of nodes, so the table
+        size depends on the number of distinct nodes, not on respondents.
+
+        Args:
+            path: Dimensions from the root level to the leaves
+            column: Aggregated column whose count and rate each node carries
+
+        Returns:
+            DataFrame with 'id', 'parent', 'label', the count column, ``column``
+            (positive answers) and 'rate' (0-100)
+        """
+        levels = []
+        for depth in range(1, len(path) + 1):
+            sums = self.sums(path[:depth])[[COUNT_COLUMN, column]].reset_index()
+            labels = sums[list(path[:depth])].astype(str)
+            ids = labels[path[0]]
+            parents = pd.Series('', index=sums.index)
+            for dim in path[1:depth]:
+                parents = ids
+                ids = ids + '/' + labels[dim]
+            levels.append(pd.DataFrame({
+                'id': ids,
+                'parent': parents,
+                'label': labels[path[depth - 1]],
+                COUNT_COLUMN: sums[COUNT_COLUMN],
+                column: sums[column],
+            }))
+
+        nodes = pd.concat(levels, ignore_index=True)
+        nodes['rate'] = nodes[column] / nodes[COUNT_COLUMN] * 100
+        return nodes
+
+    def labelled_rates(self, columns: Sequence[str]) -> pd.Series:
+        """Overall rates for a flag family, indexed by display name"""
+        rates = self.overall_rates(columns)
+        rates.index = [short_name(col) for col in rates.index]
+        return rates
+
+    def key_metrics(self) -> Dict[str, float]:
+        """Headline counts and rates, as returned by compute_key_metrics"""
+        totals = self.sums(()).iloc[0]
+        return metrics_from_counts(totals, int(totals[COUNT_COLUMN]))
+
+
+def build_rate_cube(df: pd.DataFrame) -> RateCube:
+    """
+    Build the cube the dashboard sections read their rates from
+
+    Args:
+        df: Typed (filtered) DataFrame
+
+    Returns:
+        RateCube over the dashboard dimensions
+    """
+    return RateCube.from_frame(df)
@@ -0,0 +1,130 @@
+"""
+Section result cache for the AI-Powered E-commerce Analytics Hub
+
+Dashboard sections are pure functions of the filter selection and the dataset
+version, so their aggregate tables and figures can be reused across reruns.
+Entries are evicted least-recently-used first and expire after a TTL, both
+taken from ``CACHE_CONFIG``.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Mapping, Optional, Tuple
+
+from config.settings import CACHE_CONFIG
+
+
+def selection_key(selection: Mapping[str, Iterable[Any]], version: str = "") -> str:
+    """
+    Canonical hash of a filter selection and dataset version
+
+    The order of columns and of selected values does not affect the key.
+
+    Args:
+        selection: Mapping of column name to the selected values
+        version: Dataset version the selection applies to
+
+    Returns:
+        Hex digest string
+    """
+    canonical = {
+        column: sorted(str(value) for value in values)
+        for column, values in selection.items()
+    }
+    payload = json.dumps({"selection": canonical, "version": version}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with per-entry expiry and hit/miss counters
+
+    Args:
+        max_entries: Maximum number of entries kept
+        ttl: Seconds an entry stays valid; 0 or None disables expiry
+        clock: Time source, in seconds
+    """
+
+    def __init__(self, max_entries: int = CACHE_CONFIG["max_entries"],
+                 ttl: Optional[float] = CACHE_CONFIG["ttl"],
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up an entry
+
+        Args:
+            key: Entry key
+
+        Returns:
+            Tuple of (found, value); value is None when not found
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and self._clock() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store an entry, evicting the least recently used ones over capacity"""
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for a key, computing and storing it on a miss
+
+        Args:
+            key: Entry key
+            compute: Zero-argument function producing the value
+
+        Returns:
+            Cached or freshly computed value
+        """
+        found, value = self.get(key)
+        if not found:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and eviction counts and the current number of entries"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+        }
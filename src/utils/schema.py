@@ -0,0 +1,171 @@
+"""
+Column schema for the E-commerce AI Behavior dataset
+
+YES/NO survey answers are stored as booleans and demographic answers as pandas
+Categoricals, so rate calculations become vectorized sums over typed columns
+instead of string comparisons over object columns.
+"""
+
+from typing import Iterable, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Bump whenever apply_schema changes the stored dtypes, so persisted copies
+# written by an older schema are rebuilt on the next load.
+SCHEMA_VERSION = 1
+
+TRUE_VALUE = "YES"
+FALSE_VALUE = "NO"
+SATISFIED_VALUE = "Satisfied"
+MISSING_VALUE = "Unknown"
+
+AI_TOOL_PREFIX = "AI_Tools_Used"
+PAYMENT_METHOD_PREFIX = "Payment_Method_"
+PRODUCT_CATEGORY_PREFIX = "Product_Category_"
+FLAG_PREFIXES = (AI_TOOL_PREFIX, PAYMENT_METHOD_PREFIX, PRODUCT_CATEGORY_PREFIX)
+
+AI_TOOL_COLUMNS = [
+    'AI_Tools_Used _Chatbots',
+    'AI_Tools_Used_Virtual_Assistant',
+    'AI_Tools_Used_Voice&Photo_Search',
+]
+PAYMENT_METHOD_COLUMNS = [
+    'Payment_Method_Credit/Debit',
+    'Payment_Method_COD',
+    'Payment_Method_Ewallet',
+]
+PRODUCT_CATEGORY_COLUMNS = [
+    'Product_Category_Appliances',
+    'Product_Category_Electronics',
+    'Product_Category_Groceries',
+    'Product_Category_Personal_Care',
+    'Product_Category_Clothing',
+]
+
+# Single YES/NO answers that are not part of a prefixed column family
+STATUS_FLAG_COLUMNS = ['Online_Consumer', 'AI_Endorsement']
+
+CATEGORICAL_COLUMNS = [
+    'Age',
+    'Gender',
+    'Country',
+    'Education',
+    'Living_Region',
+    'Annual_Salary',
+    'Income',
+    'AI_Satisfication',
+]
+
+
+def is_flag_column(column: str) -> bool:
+    """Return True if the column holds a YES/NO answer"""
+    return column in STATUS_FLAG_COLUMNS or column.startswith(FLAG_PREFIXES)
+
+
+def flag_columns(columns: Iterable[str]) -> List[str]:
+    """
+    Select the YES/NO flag columns from a list of column names
+
+    Args:
+        columns: Column names to filter
+
+    Returns:
+        Flag column names in their original order
+    """
+    return [col for col in columns if is_flag_column(col)]
+
+
+def short_name(column: str) -> str:
+    """
+    Strip the family prefix from a flag column for display
+
+    Args:
+        column: Flag column name, e.g. 'AI_Tools_Used _Chatbots'
+
+    Returns:
+        Display name, e.g. 'Chatbots'
+    """
+    for prefix in FLAG_PREFIXES:
+        if column.startswith(prefix):
+            return column[len(prefix):].strip(' _')
+    return column
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert raw survey columns to their typed representation
+
+    Flag columns become booleans (anything other than 'YES' is False) and
+    demographic columns become Categoricals with missing answers recorded as
+    'Unknown'. Remaining text columns keep the 'Unknown' fill.
+
+    Args:
+        df: DataFrame with raw string answers
+
+    Returns:
+        New DataFrame with typed columns
+    """
+    typed = {}
+    for col in df.columns:
+        values = df[col]
+        if is_flag_column(col):
+            if values.dtype == bool:
+                typed[col] = values
+            else:
+                typed[col] = values.eq(TRUE_VALUE).to_numpy(dtype=np.bool_)
+        elif col in CATEGORICAL_COLUMNS:
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                typed[col] = values
+            else:
+                typed[col] = values.fillna(MISSING_VALUE).astype(str).astype('category')
+        elif pd.api.types.is_string_dtype(values.dtype):
+            typed[col] = values.fillna(MISSING_VALUE)
+        else:
+            typed[col] = values
+
+    return pd.DataFrame(typed, index=df.index)
+
+
+def concat_typed(frames: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate typed DataFrames, keeping categorical columns categorical
+
+    Categoricals whose categories differ between frames are combined with
+    the union of their categories instead of falling back to object dtype.
+
+    Args:
+        frames: Typed DataFrames with the same columns
+
+    Returns:
+        Typed DataFrame with a fresh RangeIndex
+    """
+    frames = [frame for frame in frames if len(frame.columns)]
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+
+    combined = pd.concat(frames, ignore_index=True)
+    for col in combined.columns:
+        if col in CATEGORICAL_COLUMNS and not isinstance(combined[col].dtype, pd.CategoricalDtype):
+            parts = [frame[col] for frame in frames if col in frame.columns]
+            if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts) and len(parts) == len(frames):
+                combined[col] = pd.api.types.union_categoricals(parts, sort_categories=True)
+    return apply_schema(combined)
+
+
+def flag_label(values: pd.Series) -> pd.Series:
+    """
+    Render a boolean flag column as 'YES'/'NO' labels for display
+
+    Args:
+        values: Boolean Series
+
+    Returns:
+        Categorical Series of labels
+    """
+    labels = np.where(values.to_numpy(dtype=np.bool_), TRUE_VALUE, FALSE_VALUE)
+    return pd.Series(
+        pd.Categorical(labels, categories=[TRUE_VALUE, FALSE_VALUE]),
+        index=values.index,
+        name=values.name,
+    )
@@ -0,0 +1,267 @@
+"""
+Customer segmentation service for the AI-Powered E-commerce Analytics Hub
+
+The clustering model is fitted once per dataset version and persisted with its
+category mappings, so filtered views are labelled with ``predict`` instead of
+refitting. In ``minibatch`` mode the model can be refined with ``partial_fit``
+on newly arrived rows, keeping refit cost proportional to the new data.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from config.settings import SEGMENTATION_CONFIG
+
+from .data_processing import SEGMENTATION_FEATURES, encode_features, summarize_clusters
+
+PathLike = Union[str, Path]
+
+SEGMENTATION_MODES = ('full', 'minibatch')
+
+
+def _make_estimator(mode: str, n_clusters: int, random_state: int):
+    """Create an unfitted K-means estimator for a segmentation mode"""
+    if mode not in SEGMENTATION_MODES:
+        raise ValueError(f"Unknown segmentation mode {mode!r}; expected one of {SEGMENTATION_MODES}")
+
+    if mode == 'minibatch':
+        from sklearn.cluster import MiniBatchKMeans
+
+        return MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state,
+                               n_init=SEGMENTATION_CONFIG['n_init'],
+                               batch_size=SEGMENTATION_CONFIG['batch_size'])
+
+    from sklearn.cluster import KMeans
+
+    return KMeans(n_clusters=n_clusters, random_state=random_state,
+                  n_init=SEGMENTATION_CONFIG['n_init'])
+
+
+def _categories(values: pd.Series) -> List[Any]:
+    """Category list of a column, in code order"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return list(values.cat.categories)
+    return sorted(values.dropna().unique().tolist())
+
+
+class SegmentationModel:
+    """
+    Fitted K-means model together with the category mappings it was trained on
+
+    Args:
+        estimator: Fitted KMeans or MiniBatchKMeans estimator
+        categories: Mapping of feature column to its categories in code order
+        mode: 'full' or 'minibatch'
+        version: Dataset version the model was fitted on
+    """
+
+    def __init__(self, estimator, categories: Dict[str, List[Any]], mode: str = 'full',
+                 version: str = ''):
+        self.estimator = estimator
+        self.categories = categories
+        self.mode = mode
+        self.version = version
+
+    @property
+    def features(self) -> List[str]:
+        """Categorical feature columns, in model input order"""
+        return list(self.categories)
+
+    @classmethod
+    def fit(cls, df: pd.DataFrame, version: str = '', n_clusters: Optional[int] = None,
+            random_state: Optional[int] = None, mode: Optional[str] = None,
+            features: Sequence[str] = SEGMENTATION_FEATURES) -> "SegmentationModel":
+        """
+        Fit a segmentation model on a typed DataFrame
+
+        Args:
+            df: Typed DataFrame
+            version: Dataset version recorded with the model
+            n_clusters: Number of segments; defaults to the configured value
+            random_state: Seed for reproducible clusters; defaults to the configured value
+            mode: 'full' or 'minibatch'; defaults to the configured value
+            features: Categorical feature columns, in addition to AI_Endorsement
+
+        Returns:
+            Fitted SegmentationModel
+        """
+        mode = mode or SEGMENTATION_CONFIG['mode']
+        estimator = _make_estimator(
+            mode,
+            n_clusters or SEGMENTATION_CONFIG['n_clusters'],
+            SEGMENTATION_CONFIG['random_state'] if random_state is None else random_state,
+        )
+        categories = {col: _categories(df[col]) for col in features if col in df.columns}
+        model = cls(estimator, categories, mode, version)
+        estimator.fit(model.encode(df))
+        return model
+
+    def encode(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Build the model input matrix with the stored category mappings
+
+        Values not seen at fit time are encoded as -1.
+
+        Args:
+            df: Typed DataFrame
+
+        Returns:
+            Float array with one column per feature plus AI_Endorsement
+        """
+        columns = []
+        for col, categories in self.categories.items():
+            values = df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype) and list(values.cat.categories) == categories:
+                codes = values.cat.codes
+            else:
+                codes = pd.Categorical(values, categories=categories).codes
+            columns.append(np.asarray(codes, dtype=np.float64))
+        columns.append(df['AI_Endorsement'].to_numpy(dtype=np.float64))
+        return np.column_stack(columns)
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Assign each row to its nearest segment
+
+        Args:
+            df: Typed DataFrame, typically a filtered view of the fitted data
+
+        Returns:
+            Integer array of cluster labels
+        """
+        if len(df) == 0:
+            return np.empty(0, dtype=np.int32)
+        return self.estimator.predict(self.encode(df))
+
+    def partial_fit(self, df: pd.DataFrame, version: str = '') -> "SegmentationModel":
+        """
+        Refine a minibatch model with new rows only
+
+        New categories are appended to the stored mappings, so codes of
+        existing categories keep their meaning.
+
+        Args:
+            df: Typed DataFrame of newly arrived rows
+            version: Dataset version after the new rows were added
+
+        Returns:
+            The updated model
+        """
+        if self.mode != 'minibatch':
+            raise ValueError("partial_fit requires a model fitted in 'minibatch' mode")
+
+        for col, categories in self.categories.items():
+            known = set(categories)
+            categories.extend(value for value in _categories(df[col]) if value not in known)
+
+        if len(df) > 0:
+            self.estimator.partial_fit(self.encode(df))
+        self.version = version or self.version
+        return self
+
+    def save(self, path: PathLike) -> None:
+        """Persist the model and its category mappings with joblib"""
+        import joblib
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        joblib.dump({
+            'estimator': self.estimator,
+            'categories': self.categories,
+            'mode': self.mode,
+            'version': self.version,
+        }, tmp_path)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: PathLike) -> "SegmentationModel":
+        """Load a model written by ``save``"""
+        import joblib
+
+        state = joblib.load(path)
+        return cls(state['estimator'], state['categories'], state['mode'], state['version'])
+
+
+def model_path(version: str, model_dir: PathLike = SEGMENTATION_CONFIG['model_dir']) -> Path:
+    """Return the file that holds the segmentation model for a dataset version"""
+    return Path(model_dir) / f"segmentation-{version[:16] or 'default'}.joblib"
+
+
+def load_segmentation_model(df: pd.DataFrame, version: str = '',
+                            model_dir: PathLike = SEGMENTATION_CONFIG['model_dir']) -> SegmentationModel:
+    """
+    Return the model for a dataset version, fitting and persisting it on first use
+
+    Args:
+        df: Full typed DataFrame of that version
+        version: Dataset version
+        model_dir: Directory holding persisted models
+
+    Returns:
+        SegmentationModel
+    """
+    path = model_path(version, model_dir)
+    if path.exists():
+        try:
+            model = SegmentationModel.load(path)
+            if model.version == version:
+                return model
+        except (OSError, ValueError, KeyError, EOFError):
+            pass
+
+    model = SegmentationModel.fit(df, version)
+    try:
+        model.save(path)
+    except OSError:
+        pass
+    return model
+
+
+def update_segmentation_model(model: SegmentationModel, new_rows: pd.DataFrame, version: str,
+                              model_dir: PathLike = SEGMENTATION_CONFIG['model_dir']) -> SegmentationModel:
+    """
+    Bring a model up to a new dataset version after rows were appended
+
+    Minibatch models are refined with the new rows only. Full models are
+    returned unchanged and refitted by the next ``load_segmentation_model``
+    call for the new version.
+
+    Args:
+        model: Model fitted on the previous version
+        new_rows: Typed DataFrame of the appended rows
+        version: Dataset version after the append
+        model_dir: Directory holding persisted models
+
+    Returns:
+        Updated SegmentationModel
+    """
+    if model.mode != 'minibatch':
+        return model
+
+    model.partial_fit(new_rows, version)
+    try:
+        model.save(model_path(version, model_dir))
+    except OSError:
+        pass
+    return model
+
+
+def segment_customers(df: pd.DataFrame, model: SegmentationModel) -> Tuple[pd.DataFrame, Dict[str, Dict[str, Any]]]:
+    """
+    Label a (filtered) DataFrame with a fitted model
+
+    Args:
+        df: Typed DataFrame
+        model: Fitted SegmentationModel
+
+    Returns:
+        Tuple of (DataFrame with encoded features and a 'Cluster' column,
+        per-cluster summary keyed by 'Cluster <n>')
+    """
+    df_segmented = pd.concat([df, encode_features(df, model.features)], axis=1)
+    df_segmented['Cluster'] = model.predict(df)
+    return df_segmented, summarize_clusters(df_segmented)
@@ -0,0 +1,370 @@
+"""
+Shared memory-mapped dataset store for the AI-Powered E-commerce Analytics Hub
+
+Column data is written once as raw arrays under ``columns/`` and opened
+read-only with ``np.memmap``. Every process on a host maps the same files, so
+the rows are held once in the operating system's page cache instead of once
+per replica, and the DataFrame handed to sessions is a view over the mapped
+columns rather than a copy. Flag and numeric columns are mapped as they are
+and categorical columns as their integer codes; other text columns cannot be
+mapped and are decoded in each process.
+
+A dataset version is a small ``meta.json`` naming the column files it reads and
+its row count. Column files are append-only: a version that adds rows to the
+previous one writes only those rows to the end of the files and lists the same
+files with a larger row count, so versions share their unchanged columns on
+disk and the earlier version still maps the prefix it was written with. A
+column is copied into a new file only when appended rows change its encoding,
+e.g. a new category that sorts before the existing ones.
+"""
+
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from config.settings import SHARED_STORE_CONFIG
+
+from .data_store import store_lock
+from .schema import SCHEMA_VERSION, concat_typed
+
+PathLike = Union[str, Path]
+
+META_NAME = "meta.json"
+COLUMNS_DIR = "columns"
+
+# Bump when the on-disk layout changes; versions in another layout are ignored
+STORE_LAYOUT = 2
+
+# NumPy dtype kinds stored and mapped without conversion
+_MAPPED_KINDS = "biuf"
+
+
+def _root(store_dir: Optional[PathLike]) -> Path:
+    return Path(store_dir or SHARED_STORE_CONFIG["dir"])
+
+
+def shared_dir(version: str, store_dir: Optional[PathLike] = None) -> Path:
+    """Return the directory that holds the metadata of a dataset version"""
+    return _root(store_dir) / version[:16]
+
+
+def _column_entry(values: pd.Series) -> Dict[str, Any]:
+    """Describe how a column is stored: its kind and, for codes, categories"""
+    entry: Dict[str, Any] = {"name": values.name}
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        entry.update(kind="categorical", categories=values.cat.categories.tolist(),
+                     ordered=bool(values.cat.ordered))
+    elif isinstance(values.dtype, np.dtype) and values.dtype.kind in _MAPPED_KINDS:
+        entry.update(kind="array")
+    else:
+        entry.update(kind="text", dtype=str(values.dtype))
+    return entry
+
+
+def _column_array(values: pd.Series, entry: Dict[str, Any]) -> np.ndarray:
+    """Array written for a column; text columns are factorized into codes"""
+    if entry["kind"] == "categorical":
+        return np.asarray(values.cat.codes)
+    if entry["kind"] == "array":
+        return values.to_numpy()
+    codes, uniques = pd.factorize(values)
+    entry["categories"] = list(uniques)
+    return codes.astype(np.int32)
+
+
+def _write_column(root: Path, values: pd.Series) -> Dict[str, Any]:
+    """Write a whole column to a new file and return its entry"""
+    entry = _column_entry(values)
+    array = np.ascontiguousarray(_column_array(values, entry))
+    entry.update(file=f"{uuid.uuid4().hex}.bin", storage=str(array.dtype))
+    directory = root / COLUMNS_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    array.tofile(directory / entry["file"])
+    return entry
+
+
+def _appended_array(entry: Dict[str, Any], values: pd.Series) -> Optional[np.ndarray]:
+    """
+    Array to append to a stored column for new rows, or None when the rows
+    change the column's encoding and it has to be rewritten
+
+    Args:
+        entry: Stored column entry; text categories are extended in place
+        values: Typed values of the appended rows
+
+    Returns:
+        Array in the column's storage dtype, or None
+    """
+    if entry["kind"] == "array":
+        if str(values.dtype) != entry["storage"]:
+            return None
+        return values.to_numpy()
+
+    if entry["kind"] == "categorical":
+        # concat_typed unions categories, so only a subset keeps the codes valid
+        if (not isinstance(values.dtype, pd.CategoricalDtype)
+                or bool(values.cat.ordered) != entry["ordered"]
+                or not set(values.cat.categories).issubset(entry["categories"])):
+            return None
+        dtype = pd.CategoricalDtype(entry["categories"], ordered=entry["ordered"])
+        return np.asarray(values.astype(dtype).cat.codes, dtype=entry["storage"])
+
+    if str(values.dtype) != entry["dtype"]:
+        return None
+    # Text codes index the factorized values, so new values go at the end
+    categories = pd.Index(entry["categories"])
+    new_values = pd.unique(values[categories.get_indexer(values) < 0])
+    if len(new_values):
+        entry["categories"] = entry["categories"] + list(new_values)
+        categories = pd.Index(entry["categories"])
+    return categories.get_indexer(values).astype(entry["storage"])
+
+
+def _append_column(root: Path, entry: Dict[str, Any], array: np.ndarray, rows: int) -> bool:
+    """
+    Append rows to a column file that holds exactly ``rows`` rows
+
+    Returns:
+        False when the file holds a different number of rows, e.g. because a
+        later version already extended it, so the caller writes a new file
+    """
+    path = root / COLUMNS_DIR / entry["file"]
+    itemsize = np.dtype(entry["storage"]).itemsize
+    try:
+        if path.stat().st_size != rows * itemsize:
+            return False
+    except OSError:
+        return False
+    with open(path, "ab") as handle:
+        handle.write(np.ascontiguousarray(array, dtype=entry["storage"]).tobytes())
+    return True
+
+
+def _read_meta(version: str, root: Path) -> Optional[Dict[str, Any]]:
+    """Metadata of a stored version, or None when absent or written by another layout"""
+    try:
+        with open(shared_dir(version, root) / META_NAME, "r", encoding="utf-8") as handle:
+            meta = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if (meta.get("version") != version or meta.get("schema_version") != SCHEMA_VERSION
+            or meta.get("layout") != STORE_LAYOUT):
+        return None
+    return meta
+
+
+def _write_meta(root: Path, version: str, rows: int, columns: List[Dict[str, Any]]) -> Path:
+    """Atomically write the metadata that makes a version visible to readers"""
+    directory = shared_dir(version, root)
+    directory.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "version": version,
+        "schema_version": SCHEMA_VERSION,
+        "layout": STORE_LAYOUT,
+        "rows": int(rows),
+        "columns": columns,
+        "created": time.time(),
+    }
+    tmp_path = directory / f"{META_NAME}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(meta, handle, indent=2, default=str)
+    os.replace(tmp_path, directory / META_NAME)
+    return directory
+
+
+def write_shared_frame(df: pd.DataFrame, version: str, store_dir: Optional[PathLike] = None) -> Path:
+    """
+    Write a typed DataFrame as memory-mappable column files
+
+    The metadata is written last and atomically, so readers never see a
+    version whose columns are incomplete.
+
+    Args:
+        df: Typed DataFrame with a default RangeIndex
+        version: Dataset version the rows belong to
+        store_dir: Root directory of the shared store
+
+    Returns:
+        Directory of the written version's metadata
+    """
+    root = _root(store_dir)
+    with store_lock(root):
+        if _read_meta(version, root) is not None:
+            return shared_dir(version, root)
+        columns = [_write_column(root, df[col]) for col in df.columns]
+        return _write_meta(root, version, len(df), columns)
+
+
+def append_shared_frame(batch: pd.DataFrame, base_version: str, version: str,
+                        store_dir: Optional[PathLike] = None) -> Optional[pd.DataFrame]:
+    """
+    Store a version that extends a stored one with appended rows
+
+    Only the batch is written: each column file of the base version is
+    extended in place and shared by both versions. A column is copied into a
+    new file only when the batch changes its encoding.
+
+    Args:
+        batch: Typed rows appended after those of ``base_version``
+        base_version: Stored version the new one extends
+        version: Version of the base rows plus the batch
+        store_dir: Root directory of the shared store
+
+    Returns:
+        The mapped DataFrame of ``version``, or None when the base version is
+        not stored or the batch has different columns
+    """
+    root = _root(store_dir)
+    with store_lock(root):
+        if _read_meta(version, root) is None:
+            base = _read_meta(base_version, root)
+            if base is None or [entry["name"] for entry in base["columns"]] != list(batch.columns):
+                return None
+
+            base_frame = None
+            columns = []
+            for base_entry in base["columns"]:
+                entry = dict(base_entry)
+                values = batch[entry["name"]]
+                array = _appended_array(entry, values)
+                if array is None or not _append_column(root, entry, array, base["rows"]):
+                    if base_frame is None:
+                        base_frame = open_shared_frame(base_version, root)
+                        if base_frame is None:
+                            return None
+                    name = entry["name"]
+                    entry = _write_column(root, concat_typed([base_frame[[name]], batch[[name]]])[name])
+                columns.append(entry)
+
+            _write_meta(root, version, base["rows"] + len(batch), columns)
+            _prune_locked(root, [version, base_version], SHARED_STORE_CONFIG["keep_versions"])
+    return open_shared_frame(version, root)
+
+
+def _map_column(root: Path, entry: Dict[str, Any], rows: int) -> Optional[np.ndarray]:
+    """Read-only mapping of the first ``rows`` values of a column file"""
+    dtype = np.dtype(entry["storage"])
+    if rows == 0:
+        return np.empty(0, dtype=dtype)
+    try:
+        return np.memmap(root / COLUMNS_DIR / entry["file"], dtype=dtype, mode="r", shape=(rows,))
+    except (OSError, ValueError):
+        # Missing file, or one shorter than the version's rows
+        return None
+
+
+def open_shared_frame(version: str, store_dir: Optional[PathLike] = None) -> Optional[pd.DataFrame]:
+    """
+    Open a dataset version as a DataFrame over read-only mapped columns
+
+    Args:
+        version: Dataset version to open
+        store_dir: Root directory of the shared store
+
+    Returns:
+        DataFrame whose flag, numeric and categorical columns are views of the
+        mapped files, or None when the version is not stored
+    """
+    root = _root(store_dir)
+    meta = _read_meta(version, root)
+    if meta is None:
+        return None
+
+    data = {}
+    for entry in meta["columns"]:
+        values = _map_column(root, entry, meta["rows"])
+        if values is None:
+            return None
+        if entry["kind"] == "array":
+            data[entry["name"]] = values
+        elif entry["kind"] == "categorical":
+            dtype = pd.CategoricalDtype(entry["categories"], ordered=entry["ordered"])
+            data[entry["name"]] = pd.Categorical.from_codes(values, dtype=dtype)
+        else:
+            text = pd.Categorical.from_codes(np.asarray(values), categories=entry["categories"])
+            data[entry["name"]] = pd.Series(text).astype(entry["dtype"])
+
+    # copy=False keeps one block per column, so no columns are copied together
+    return pd.DataFrame(data, index=pd.RangeIndex(meta["rows"]), copy=False)
+
+
+def _prune_locked(root: Path, keep: List[str], max_versions: int) -> None:
+    """Remove old versions, then the column files no remaining version reads"""
+    keep_dirs = {shared_dir(version, root).name for version in keep}
+    try:
+        versions = [path for path in root.iterdir() if (path / META_NAME).exists()]
+    except OSError:
+        return
+    versions.sort(key=lambda path: (path / META_NAME).stat().st_mtime, reverse=True)
+    for path in versions[max_versions:]:
+        if path.name not in keep_dirs:
+            shutil.rmtree(path, ignore_errors=True)
+
+    referenced = set()
+    for path in root.iterdir():
+        try:
+            with open(path / META_NAME, "r", encoding="utf-8") as handle:
+                meta = json.load(handle)
+        except (OSError, ValueError):
+            continue
+        referenced.update(entry.get("file") for entry in meta.get("columns", []))
+    try:
+        files = list((root / COLUMNS_DIR).iterdir())
+    except OSError:
+        return
+    for path in files:
+        if path.name not in referenced:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def prune_versions(keep: List[str], store_dir: Optional[PathLike] = None,
+                   max_versions: Optional[int] = None) -> None:
+    """
+    Remove old versions, and column files no longer read, from the shared store
+
+    Processes that still map a removed file keep their mapping; the file is
+    freed once the last of them lets go.
+
+    Args:
+        keep: Versions that must not be removed
+        store_dir: Root directory of the shared store
+        max_versions: Number of most recent versions kept in total
+    """
+    root = _root(store_dir)
+    max_versions = SHARED_STORE_CONFIG["keep_versions"] if max_versions is None else max_versions
+    with store_lock(root):
+        _prune_locked(root, keep, max_versions)
+
+
+def share_frame(df: pd.DataFrame, version: str, store_dir: Optional[PathLike] = None) -> pd.DataFrame:
+    """
+    Replace an in-memory DataFrame with its memory-mapped copy
+
+    Args:
+        df: Typed DataFrame of a dataset version
+        version: Dataset version the rows belong to
+        store_dir: Root directory of the shared store
+
+    Returns:
+        The mapped DataFrame, or ``df`` itself when the store is not writable
+    """
+    shared = open_shared_frame(version, store_dir)
+    if shared is not None:
+        return shared
+    try:
+        write_shared_frame(df, version, store_dir)
+        prune_versions([version], store_dir)
+    except OSError:
+        return df
+    shared = open_shared_frame(version, store_dir)
+    return shared if shared is not None else df
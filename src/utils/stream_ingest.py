@@ -0,0 +1,270 @@
+"""
+Chunked streaming ingest for the AI-Powered E-commerce Analytics Hub
+
+Source files are read in chunks and each chunk is folded into running
+aggregates: the rate cube, per-column value counts and numeric histograms.
+Histograms hold at most a fixed number of bins, merging neighbouring bins when
+a column's range grows, and identifier columns are not binned. Only a bounded
+reservoir sample of rows is kept for row-level charts, so memory use depends on
+the aggregate size rather than on the input size.
+"""
+
+import glob
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from config.settings import STREAMING_CONFIG
+
+from .data_store import detect_encoding
+from .rate_cube import RateCube
+from .schema import CATEGORICAL_COLUMNS, apply_schema, is_flag_column
+
+PathLike = Union[str, Path]
+
+# Numeric columns that identify rows rather than measure them; never binned
+IDENTIFIER_COLUMNS = ['ID']
+
+
+def resolve_sources(source: PathLike) -> List[Path]:
+    """
+    Expand a file path or glob pattern into the files it names
+
+    Args:
+        source: CSV file or glob of partitioned CSV files
+
+    Returns:
+        Sorted list of matching files
+    """
+    matches = sorted(glob.glob(str(source)))
+    if not matches:
+        raise FileNotFoundError(f"No source files match {source}")
+    return [Path(match) for match in matches]
+
+
+def source_version(source: PathLike) -> str:
+    """
+    Cheap version string for a set of source files
+
+    Based on the paths, sizes and modification times of the matching files,
+    so it changes whenever a partition is added, removed or rewritten.
+
+    Args:
+        source: CSV file or glob of partitioned CSV files
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    for path in resolve_sources(source):
+        stat = path.stat()
+        digest.update(f"{path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def iter_source_chunks(source: PathLike, chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """
+    Read source files chunk by chunk, typed with the dataset schema
+
+    Args:
+        source: CSV file or glob of partitioned CSV files
+        chunksize: Rows per chunk; defaults to the configured value
+
+    Yields:
+        Typed DataFrame chunks
+    """
+    chunksize = chunksize or STREAMING_CONFIG["chunksize"]
+    for path in resolve_sources(source):
+        encoding = detect_encoding(path)
+        for chunk in pd.read_csv(path, encoding=encoding, chunksize=chunksize):
+            chunk.columns = chunk.columns.str.strip()
+            yield apply_schema(chunk)
+
+
+class ReservoirSample:
+    """
+    Uniform random sample of bounded size over a stream of row chunks
+
+    Args:
+        size: Maximum number of rows kept
+        random_state: Seed for reproducible samples
+    """
+
+    def __init__(self, size: int, random_state: int = 42):
+        self.size = size
+        self.seen = 0
+        self.rows: Optional[pd.DataFrame] = None
+        self._rng = np.random.default_rng(random_state)
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        """Offer every row of a chunk to the reservoir"""
+        n = len(chunk)
+        if n == 0:
+            return
+
+        # Fill the free slots first
+        free = max(self.size - self.seen, 0)
+        head = chunk.iloc[:free]
+        if len(head):
+            self.rows = head if self.rows is None else pd.concat([self.rows, head], ignore_index=True)
+
+        # Row number t (1-based) then replaces slot j ~ U[0, t) when j < size;
+        # within a chunk a later row wins a slot chosen more than once
+        offered = np.arange(free, n)
+        if len(offered):
+            positions = self.seen + offered + 1
+            slots = (self._rng.random(len(offered)) * positions).astype(np.int64)
+            chosen = slots < self.size
+            offered, slots = offered[chosen], slots[chosen]
+            _, last = np.unique(slots[::-1], return_index=True)
+            winners = len(slots) - 1 - last
+            if len(winners):
+                keep = np.ones(len(self.rows), dtype=bool)
+                keep[slots[winners]] = False
+                self.rows = pd.concat([self.rows[keep], chunk.iloc[offered[winners]]], ignore_index=True)
+
+        self.seen += n
+
+
+class StreamingSummary:
+    """
+    Running aggregates of a streamed dataset
+
+    Args:
+        reservoir_size: Rows kept for row-level charts
+        bin_width: Initial width of the histogram bins for numeric columns
+        max_bins: Bins kept per histogram; when a column needs more, its bin
+            width is doubled and neighbouring bins are merged
+        random_state: Seed for the reservoir sample
+    """
+
+    def __init__(self, reservoir_size: Optional[int] = None, bin_width: Optional[float] = None,
+                 max_bins: Optional[int] = None, random_state: int = 42):
+        self.rows = 0
+        self.cube: Optional[RateCube] = None
+        self.value_counts: Dict[str, pd.Series] = {}
+        self.bin_width = bin_width or STREAMING_CONFIG["histogram_bin_width"]
+        self.max_bins = max_bins or STREAMING_CONFIG["histogram_max_bins"]
+        self.bin_widths: Dict[str, float] = {}
+        self._bin_counts: Dict[str, pd.Series] = {}
+        self.reservoir = ReservoirSample(reservoir_size or STREAMING_CONFIG["reservoir_size"], random_state)
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        """
+        Fold a typed chunk into the running aggregates
+
+        Args:
+            chunk: Typed DataFrame chunk
+        """
+        self.rows += len(chunk)
+
+        chunk_cube = RateCube.from_frame(chunk)
+        self.cube = chunk_cube if self.cube is None else self.cube.merge(chunk_cube)
+
+        for col in chunk.columns:
+            values = chunk[col]
+            if col in CATEGORICAL_COLUMNS or is_flag_column(col):
+                counts = values.value_counts()
+                counts.index = counts.index.astype(object)
+                self._fold(self.value_counts, col, counts)
+            elif col not in IDENTIFIER_COLUMNS and pd.api.types.is_numeric_dtype(values.dtype):
+                self._add_histogram(col, values)
+
+        self.reservoir.add(chunk)
+
+    def _add_histogram(self, column: str, values: pd.Series) -> None:
+        """Fold a column's values into its histogram, coarsening it to ``max_bins``"""
+        width = self.bin_widths.get(column, self.bin_width)
+        # Bins are numbered by floor(value / width), so halving the numbers
+        # merges pairs of neighbouring bins exactly
+        numbers = np.floor(values.dropna().to_numpy(dtype=float) / width)
+        self._fold(self._bin_counts, column, pd.Series(numbers).value_counts())
+        counts = self._bin_counts[column]
+        while len(counts) > self.max_bins:
+            counts = counts.groupby(np.floor(counts.index.to_numpy() / 2)).sum()
+            width *= 2
+        self._bin_counts[column] = counts
+        self.bin_widths[column] = width
+
+    @staticmethod
+    def _fold(totals: Dict[str, pd.Series], column: str, counts: pd.Series) -> None:
+        if column in totals:
+            counts = totals[column].add(counts, fill_value=0)
+        totals[column] = counts.astype(np.int64)
+
+    @property
+    def histograms(self) -> Dict[str, pd.Series]:
+        """Row counts per numeric column, indexed by the left edge of each bin"""
+        histograms = {}
+        for col, counts in self._bin_counts.items():
+            histogram = counts.sort_index()
+            histogram.index = histogram.index * self.bin_widths[col]
+            histograms[col] = histogram
+        return histograms
+
+    @property
+    def cardinalities(self) -> Dict[str, int]:
+        """Number of distinct values seen per categorical and flag column"""
+        return {col: len(counts) for col, counts in self.value_counts.items()}
+
+    def sample(self) -> pd.DataFrame:
+        """
+        The reservoir sample, typed with the full stream's categories
+
+        Categorical columns list every value seen in the stream, including
+        values that did not make it into the sample.
+
+        Returns:
+            Typed DataFrame of at most ``reservoir_size`` rows
+        """
+        if self.reservoir.rows is None:
+            return pd.DataFrame()
+
+        sample = self.reservoir.rows.copy()
+        for col in sample.columns:
+            if col in CATEGORICAL_COLUMNS and col in self.value_counts:
+                categories = sorted(str(value) for value in self.value_counts[col].index)
+                sample[col] = pd.Categorical(sample[col].astype(str), categories=categories)
+        return sample
+
+
+def stream_ingest(source: PathLike, chunksize: Optional[int] = None,
+                  reservoir_size: Optional[int] = None, random_state: int = 42) -> StreamingSummary:
+    """
+    Aggregate one or more source files without loading them whole
+
+    Args:
+        source: CSV file or glob of partitioned CSV files
+        chunksize: Rows per chunk; defaults to the configured value
+        reservoir_size: Rows kept for row-level charts; defaults to the configured value
+        random_state: Seed for the reservoir sample
+
+    Returns:
+        StreamingSummary with the rate cube, value counts, histograms and sample
+    """
+    summary = StreamingSummary(reservoir_size=reservoir_size, random_state=random_state)
+    for chunk in iter_source_chunks(source, chunksize):
+        summary.add(chunk)
+    return summary
+
+
+def main() -> None:
+    """Stream the configured source and summarise its aggregates"""
+    import sys
+
+    source = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] else STREAMING_CONFIG["source"]
+    summary = stream_ingest(source)
+    cells = len(summary.cube.cells) if summary.cube is not None else 0
+    print(f"🌊 Streamed {summary.rows:,} rows from {source}")
+    print(f"   • Cube cells: {cells:,}")
+    print(f"   • Reservoir sample: {len(summary.sample()):,} rows")
+    for col, cardinality in summary.cardinalities.items():
+        if col in CATEGORICAL_COLUMNS:
+            print(f"   • {col}: {cardinality} distinct values")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Shared fixtures for the AI-Powered E-commerce Analytics Hub tests
+
+Tests run against synthetic survey responses from the benchmark generator, so
+they do not depend on the bundled Dataset.csv.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from synthetic_data import generate_responses, write_dataset  # noqa: E402
+from utils.schema import apply_schema  # noqa: E402
+
+
+@pytest.fixture
+def raw_responses() -> pd.DataFrame:
+    """Raw string answers in the Dataset.csv format"""
+    return generate_responses(3_000, seed=7)
+
+
+@pytest.fixture
+def typed_responses(raw_responses: pd.DataFrame) -> pd.DataFrame:
+    """Synthetic responses converted to the typed schema"""
+    return apply_schema(raw_responses)
+
+
+@pytest.fixture
+def source_csv(tmp_path: Path) -> Path:
+    """Synthetic Dataset.csv written to a temporary directory"""
+    return write_dataset(tmp_path / "Dataset.csv", 2_000, seed=11)
+
+
+@pytest.fixture
+def store_dir(tmp_path: Path) -> Path:
+    """Empty data store directory"""
+    return tmp_path / "store"
@@ -0,0 +1,58 @@
+"""Tests for figure compaction, including traces left empty by a filter selection"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import pytest
+
+from utils.chart_helpers import compact_figure
+
+EMPTY = pd.DataFrame({
+    "Country": pd.Series([], dtype=str),
+    "Age": pd.Series([], dtype=str),
+    "count": pd.Series([], dtype=int),
+    "rate": pd.Series([], dtype=float),
+})
+
+
+def empty_figures():
+    return {
+        "sunburst": px.sunburst(EMPTY, path=["Country", "Age"], values="count", color="rate"),
+        "treemap": px.treemap(EMPTY, path=["Country", "Age"], values="count"),
+        "scatter": go.Figure(go.Scatter(x=[], y=[], customdata=np.empty((0, 2), dtype=object),
+                                        hovertemplate="%{customdata[0]} %{customdata[1]:.1f}")),
+        "bar": px.bar(EMPTY, x="Country", y="rate", hover_data=["Age"]),
+        "parcats": go.Figure(go.Parcats(dimensions=[{"label": "Country", "values": []},
+                                                    {"label": "Age", "values": []}])),
+    }
+
+
+@pytest.mark.parametrize("name", list(empty_figures()))
+def test_compact_figure_with_empty_trace(name):
+    fig, sizes = compact_figure(empty_figures()[name], measure=True)
+    assert sizes["bytes_after"] <= sizes["bytes_before"]
+    json.loads(fig.to_json())
+
+
+def test_compacted_scatter_renders_the_same_values():
+    rng = np.random.default_rng(0)
+    x = rng.random(500) * 100
+    customdata = np.column_stack([np.full(500, "India", dtype=object), x.round(1)])
+    fig = go.Figure(go.Scatter(x=x, y=np.arange(500), customdata=customdata,
+                               hovertemplate="%{customdata[0]}: %{customdata[1]:.1f}"))
+    compact, _ = compact_figure(go.Figure(fig))
+    trace = compact.data[0]
+    assert trace.hovertemplate == "India: %{customdata[0]:.1f}"
+    np.testing.assert_allclose(np.asarray(trace.x, dtype=float), x, atol=1e-2)
+    np.testing.assert_array_equal(np.asarray(trace.y), np.arange(500))
+
+
+def test_compact_figure_keeps_unvalidated_nan_marker_sizes():
+    # Skeleton renders skip validation, so markers of empty groups can hold NaN
+    fig = go.Figure({"data": [{"type": "scatter", "x": ["a", "b"], "y": [1.0, 2.0],
+                               "marker": {"size": np.array([np.nan, np.nan])}}]}, _validate=False)
+    compact, _ = compact_figure(fig)
+    assert np.isnan(np.asarray(compact.data[0].marker.size, dtype=float)).all()
@@ -0,0 +1,66 @@
+"""Tests for filtered data exports"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from synthetic_data import write_dataset
+from utils.data_store import read_source_csv
+from utils.export import export_rows, export_source, source_columns
+from utils.filter_index import build_filter_index
+
+SELECTION = {"Country": ["India", "UK"], "Age": ["Gen Z", "Millennials"], "AI_Endorsement": [True]}
+COLUMNS = ["ID", "Country", "Age", "AI_Endorsement"]
+
+
+def expected_rows(df: pd.DataFrame) -> pd.DataFrame:
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in SELECTION.items():
+        mask &= df[column].isin(values).to_numpy()
+    return df.loc[mask, COLUMNS].reset_index(drop=True)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "csv.gz", "parquet"])
+def test_export_rows_matches_filter(typed_responses, fmt):
+    index = build_filter_index(typed_responses)
+    path = export_rows(typed_responses, index.mask(SELECTION), COLUMNS, fmt)
+    try:
+        exported = pd.read_parquet(path) if fmt == "parquet" else pd.read_csv(path)
+    finally:
+        path.unlink()
+    expected = expected_rows(typed_responses)
+    assert exported["ID"].tolist() == expected["ID"].tolist()
+
+
+def test_export_source_reads_every_partition(tmp_path):
+    for number in range(3):
+        write_dataset(tmp_path / f"part-{number}.csv", 1_500, seed=number)
+    full = pd.concat([read_source_csv(tmp_path / f"part-{number}.csv") for number in range(3)],
+                     ignore_index=True)
+
+    path = export_source(tmp_path / "part-*.csv", SELECTION, COLUMNS)
+    try:
+        exported = pd.read_csv(path)
+    finally:
+        path.unlink()
+    expected = expected_rows(full)
+    assert len(exported) == len(expected) > 0
+    assert exported["ID"].tolist() == expected["ID"].tolist()
+    assert list(exported.columns) == COLUMNS
+
+
+def test_export_source_with_default_columns(tmp_path, typed_responses):
+    source = write_dataset(tmp_path / "Dataset.csv", 1_000, seed=3)
+    sample = typed_responses.assign(Age_Group="18-25", Salary_Category="Low (<$50K)")
+
+    columns = source_columns(source)
+    assert columns == list(read_source_csv(source).columns)
+    assert set(columns) < set(sample.columns)
+
+    path = export_source(source, SELECTION, columns)
+    try:
+        exported = pd.read_csv(path)
+    finally:
+        path.unlink()
+    assert list(exported.columns) == columns
+    assert len(exported) == len(expected_rows(read_source_csv(source))) > 0
@@ -0,0 +1,85 @@
+"""Tests for figure skeletons: rendering from a cached skeleton must match a fresh build"""
+
+import json
+import math
+
+import plotly.graph_objects as go
+import pytest
+
+import dashboard
+from utils import chart_helpers
+from utils.chart_helpers import clear_figure_skeletons, compact_figure, skeleton_figure
+from utils.rate_cube import build_rate_cube
+from utils.segmentation import load_segmentation_model
+
+
+def differences(a, b, path=""):
+    """First path at which two figure JSON trees differ, or None"""
+    if isinstance(a, dict) and isinstance(b, dict):
+        if set(a) != set(b):
+            return f"{path}: keys {sorted(set(a) ^ set(b))}"
+        return next((d for k in a for d in [differences(a[k], b[k], f"{path}.{k}")] if d), None)
+    if isinstance(a, list) and isinstance(b, list):
+        if len(a) != len(b):
+            return f"{path}: length {len(a)} vs {len(b)}"
+        return next((d for i, (x, y) in enumerate(zip(a, b)) for d in [differences(x, y, f"{path}[{i}]")] if d),
+                    None)
+    if isinstance(a, float) or isinstance(b, float):
+        try:
+            if math.isclose(float(a), float(b), rel_tol=1e-6, abs_tol=1e-9):
+                return None
+        except (TypeError, ValueError):
+            pass
+    return None if a == b else f"{path}: {str(a)[:80]!r} vs {str(b)[:80]!r}"
+
+
+@pytest.fixture
+def selections(typed_responses, tmp_path):
+    """Section inputs for several country selections of the same responses"""
+    df = dashboard.preprocess_data.__wrapped__("skeletons", typed_responses)
+    countries = df["Country"].value_counts().index.tolist()
+    chosen = {"all": countries, "top": countries[:2], "rest": countries[2:]}
+    inputs = {}
+    for name, selected in chosen.items():
+        rows = df[df["Country"].isin(selected)].reset_index(drop=True)
+        inputs[name] = {"rows": rows, "cube": build_rate_cube(rows), "sampling": None,
+                        "segmentation": load_segmentation_model(rows, f"skeletons-{name}", str(tmp_path))}
+    return inputs
+
+
+def section_figures(inputs, compact):
+    figures = {}
+    for name, section in dashboard.SECTIONS.items():
+        for key, value in dashboard.compute_section(section, inputs).items():
+            if isinstance(value, go.Figure):
+                fig = compact_figure(value)[0] if compact else value
+                figures[f"{name}.{key}"] = json.loads(fig.to_json())
+    return figures
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_skeleton_render_matches_fresh_build(selections, compact):
+    clear_figure_skeletons()
+    section_figures(selections["all"], compact)
+    for name in ["top", "rest"]:
+        rendered = section_figures(selections[name], compact)
+        clear_figure_skeletons()
+        built = section_figures(selections[name], compact)
+        assert rendered.keys() == built.keys()
+        mismatches = {key: differences(built[key], rendered[key]) for key in built}
+        assert not {key: diff for key, diff in mismatches.items() if diff}, name
+
+
+def test_skeletons_drop_replaced_data_and_stay_bounded(monkeypatch):
+    monkeypatch.setattr(chart_helpers, "_SKELETONS", chart_helpers.ResultCache(max_entries=3, ttl=None))
+    for groups in range(10):
+        x, y = list(range(groups + 1)), [float(v) for v in range(groups + 1)]
+        fig = skeleton_figure(("bars", groups), lambda: go.Figure(go.Bar(x=x, y=y, name="bars")),
+                              [{"x": x, "y": y}])
+        assert list(fig.data[0].y) == y
+
+    assert chart_helpers._SKELETONS.stats["entries"] == 3
+    found, skeleton = chart_helpers._SKELETONS.get(("bars", 9))
+    assert found
+    assert "x" not in skeleton.traces[0] and "y" not in skeleton.traces[0]
+    assert skeleton.traces[0]["name"] == "bars"
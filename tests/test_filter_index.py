@@ -0,0 +1,48 @@
+"""Tests for the bitmap filter index"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.filter_index import FilterIndex, build_filter_index
+
+SELECTIONS = [
+    {"Country": ["India", "USA"]},
+    {"Country": ["UK"], "Age": ["Gen Z", "Gen X"], "AI_Endorsement": [True]},
+    {"Gender": ["Female"], "Education": ["PhD"], "Living_Region": ["Rural", "Urban"]},
+    {"Country": []},
+    {"Country": ["Atlantis"]},
+]
+
+
+def isin_filter(df: pd.DataFrame, selection: dict) -> pd.DataFrame:
+    """Reference implementation: one isin per selected column"""
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in selection.items():
+        mask &= df[column].isin(values).to_numpy()
+    return df[mask]
+
+
+@pytest.mark.parametrize("selection", SELECTIONS)
+def test_apply_matches_isin(typed_responses, selection):
+    index = build_filter_index(typed_responses)
+    result = index.apply(typed_responses, selection)
+    pd.testing.assert_frame_equal(result, isin_filter(typed_responses, selection))
+
+
+def test_full_selection_keeps_every_row(typed_responses):
+    index = build_filter_index(typed_responses)
+    selection = {col: index.values(col) for col in index.columns}
+    assert index.mask(selection) is None
+    assert index.apply(typed_responses, selection) is typed_responses
+
+
+@pytest.mark.parametrize("split", [1000, 1003])
+def test_append_matches_rebuild(typed_responses, split):
+    head = typed_responses.iloc[:split].reset_index(drop=True)
+    tail = typed_responses.iloc[split:].reset_index(drop=True)
+    appended = FilterIndex.from_frame(head).append(tail)
+    rebuilt = FilterIndex.from_frame(typed_responses)
+
+    for selection in SELECTIONS:
+        np.testing.assert_array_equal(appended.mask(selection), rebuilt.mask(selection))
@@ -0,0 +1,78 @@
+"""Tests for incremental appends: the delta path must match a full rebuild"""
+
+import pandas as pd
+
+from synthetic_data import generate_responses
+from utils.data_store import read_parts
+from utils.filter_index import build_filter_index
+from utils.incremental import LiveDataset, append_rows, load_cube
+from utils.rate_cube import build_rate_cube
+
+SELECTION = {"Country": ["India", "USA"], "AI_Endorsement": [True]}
+
+
+def batches(count: int, rows: int = 300):
+    """Raw batches with IDs continuing after the source file"""
+    return [generate_responses(rows, seed=100 + i, start_id=10_000 + i * rows) for i in range(count)]
+
+
+def test_append_cube_matches_rebuild(source_csv, store_dir):
+    for batch in batches(3):
+        manifest = append_rows(batch, source_csv, store_dir)
+
+    rows = read_parts(manifest["digest"], manifest["parts"], store_dir)
+    assert manifest["rows"] == len(rows) == 2_000 + 3 * 300
+
+    delta = load_cube(manifest, store_dir)
+    rebuilt = build_rate_cube(rows)
+    pd.testing.assert_frame_equal(delta.cells.sort_index(), rebuilt.cells.sort_index())
+
+
+def test_live_dataset_follows_appends(source_csv, store_dir, tmp_path):
+    live = LiveDataset(source_csv, store_dir, shared_dir=tmp_path / "shared")
+    assert live.refresh()
+    assert not live.refresh()
+
+    for batch in batches(2):
+        manifest = append_rows(batch, source_csv, store_dir)
+        assert live.refresh()
+
+    rows = read_parts(manifest["digest"], manifest["parts"], store_dir)
+    snapshot = live.snapshot()
+    assert snapshot["version"] == manifest["version"]
+    # copy() turns the memory-mapped columns into plain arrays for the comparison
+    pd.testing.assert_frame_equal(snapshot["df"].copy(), rows, check_categorical=False)
+    pd.testing.assert_frame_equal(snapshot["cube"].cells.sort_index(),
+                                  build_rate_cube(rows).cells.sort_index())
+    assert (snapshot["filter_index"].mask(SELECTION) == build_filter_index(rows).mask(SELECTION)).all()
+
+
+def test_versions_change_per_append(source_csv, store_dir):
+    versions = {append_rows(batch, source_csv, store_dir)["version"] for batch in batches(3, rows=50)}
+    assert len(versions) == 3
+
+
+def test_concurrent_appends_keep_every_batch(source_csv, store_dir):
+    from concurrent.futures import ThreadPoolExecutor
+
+    append_rows(batches(1, rows=10)[0], source_csv, store_dir)  # ingest once up front
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda batch: append_rows(batch, source_csv, store_dir), batches(8, rows=40)))
+
+    manifest = append_rows(batches(1, rows=10)[0], source_csv, store_dir)
+    assert len(set(manifest["parts"])) == len(manifest["parts"]) == 11
+    assert len(read_parts(manifest["digest"], manifest["parts"], store_dir)) == manifest["rows"] == 2_000 + 340
+
+
+def test_refresh_extends_shared_column_files(source_csv, store_dir, tmp_path):
+    from utils.shared_store import COLUMNS_DIR
+
+    shared = tmp_path / "shared"
+    live = LiveDataset(source_csv, store_dir, shared_dir=shared)
+    live.refresh()
+    files = sorted(path.name for path in (shared / COLUMNS_DIR).iterdir())
+
+    append_rows(batches(1)[0], source_csv, store_dir)
+    live.refresh()
+    assert sorted(path.name for path in (shared / COLUMNS_DIR).iterdir()) == files
+    assert len(live.df) == 2_300
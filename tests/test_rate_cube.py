@@ -0,0 +1,47 @@
+"""Tests for the precomputed rate cube"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.rate_cube import RateCube, build_rate_cube
+from utils.schema import PAYMENT_METHOD_COLUMNS
+
+FLAGS = PAYMENT_METHOD_COLUMNS + ["AI_Endorsement", "Online_Consumer"]
+
+
+@pytest.mark.parametrize("by", ["Country", "Age", ["Country", "Gender"], ["Age", "Education"]])
+def test_rates_match_groupby(typed_responses, by):
+    cube = build_rate_cube(typed_responses)
+    expected = typed_responses.groupby(by, observed=True)[FLAGS].mean() * 100
+    pd.testing.assert_frame_equal(cube.rates(by, FLAGS), expected, check_names=False)
+
+
+def test_counts_match_groupby(typed_responses):
+    cube = build_rate_cube(typed_responses)
+    expected = typed_responses.groupby("Country", observed=True).size()
+    pd.testing.assert_series_equal(cube.counts("Country"), expected, check_names=False)
+    assert cube.total == len(typed_responses)
+
+
+def test_overall_rates_match_means(typed_responses):
+    cube = build_rate_cube(typed_responses)
+    expected = typed_responses[FLAGS].mean() * 100
+    pd.testing.assert_series_equal(cube.overall_rates(FLAGS), expected, check_names=False)
+
+
+def test_filter_matches_filtered_frame(typed_responses):
+    selection = {"Country": ["India", "Brazil"], "AI_Endorsement": [True]}
+    filtered = typed_responses[typed_responses["Country"].isin(selection["Country"])
+                               & typed_responses["AI_Endorsement"]]
+    cube = build_rate_cube(typed_responses).filter(selection)
+    expected = filtered.groupby("Age", observed=True)[FLAGS].mean() * 100
+    pd.testing.assert_frame_equal(cube.rates("Age", FLAGS), expected, check_names=False)
+
+
+def test_merge_matches_single_pass(typed_responses):
+    whole = build_rate_cube(typed_responses)
+    merged = RateCube.from_frame(typed_responses.iloc[:1200]).merge(
+        RateCube.from_frame(typed_responses.iloc[1200:]))
+    pd.testing.assert_frame_equal(merged.cells.sort_index(), whole.cells.sort_index())
+    np.testing.assert_allclose(merged.rates("Country").to_numpy(), whole.rates("Country").to_numpy())
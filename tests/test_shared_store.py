@@ -0,0 +1,68 @@
+"""Tests for the shared memory-mapped store: versions share unchanged column files"""
+
+import numpy as np
+import pandas as pd
+
+from utils.schema import concat_typed
+from utils.shared_store import (
+    COLUMNS_DIR,
+    append_shared_frame,
+    open_shared_frame,
+    prune_versions,
+    share_frame,
+)
+
+
+def column_files(root):
+    return sorted(path.name for path in (root / COLUMNS_DIR).iterdir())
+
+
+def test_share_frame_round_trip(typed_responses, tmp_path):
+    shared = share_frame(typed_responses, "v1", tmp_path)
+    pd.testing.assert_frame_equal(shared.copy(), typed_responses)
+    assert isinstance(shared["ID"].values, np.memmap)
+
+
+def test_append_extends_files_in_place(typed_responses, tmp_path):
+    head = typed_responses.iloc[:2_000].reset_index(drop=True)
+    tail = typed_responses.iloc[2_000:].reset_index(drop=True)
+    share_frame(head, "v1", tmp_path)
+    files = column_files(tmp_path)
+
+    appended = append_shared_frame(tail, "v1", "v2", tmp_path)
+    pd.testing.assert_frame_equal(appended.copy(), concat_typed([head, tail]))
+    assert column_files(tmp_path) == files
+    # The earlier version still maps its own prefix
+    pd.testing.assert_frame_equal(open_shared_frame("v1", tmp_path).copy(), head)
+
+
+def test_new_leading_category_rewrites_only_that_column(typed_responses, tmp_path):
+    head = typed_responses.iloc[:2_000].reset_index(drop=True)
+    tail = typed_responses.iloc[2_000:].reset_index(drop=True)
+    tail["Country"] = tail["Country"].cat.add_categories(["Argentina"])
+    tail.loc[:10, "Country"] = "Argentina"
+    share_frame(head, "v1", tmp_path)
+
+    appended = append_shared_frame(tail, "v1", "v2", tmp_path)
+    expected = concat_typed([head, tail])
+    pd.testing.assert_frame_equal(appended.copy(), expected)
+    assert list(appended["Country"].cat.categories) == list(expected["Country"].cat.categories)
+    assert len(column_files(tmp_path)) == len(head.columns) + 1
+
+
+def test_disk_holds_one_copy_across_versions(typed_responses, tmp_path):
+    parts = [typed_responses.iloc[start:start + 500].reset_index(drop=True) for start in range(0, 3_000, 500)]
+    share_frame(parts[0], "v0", tmp_path)
+    for number, part in enumerate(parts[1:], start=1):
+        assert append_shared_frame(part, f"v{number - 1}", f"v{number}", tmp_path) is not None
+
+    prune_versions(["v5"], tmp_path, max_versions=2)
+    assert open_shared_frame("v3", tmp_path) is None
+    assert len(open_shared_frame("v4", tmp_path)) == 2_500
+    assert len(column_files(tmp_path)) == len(typed_responses.columns)
+    stored = sum(path.stat().st_size for path in (tmp_path / COLUMNS_DIR).iterdir())
+    assert stored <= typed_responses.memory_usage(deep=False).sum()
+
+
+def test_append_without_base_returns_none(typed_responses, tmp_path):
+    assert append_shared_frame(typed_responses, "missing", "v2", tmp_path) is None
@@ -0,0 +1,67 @@
+"""Tests for chunked streaming ingest: aggregates stay bounded as rows grow"""
+
+import numpy as np
+import pandas as pd
+
+from synthetic_data import generate_responses
+from utils.schema import apply_schema
+from utils.stream_ingest import StreamingSummary, stream_ingest
+
+CHUNK_ROWS = 2_000
+
+
+def chunks(count: int):
+    """Typed chunks with sequential IDs and a wide-ranging numeric column"""
+    rng = np.random.default_rng(3)
+    for i in range(count):
+        chunk = apply_schema(generate_responses(CHUNK_ROWS, seed=i, start_id=1 + i * CHUNK_ROWS))
+        chunk["Spend"] = rng.exponential(500.0, CHUNK_ROWS) * (i + 1)
+        yield chunk
+
+
+def summary_size(summary: StreamingSummary) -> int:
+    """Number of entries held by every aggregate of a summary"""
+    return (len(summary.cube.cells)
+            + sum(len(counts) for counts in summary.value_counts.values())
+            + sum(len(histogram) for histogram in summary.histograms.values())
+            + len(summary.sample()))
+
+
+def streamed(count: int, **kwargs) -> StreamingSummary:
+    summary = StreamingSummary(reservoir_size=500, max_bins=64, **kwargs)
+    for chunk in chunks(count):
+        summary.add(chunk)
+    return summary
+
+
+def test_summary_size_stays_flat():
+    sizes = [summary_size(streamed(count)) for count in (5, 20, 40)]
+    assert sizes[-1] <= sizes[0] + 64
+    assert streamed(40).rows == 40 * CHUNK_ROWS
+
+
+def test_identifier_columns_are_not_binned():
+    summary = streamed(5)
+    assert "ID" not in summary.histograms
+    assert "Spend" in summary.histograms
+
+
+def test_coarsened_histogram_matches_numpy():
+    summary = streamed(10)
+    histogram = summary.histograms["Spend"]
+    width = summary.bin_widths["Spend"]
+    assert len(histogram) <= summary.max_bins
+    assert histogram.sum() == summary.rows
+
+    spend = pd.concat([chunk["Spend"] for chunk in chunks(10)]).to_numpy()
+    expected = pd.Series(np.floor(spend / width) * width).value_counts().sort_index()
+    np.testing.assert_array_equal(histogram.index.to_numpy(), expected.index.to_numpy())
+    np.testing.assert_array_equal(histogram.to_numpy(), expected.to_numpy())
+
+
+def test_stream_ingest_matches_source(source_csv):
+    summary = stream_ingest(source_csv, chunksize=300, reservoir_size=200)
+    assert summary.rows == 2_000
+    assert summary.cube.total == 2_000
+    assert len(summary.sample()) == 200
+    assert summary.histograms == {}